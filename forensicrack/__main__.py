@@ -6,6 +6,7 @@ import os
 from .config import Config
 from .install import install_dependencies
 from .app import ForensiCrackApp
+from .wordlists import WordlistManager
 from .logging_config import setup_logging
 import subprocess
 
@@ -27,9 +28,47 @@ def parse_args():
         action="store_true",
         help="Execute ForensiCrack on evidence in input directory"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and process evidence as it is dropped into the input directory"
+    )
+    parser.add_argument(
+        "--dedup-wordlists",
+        action="store_true",
+        help="Build cross-tier deduplicated wordlists (each tier only holds new candidates)"
+    )
+    parser.add_argument(
+        "--stream-rockyou",
+        action="store_true",
+        help="Stream RockYou2021 from its 7z parts instead of extracting ~100 GB to disk"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Maximum number of evidence files processed concurrently"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=parse_duration,
+        default=None,
+        help="Pause cracking after this long (e.g. 3600, 90m, 8h); rerun --execute to resume"
+    )
     return parser.parse_args()
 
 
+def parse_duration(value: str) -> int:
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    value = value.strip().lower()
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r}")
+
+
 def update_tools():
     print("[*] Updating apt-based tools...")
     try:
@@ -77,13 +116,32 @@ def main():
         update_tools()
         return
 
+    if args.workers:
+        config.MAX_WORKERS = args.workers
+    if args.time_budget:
+        config.TIME_BUDGET = args.time_budget
+    if args.stream_rockyou:
+        config.ROCKYOU2021_STREAM = True
+
+    if args.dedup_wordlists:
+        setup_logging(config.LOG_DIR)
+        WordlistManager(
+            config.WORDLIST_DIR, config.DEDUP_RAM_LIMIT, config.ROCKYOU2021_STREAM
+        ).build_deduplicated_tiers()
+        return
+
+    if args.watch:
+        logger = setup_logging(config.LOG_DIR)
+        ForensiCrackApp(config=config, logger=logger).watch()
+        return
+
     if args.execute:
         logger = setup_logging(config.LOG_DIR)
         app = ForensiCrackApp(config=config, logger=logger)
         app.execute()
         return
 
-    print("No action specified. Use --install, --update, or --execute.")
+    print("No action specified. Use --install, --update, --dedup-wordlists, --execute, or --watch.")
     sys.exit(1)
 
 
@@ -1,39 +1,118 @@
 import os
+import time
 import logging
 import subprocess
-from typing import List
-import os
-import logging
-import subprocess
-import shutil
+import threading
+from concurrent.futures import wait
 from typing import List
 
 from .config import Config
-from .models import EvidenceFile
+from .models import EvidenceFile, HashJob
+from .hashes import detect_mode, read_hash_lines, write_results
+from .results import ResultStore
 from .file_id import FileIdentifier
-from .wordlists import WordlistManager
+from .extractors import HashExtractor
+from .wordlists import WordlistManager, candidate_bytes
 from .steg import StegEngine
 from .steg_zsteg import ZstegEngine
 from .cracking_hashcat import HashcatEngine
 from .cracking_john import JohnEngine
 from .archives import ArchiveEngine
+from .intake import EvidenceIntake
+from .exhausted import ExhaustedIndex
+from .expansion import ExpansionBudget
+from .jobqueue import JobQueue
+from .ledger import JobLedger
+from .scheduler import EvidenceScheduler
+from .runner import ProgressBus, ProgressEvent, StreamingRunner
+from .watch import InputWatcher
 
 
 class ForensiCrackApp:
+    # _triage() route for evidence handled file by file rather than batched by mode
+    INDIVIDUAL = "individual"
+    # _triage() route for evidence the ledger says was cracked by an earlier run
+    DONE = "done"
+    # Single-member ZipCrypto hashes (stored, deflated) attacked when bkcrack has no known plaintext
+    PKZIP_MODES = [17210, 17200]
+
     def __init__(self, config: Config, logger: logging.Logger):
         self.config = config
         self.logger = logger
-        self.file_id = FileIdentifier()
-        self.wordlist_mgr = WordlistManager(self.config.WORDLIST_DIR)
-        self.steg_engine = StegEngine(logger)
+        self.file_id = FileIdentifier(self.config.FILE_ID_CACHE, logger)
+        self.hash_extractor = HashExtractor(self.config.HASH_CACHE_DIR, logger)
+        self.wordlist_mgr = WordlistManager(
+            self.config.WORDLIST_DIR, self.config.DEDUP_RAM_LIMIT, self.config.ROCKYOU2021_STREAM
+        )
+        self.result_store = ResultStore(self.config.RESULT_STORE, logger)
+        # Attacks that ran to the end uncracked, per hash and wordlist content
+        self.exhausted = ExhaustedIndex(self.config.EXHAUSTED_INDEX, self.wordlist_mgr.catalog, logger)
+        # Live progress from hashcat/John; subscribe here to follow running jobs
+        self.progress = ProgressBus(logger)
+        self.progress.subscribe(self._log_progress)
+        self.runner = StreamingRunner(self.progress, logger, self.config.STATUS_TIMER)
+        self.steg_engine = StegEngine(logger, self.result_store, self.exhausted)
         self.zsteg_engine = ZstegEngine(logger)
-        self.hashcat_engine = HashcatEngine(logger)
-        self.john_engine = JohnEngine(logger)
+        self.hashcat_engine = HashcatEngine(
+            logger,
+            self.result_store,
+            self.config.HASHCAT_POTFILE,
+            self.config.HASHCAT_SINGLE_PASS,
+            self.runner,
+            self.config.SESSION_DIR,
+            chunk_min_lines=self.config.HASHCAT_CHUNK_MIN_LINES,
+            chunk_count=self.config.HASHCAT_CHUNK_COUNT,
+            # Acquired per hashcat process so chunks interleave with other evidence
+            slot=lambda: self.scheduler.slot("hashcat"),
+            catalog=self.wordlist_mgr.catalog,
+            exhausted=self.exhausted,
+        )
+        self.john_engine = JohnEngine(
+            logger,
+            self.result_store,
+            self.config.JOHN_POTFILE,
+            self.runner,
+            self.config.SESSION_DIR,
+            exhausted=self.exhausted,
+        )
         self.archive_engine = ArchiveEngine(
-            self.config.ARCHIVE_DIR, self.config.PLAINTEXTS_DIR, logger
+            self.config.ARCHIVE_DIR,
+            self.config.PLAINTEXTS_DIR,
+            logger,
+            plaintext_index=self.config.PLAINTEXT_INDEX,
+            key_store=self.config.BKCRACK_KEYS,
+            extract_workers=self.config.EXTRACT_WORKERS,
+            max_extract_bytes=self.config.EXTRACT_MAX_BYTES,
+            max_extract_ratio=self.config.EXTRACT_MAX_RATIO,
+            max_extract_members=self.config.EXTRACT_MAX_MEMBERS,
+            bkcrack_threads=max(1, self.config.BKCRACK_THREADS // self.config.BKCRACK_SLOTS),
+            bkcrack_parallel=self.config.BKCRACK_PARALLEL,
+            bkcrack_max_attacks=self.config.BKCRACK_MAX_ATTACKS,
+        )
+        self.scheduler = EvidenceScheduler(
+            {
+                "cpu": self.config.CPU_WORKERS,
+                "hashcat": self.config.HASHCAT_SLOTS,
+                "bkcrack": self.config.BKCRACK_SLOTS,
+            },
+            max_workers=self.config.MAX_WORKERS,
+            logger=logger,
+        )
+        self.intake = EvidenceIntake(self.scheduler, logger)
+        # Evidence, attempts and results of earlier runs; reruns skip finished work
+        self.ledger = JobLedger(self.config.LEDGER, logger)
+        self.wordlists: List[str] = []
+        self.wordlist_fp: str | None = None
+        # Archive contents fed back into triage as child evidence
+        self.expansion = ExpansionBudget(
+            self.config.EXPANSION_MAX_DEPTH, self.config.EXPANSION_MAX_FILES, self.config.EXPANSION_MAX_BYTES, logger
         )
+        self._children = []
+        self._children_lock = threading.Lock()
+        self.duplicates: dict[str, list[EvidenceFile]] = {}
         self.processed_count = 0
         self.success_count = 0
+        self._count_lock = threading.Lock()
 
     def execute(self):
         self.logger.info("ForensiCrack execution started")
@@ -43,291 +122,561 @@ class ForensiCrackApp:
             return
 
         self.logger.info("Using wordlists: %s", wordlists)
+        self.wordlists = wordlists
+        self.wordlist_fp = self.wordlist_mgr.catalog.set_fingerprint(wordlists)
+        self.runner.set_time_budget(self.config.TIME_BUDGET)
 
+        evidence_files = []
         for filename in os.listdir(self.config.INPUT_DIR):
             path = os.path.join(self.config.INPUT_DIR, filename)
             if not os.path.isfile(path):
                 continue
+            evidence_files.append(self._identify(path))
+        self.file_id.save_cache()
+
+        # Identical copies are cracked once; their results are fanned out at the end
+        self.intake.fingerprint(evidence_files, self.ledger.cached_fingerprint, self.ledger.remember_fingerprint)
+        self.duplicates = {rep.path: dups for rep, dups in self.intake.group(evidence_files) if dups}
+        by_path = {e.path: e for e in evidence_files}
+        duplicate_ids = {id(d) for dups in self.duplicates.values() for d in dups}
+        evidence_files = [e for e in evidence_files if id(e) not in duplicate_ids]
+
+        # Hash-based evidence is batched by hashcat mode; everything else
+        # (stego, ZipCrypto/bkcrack, unsupported) is processed per file.
+        individual, batchable = [], []
+        for evidence in evidence_files:
+            route = self._triage(evidence)
+            if route is None:
+                self._record_outcome(evidence, False)
+            elif route == self.DONE:
+                self._record_outcome(evidence, True)
+            elif route == self.INDIVIDUAL:
+                individual.append(evidence)
+            else:
+                batchable.append((evidence, route))
 
-            evidence = EvidenceFile(path=path)
-            (
-                evidence.file_type,
-                evidence.mime_type,
-                evidence.is_graphic,
-                evidence.is_archive,
-                evidence.is_text,  # now available
-            ) = self.file_id.identify(path)
-
-            self.logger.info("Processing: %s (%s)", evidence.name, evidence.ext)
-
-            success = False
+        batches: dict = {}
+        prepared = self.scheduler.run(
+            batchable, lambda item: self._prepare_hash_job(*item), lambda item: "cpu"
+        )
+        for (evidence, _), job in prepared:
+            if job is None:
+                self._record_outcome(evidence, False)
+                continue
+            batches.setdefault(job.mode_key, []).append(job)
 
-            if evidence.is_graphic:
-                stego_output_dir = self.config.STEGO_OUTPUT_DIR
-                if evidence.ext in {".jpg", ".jpeg"}:
-                    success = self.steg_engine.run(path, wordlists, stego_output_dir)
-                    if not success:
-                        self.logger.info(
-                            "Stegseek failed - falling back to zsteg for %s", evidence.name
-                        )
-                        success = self.zsteg_engine.run(path, stego_output_dir)
-                elif evidence.ext in {".png", ".bmp"}:
-                    success = self.zsteg_engine.run(path, stego_output_dir)
+        results = self.scheduler.run(
+            individual + list(batches.values()),
+            lambda item: self._run_item(item, wordlists),
+            lambda item: self._resource_class(item) if isinstance(item, EvidenceFile) else "hashcat",
+        )
+        for item, outcome in results:
+            if isinstance(item, EvidenceFile):
+                self._record_outcome(item, bool(outcome))
+            elif isinstance(outcome, dict):
+                for path, success in outcome.items():
+                    self._record_outcome(by_path[path], success)
+            else:
+                # A batch that raised: every file in it failed
+                for job in item:
+                    self._record_outcome(job.evidence, False)
+        self._drain_children()
 
-            elif evidence.is_archive:
-                success = self._handle_archive(evidence, wordlists)
+        self.logger.info(
+            "Execution complete. Processed %d files, %d successes.",
+            self.processed_count,
+            self.success_count,
+        )
+        if self.runner.expired():
+            self.logger.info(
+                "Time budget reached - unfinished sessions were saved in %s; rerun --execute to resume",
+                self.config.SESSION_DIR,
+            )
 
-            elif evidence.ext in {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"}:
-                success = self._handle_encrypted_file(evidence, wordlists)
+    def watch(self):
+        """
+        Process evidence continuously as it lands in INPUT_DIR (--watch).
+        New and changed files go onto a durable job queue and are picked up
+        by the worker pool as soon as a worker is free, so a long attack on
+        one file never holds back intake and triage of the next.
+        """
+        self.logger.info("ForensiCrack watch mode started")
+        wordlists = self.wordlist_mgr.escalating_lists()
+        if not wordlists:
+            self.logger.error("No wordlists found in %s. Aborting.", self.config.WORDLIST_DIR)
+            return
+        self.wordlists = wordlists
+        self.wordlist_fp = self.wordlist_mgr.catalog.set_fingerprint(wordlists)
+        self.runner.set_time_budget(self.config.TIME_BUDGET)
 
-            elif evidence.ext == ".hash":
-                success = self._handle_hash_file(evidence, wordlists)
+        queue = JobQueue(self.config.JOB_QUEUE, self.logger)
+        for filename in sorted(os.listdir(self.config.INPUT_DIR)):
+            path = os.path.join(self.config.INPUT_DIR, filename)
+            if os.path.isfile(path):
+                queue.put(path)
 
-            elif evidence.is_text:
-                self.logger.info(
-                    "Plain text file detected (%s) - no cracking applied, skipping", evidence.name
-                )
-                # Future: could add keyword search, entropy analysis, etc.
+        stop = threading.Event()
+        watcher = InputWatcher(self.config.INPUT_DIR, self.config.WATCH_POLL_INTERVAL, self.logger)
+        threading.Thread(target=watcher.run, args=(queue.put, stop), name="forensicrack-watch", daemon=True).start()
 
-            else:
-                self.logger.warning("Unsupported file type for %s - skipping", evidence.name)
+        # Claim no more jobs than there are workers, so queued ones stay "pending" on disk
+        free_workers = threading.BoundedSemaphore(self.scheduler.max_workers)
 
-            if success:
-                self.success_count += 1
-            self.processed_count += 1
+        def run_job(job: dict):
+            success = False
+            try:
+                success = self._process_queued(job["path"], wordlists)
+            except Exception as e:
+                self.logger.error("Watch job failed on %s: %s", job["path"], e)
+            finally:
+                queue.complete(job["id"], success)
+                free_workers.release()
 
+        try:
+            while not self.runner.expired():
+                if not free_workers.acquire(timeout=1.0):
+                    continue
+                job = queue.claim(timeout=1.0)
+                if job is None:
+                    free_workers.release()
+                    continue
+                self.scheduler.submit(run_job, job)
+            self.logger.info("Time budget reached - stopping watch mode")
+        except KeyboardInterrupt:
+            self.logger.info("Stopping watch mode - queued evidence resumes on the next --watch")
+        finally:
+            stop.set()
+            self.scheduler.shutdown(wait=True)
+            # Children submitted by the last jobs land on a fresh pool; wait for those too
+            self._drain_children()
         self.logger.info(
-            "Execution complete. Processed %d files, %d successes.",
+            "Watch mode stopped. Processed %d files, %d successes. Queue: %s",
             self.processed_count,
             self.success_count,
+            queue.counts(),
         )
 
-    def extract_hash(self, evidence: EvidenceFile) -> str | None:
-        ext = evidence.ext.lower()
-        hash_extract_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.hash")
+    def _process_queued(self, path: str, wordlists: List[str]) -> bool:
+        evidence = self._identify(path)
+        self.file_id.save_cache()
+        return self._process_evidence(evidence, wordlists)
 
-        tool_map = {
-           ".zip": "zip2john",
-           ".7z": "7z2john",
-            ".rar": "rar2john",
-            ".pdf": "pdf2john",
-       }
-        if ext in {".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"}:
-            tool = "office2john"
-        elif ext in tool_map:
-              tool = tool_map[ext]
+    def _process_evidence(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
+        """Triage and crack one identified file on its own (watch mode and child evidence)."""
+        route = self._triage(evidence)
+        if route is None:
+            success = False
+        elif route == self.DONE:
+            success = True
+        elif route == self.INDIVIDUAL:
+            success = self._process(evidence, wordlists)
         else:
-            self.logger.warning(f"No hash extraction tool for {ext}")
-            return None
+            job = self._prepare_hash_job(evidence, route)
+            success = bool(job) and self._run_hash_batch([job], wordlists).get(evidence.path, False)
+        self._record_outcome(evidence, success)
+        self.logger.info("Finished %s: %s", evidence.name, "cracked" if success else "not cracked")
+        return success
 
-        if shutil.which(tool) is None:
-            self.logger.error(f"Tool '{tool}' not found. Install john package.")
-            return None
-    
-        cmd = [tool, evidence.path]
-        self.logger.info(f"Extracting hash : {' '.john(cmd)} > {hash_extract_path}")
-        
+    def _triage(self, evidence: EvidenceFile):
+        """
+        How an identified file gets cracked: None when there is nothing to do
+        (already logged), DONE when an earlier run cracked it, INDIVIDUAL for
+        per-file handling, or the hashcat mode its hashes are batched under.
+        """
+        route = self._route(evidence)
+        # Set by intake for top-level evidence; watch jobs and children hash here
+        fingerprint = evidence.metadata.get("fingerprint") or self.ledger.fingerprint(evidence.path)
+        evidence.metadata["fingerprint"] = fingerprint
+        self.expansion.first_visit(fingerprint)
+        mode = route if route is not None and route != self.INDIVIDUAL else None
+        status = self.ledger.register(fingerprint, evidence.path, evidence.ext, mode, evidence.metadata.get("parent"))
+        if status == JobLedger.CRACKED:
+            self._restore_results(evidence)
+            # Contents an interrupted run unpacked but did not finish are picked up again
+            extracted_dir = self._extraction_dir(evidence)
+            if evidence.is_archive and os.path.isdir(extracted_dir):
+                self._expand(evidence, extracted_dir)
+            return self.DONE
+        return route
+
+    def _extraction_dir(self, evidence: EvidenceFile) -> str:
+        return os.path.join(self.config.ARCHIVE_DIR, f"decrypted_{evidence.name}")
+
+    def _expand(self, parent: EvidenceFile, directory: str):
+        """
+        Queue every file unpacked from `parent` as child evidence, within the
+        depth limit and expansion budget. Children run on the scheduler pool
+        alongside the remaining top-level evidence.
+        """
+        if self.runner.expired():
+            return
+        depth = parent.metadata.get("depth", 0) + 1
+        if depth > self.expansion.max_depth:
+            self.logger.info(
+                "Not expanding %s: nesting depth %d exceeds EXPANSION_MAX_DEPTH", parent.name, depth
+            )
+            return
+        queued = 0
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                if not self.expansion.admit(path):
+                    continue
+                child = self._identify(path)
+                child.metadata["parent"] = parent.metadata["fingerprint"]
+                child.metadata["parent_name"] = parent.name
+                child.metadata["depth"] = depth
+                future = self.scheduler.submit(self._process_child, child)
+                with self._children_lock:
+                    self._children.append(future)
+                queued += 1
+        self.file_id.save_cache()
+        if queued:
+            self.logger.info("Queued %d file(s) unpacked from %s as child evidence (depth %d)", queued, parent.name, depth)
+
+    def _process_child(self, child: EvidenceFile) -> bool:
         try:
-            result = subprocess.run(cmd, check=True, capture_output=True)
-            hash_output = result.stdout.decode('utf-8', errors='replace').strip()
-            if not hash_output:
-                self.logger.error(f"Hash extraction produced no output for {evidence.name} (file may not be encrypted)")
-                return None
-            
-            with open(hash_extract_path, "w") as f:
-                f.write(hash_output)
-
-            if os.path.getsize(hash_extract_path) == 0:
-                self.logger.error(f"Hash extraction produced empty file for {evidence.name}")
-                return None
-            
-            self.logger.info(f"Hash Extracted successfully: {hash_extract_path}")
-            return hash_extract_path
-        except subprocess.CalledProcessError as e:
-            err_msg = e.stderr.decode('utf-8', errors='replace').strip() or "Unknown error"
-            self.logger.error(f"Hash extraction failed for {evidence.name}: {err_msg}")
-            return None
+            child.metadata["fingerprint"] = self.ledger.fingerprint(child.path)
+            if not self.expansion.first_visit(child.metadata["fingerprint"]):
+                self.logger.info(
+                    "%s (from %s) matches evidence already processed this run - skipping",
+                    child.name, child.metadata["parent_name"],
+                )
+                return False
+            return self._process_evidence(child, self.wordlists)
         except Exception as e:
-            self.logger.error(f"Unexpected error during hash extraction for {evidence.name}: {e}")
-            return None
-
-      
-
-    def _handle_archive(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
-        zip_info = None
-        if evidence.ext == ".zip":
-            zip_info = self.archive_engine.detect_zip_encryption(evidence.path)
-
-        mode = self.hashcat_engine.resolve_hashcat_mode(evidence, self.file_id, zip_info)
+            self.logger.error("Child evidence %s (from %s) failed: %s", child.name, child.metadata["parent_name"], e)
+            return False
 
+    def _drain_children(self):
+        """Wait for child evidence, and the children it unpacks in turn, to finish."""
+        while True:
+            with self._children_lock:
+                pending, self._children = self._children, []
+            if not pending:
+                break
+            wait(pending)
+        self.scheduler.shutdown(wait=True)
+
+    def _route(self, evidence: EvidenceFile):
+        if not self._is_hash_evidence(evidence):
+            return self.INDIVIDUAL
+        if evidence.metadata.get("encrypted") is False:
+            self.logger.info("%s is not password protected - nothing to crack", evidence.name)
+            return None
+        mode = self._resolve_mode(evidence)
+        if isinstance(mode, str):
+            return self.INDIVIDUAL
         if mode is None:
             self.logger.warning("Could not determine cracking mode for %s", evidence.name)
-            return False
+            return None
+        return mode
 
+    def _restore_results(self, evidence: EvidenceFile):
+        """Rewrite a previously cracked file's .pot from the ledger if it went missing."""
         output_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.pot")
+        found = self.ledger.results(evidence.metadata["fingerprint"])
+        if found and not os.path.exists(output_path):
+            write_results(output_path, found)
+        self.logger.info("%s was cracked by an earlier run - skipping", evidence.name)
+
+    def _attempt(self, evidence: EvidenceFile, engine: str, mode, run, complete=None,
+                 hash_path: str | None = None, uses_wordlists: bool = True,
+                 verify=None, output_path: str | None = None) -> bool:
+        """
+        Run one engine attack on `evidence` under the ledger: skipped if it
+        already ran to the end with the current wordlists, otherwise recorded
+        with its status and duration. `complete` tells a failed attack that
+        exhausted its candidates from one that stopped early; results read
+        back from `hash_path` are stored with the evidence. If `verify`
+        rejects them, the attempt failed and they are dropped from the case
+        store and `output_path` instead.
+        """
+        attempt = self._start_attempt(evidence, engine, mode, uses_wordlists)
+        if attempt is False:
+            return False
+        success = False
+        try:
+            success = bool(run())
+        except Exception:
+            self._finish_attempt(attempt, JobLedger.FAILED)
+            raise
+        found = self.result_store.lookup_many(read_hash_lines(hash_path)) if success and hash_path else {}
+        if success and verify and not verify(found):
+            self._reject_results(found, output_path)
+            self._finish_attempt(attempt, JobLedger.FAILED)
+            return False
+        self._finish_attempt(attempt, self._attempt_status(success, complete))
+        if found:
+            self.ledger.record_results(evidence.metadata["fingerprint"], found, engine, mode)
+        return success
 
-        if isinstance(mode, str) and mode == "USE_PKCRACK":
-            decrypted_zip = os.path.join(
-                self.config.EXTRACTED_OUTPUT_DIR, f"decrypted_{evidence.name}.zip"
-            )
-            success = self.archive_engine.run_bkcrack(evidence.path, decrypted_zip)
+    def _start_attempt(self, evidence: EvidenceFile, engine: str, mode, uses_wordlists: bool = True):
+        """(attempt id, start time), or False if this attack already ran to the end."""
+        fingerprint = evidence.metadata["fingerprint"]
+        wordlist_fp = self.wordlist_fp if uses_wordlists else None
+        if self.ledger.attempt_finished(fingerprint, engine, mode, wordlist_fp):
+            self.logger.info("Skipping %s on %s - it already ran to the end with these wordlists", engine, evidence.name)
+            return False
+        return self.ledger.start_attempt(fingerprint, engine, mode, wordlist_fp), time.monotonic()
+
+    def _finish_attempt(self, attempt, status: str):
+        attempt_id, started = attempt
+        self.ledger.finish_attempt(attempt_id, status, time.monotonic() - started)
+
+    def _attempt_status(self, success: bool, complete=None) -> str:
+        if success:
+            return JobLedger.CRACKED
+        if self.runner.expired():
+            return JobLedger.PAUSED
+        if complete is None or complete():
+            return JobLedger.EXHAUSTED
+        return JobLedger.INCOMPLETE
+
+    def _reject_results(self, found: dict[str, str], output_path: str | None = None):
+        """Forget plaintexts that failed verification, so no later run reads them back as cracked."""
+        for h, plain in found.items():
+            self.result_store.reject(h, plain)
+        if output_path and os.path.exists(output_path):
+            os.remove(output_path)
+
+    def _record_outcome(self, evidence: EvidenceFile, success: bool):
+        """Count one cracked/failed file, and give its duplicates the same result."""
+        fingerprint = evidence.metadata.get("fingerprint")
+        if fingerprint:
             if success:
-                extracted_dir = self.archive_engine.extract_to_archive_dir(decrypted_zip)
-                if extracted_dir:
-                    self.logger.info(f"Decrypted archive extracted to: {extracted_dir}")
-            return success
+                status = JobLedger.CRACKED
+            else:
+                status = JobLedger.PAUSED if self.runner.expired() else JobLedger.FAILED
+            self.ledger.set_status(fingerprint, status)
+        for target in [evidence] + self.duplicates.get(evidence.path, []):
+            if target is not evidence and success:
+                self.intake.fan_out(evidence, target, self._output_pairs(evidence, target))
+            with self._count_lock:
+                self.processed_count += 1
+                if success:
+                    self.success_count += 1
+
+    def _output_pairs(self, evidence: EvidenceFile, duplicate: EvidenceFile) -> list[tuple[str, str]]:
+        """Every output path the engines derive from a file's name, for `evidence` and `duplicate`."""
+        pairs = []
+        for directory, pattern in (
+            (self.config.CRACKED_OUTPUT_DIR, "{name}.pot"),
+            (self.config.STEGO_OUTPUT_DIR, "{stem}_extracted.out"),
+            (self.config.STEGO_OUTPUT_DIR, "{stem}_zsteg.txt"),
+            (self.config.EXTRACTED_OUTPUT_DIR, "decrypted_{name}.zip"),
+            (self.config.ARCHIVE_DIR, "decrypted_{name}"),
+        ):
+            src, dst = (
+                os.path.join(directory, pattern.format(name=e.name, stem=os.path.splitext(e.name)[0]))
+                for e in (evidence, duplicate)
+            )
+            pairs.append((src, dst))
+        return pairs
+
+    def _log_progress(self, event: ProgressEvent):
+        self.logger.info(event.summary())
+
+    def _identify(self, path: str) -> EvidenceFile:
+        evidence = EvidenceFile(path=path)
+        (
+            evidence.file_type,
+            evidence.mime_type,
+            evidence.is_graphic,
+            evidence.is_archive,
+            evidence.is_text,  # now available
+        ) = self.file_id.identify(path)
+        sig = self.file_id.sniff(path)
+        if sig:
+            evidence.metadata["encrypted"] = sig.encrypted
+            if sig.scheme:
+                evidence.metadata["encryption_scheme"] = sig.scheme
+        return evidence
+
+    def _resource_class(self, evidence: EvidenceFile) -> str:
+        """Engine class an evidence file will mostly occupy (used for dispatch ordering)."""
+        if evidence.is_graphic or evidence.is_text:
+            return "cpu"
+        if evidence.is_archive or evidence.ext in {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".hash"}:
+            return "hashcat"
+        return "cpu"
+
+    def _is_hash_evidence(self, evidence: EvidenceFile) -> bool:
+        return evidence.is_archive or evidence.ext in {
+            ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".hash"
+        }
+
+    def _resolve_mode(self, evidence: EvidenceFile):
+        zip_info = None
+        if evidence.ext == ".zip":
+            zip_info = self.archive_engine.detect_zip_encryption(evidence.path)
+        return self.hashcat_engine.resolve_hashcat_mode(evidence, self.file_id, zip_info)
 
+    def _prepare_hash_job(self, evidence: EvidenceFile, mode) -> HashJob | None:
+        if evidence.ext == ".hash":
+            hash_path = evidence.path
         else:
-            # Extract hash first
             hash_path = self.extract_hash(evidence)
             if not hash_path:
-                return False
-            crack_target = hash_path
-
-            # Try Hashcat first
-            success = self.hashcat_engine.crack_hashfile(
-                crack_target, mode, wordlists, output_path
-            )
-            if not success:
-                self.logger.info(
-                    "Hashcat failed - falling back to John for %s", evidence.name
-                )
-                success = self.john_engine.crack(crack_target, wordlists, output_path)
-
-            if success:
-                # Optional future: if password recovered, attempt auto-extraction
-                # self.archive_engine.extract_to_archive_dir(evidence.path)
-                pass
-            return success
-
-    def _handle_encrypted_file(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
-        mode = self.hashcat_engine.resolve_hashcat_mode(evidence, self.file_id)
-        if mode is None or isinstance(mode, str):
-            self.logger.warning("Invalid mode for encrypted file %s", evidence.name)
-            return False
+                return None
 
-        # Extract hash first
-        hash_path = self.extract_hash(evidence)
-        if not hash_path:
-            return False
-        crack_target = hash_path
+        hashes = read_hash_lines(hash_path)
+        if not hashes:
+            self.logger.warning("No usable hashes in %s", hash_path)
+            return None
 
+        # The extracted signatures name the exact mode; batch under that one
+        mode = self.hashcat_engine.exact_mode(mode, hashes, evidence.name)
         output_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.pot")
-        success = self.hashcat_engine.crack_hashfile(
-            crack_target, mode, wordlists, output_path
-        )
-        if not success:
-            success = self.john_engine.crack(crack_target, wordlists, output_path)
-        return success
-
-    def _handle_hash_file(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
-        mode = self.hashcat_engine.resolve_hashcat_mode(evidence, self.file_id)
-        if mode is None or isinstance(mode, str):
-            self.logger.warning("Invalid mode for hash file %s", evidence.name)
-            return False
+        return HashJob(evidence, mode, hash_path, hashes, output_path)
+
+    def _run_item(self, item, wordlists: List[str]):
+        if isinstance(item, EvidenceFile):
+            return self._process(item, wordlists)
+        return self._run_hash_batch(item, wordlists)
+
+    def _run_hash_batch(self, jobs: List[HashJob], wordlists: List[str]) -> dict[str, bool]:
+        """Crack every job sharing one mode in a single batch, then fall back to John per file."""
+        # Files whose hashcat attack already ran to the end go straight to John
+        attempts = {}
+        for job in jobs:
+            attempt = self._start_attempt(job.evidence, "hashcat", job.mode)
+            if attempt:
+                attempts[job.evidence.path] = attempt
+        cracked = {}
+        if attempts:
+            try:
+                cracked = self.hashcat_engine.crack_batch(
+                    {job.evidence.path: job.hashes for job in jobs if job.evidence.path in attempts},
+                    jobs[0].mode,
+                    wordlists,
+                    self.config.BATCH_DIR,
+                )
+            except Exception:
+                for attempt in attempts.values():
+                    self._finish_attempt(attempt, JobLedger.FAILED)
+                raise
+        complete = self.hashcat_engine.last_run_complete()
+
+        outcome = {}
+        for job in jobs:
+            found = cracked.get(job.evidence.path)
+            attempt = attempts.get(job.evidence.path)
+            if found:
+                plains = {r.hash: r.plaintext for r in found}
+                # Verified before anything is recorded; John would only report
+                # the same password again, so a rejected one ends here
+                password = self._verify_archive(job.evidence, plains) if job.evidence.is_archive else None
+                if job.evidence.is_archive and password is None:
+                    self._reject_results(plains)
+                    if attempt:
+                        self._finish_attempt(attempt, JobLedger.FAILED)
+                    outcome[job.evidence.path] = False
+                    continue
+                if attempt:
+                    self._finish_attempt(attempt, JobLedger.CRACKED)
+                write_results(job.output_path, plains)
+                self.ledger.record_results(job.evidence.metadata["fingerprint"], plains, "hashcat", job.mode)
+                self.logger.info(
+                    "Hashcat cracked %d hash(es) for %s → %s", len(found), job.evidence.name, job.output_path
+                )
+                if password is not None:
+                    self._unpack(job.evidence, password)
+                outcome[job.evidence.path] = True
+                continue
 
-        output_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.pot")
-        success = self.hashcat_engine.crack_hashfile(
-            evidence.path, mode, wordlists, output_path
+            if attempt:
+                self._finish_attempt(attempt, self._attempt_status(False, lambda: complete))
+            if self.runner.expired():
+                outcome[job.evidence.path] = False
+                continue
+            self.logger.info("Hashcat failed - falling back to John for %s", job.evidence.name)
+            verified = []
+            outcome[job.evidence.path] = self._crack_john(
+                job.evidence, job.mode, job.hash_path, wordlists, job.output_path,
+                self._archive_check(job.evidence, verified),
+            )
+            if outcome[job.evidence.path] and verified:
+                self._unpack(job.evidence, verified[-1])
+        return outcome
+
+    def _crack_hashcat(self, evidence: EvidenceFile, mode, hash_path: str, wordlists: List[str], output_path: str,
+                       verify=None) -> bool:
+        return self._attempt(
+            evidence, "hashcat", mode,
+            lambda: self.hashcat_engine.crack_hashfile(hash_path, mode, wordlists, output_path),
+            self.hashcat_engine.last_run_complete,
+            hash_path,
+            verify=verify,
+            output_path=output_path,
         )
-        if not success:
-            success = self.john_engine.crack(evidence.path, wordlists, output_path)
-        return success
-from .config import Config
-from .models import EvidenceFile
-from .file_id import FileIdentifier
-from .wordlists import WordlistManager
-from .steg import StegEngine
-from .steg_zsteg import ZstegEngine
-from .cracking_hashcat import HashcatEngine
-from .cracking_john import JohnEngine
-from .archives import ArchiveEngine
 
+    def _crack_john(self, evidence: EvidenceFile, mode, hash_path: str, wordlists: List[str], output_path: str,
+                    verify=None) -> bool:
+        def run():
+            with self.scheduler.slot("cpu"):
+                return self.john_engine.crack(hash_path, wordlists, output_path)
 
-class ForensiCrackApp:
-    def __init__(self, config: Config, logger: logging.Logger):
-        self.config = config
-        self.logger = logger
-        self.file_id = FileIdentifier()
-        self.wordlist_mgr = WordlistManager(self.config.WORDLIST_DIR)
-        self.steg_engine = StegEngine(logger)
-        self.zsteg_engine = ZstegEngine(logger)
-        self.hashcat_engine = HashcatEngine(logger)
-        self.john_engine = JohnEngine(logger)
-        self.archive_engine = ArchiveEngine(
-            self.config.ARCHIVE_DIR, self.config.PLAINTEXTS_DIR, logger
+        return self._attempt(
+            evidence, "john", mode, run, self.john_engine.last_run_complete, hash_path,
+            verify=verify, output_path=output_path,
         )
-        self.processed_count = 0
-        self.success_count = 0
-
-    def execute(self):
-        self.logger.info("ForensiCrack execution started")
-        wordlists = self.wordlist_mgr.escalating_lists()
-        if not wordlists:
-            self.logger.error("No wordlists found in %s. Aborting.", self.config.WORDLIST_DIR)
-            return
-
-        self.logger.info("Using wordlists: %s", wordlists)
-
-        for filename in os.listdir(self.config.INPUT_DIR):
-            path = os.path.join(self.config.INPUT_DIR, filename)
-            if not os.path.isfile(path):
-                continue
 
-            evidence = EvidenceFile(path=path)
-            (
-                evidence.file_type,
-                evidence.mime_type,
-                evidence.is_graphic,
-                evidence.is_archive,
-                evidence.is_text,  # now available
-            ) = self.file_id.identify(path)
+    def _process(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
+        self.logger.info("Processing: %s (%s)", evidence.name, evidence.ext)
+        path = evidence.path
 
-            self.logger.info("Processing: %s (%s)", evidence.name, evidence.ext)
+        success = False
 
-            success = False
-
-            if evidence.is_graphic:
-                stego_output_dir = self.config.STEGO_OUTPUT_DIR
+        if evidence.is_graphic:
+            stego_output_dir = self.config.STEGO_OUTPUT_DIR
+            with self.scheduler.slot("cpu"):
                 if evidence.ext in {".jpg", ".jpeg"}:
-                    success = self.steg_engine.run(path, wordlists, stego_output_dir)
+                    success = self._attempt(
+                        evidence, "stegseek", None,
+                        lambda: self.steg_engine.run(
+                            path, wordlists, stego_output_dir, evidence.metadata.get("fingerprint")
+                        ),
+                    )
                     if not success:
                         self.logger.info(
                             "Stegseek failed - falling back to zsteg for %s", evidence.name
                         )
-                        success = self.zsteg_engine.run(path, stego_output_dir)
+                        success = self._attempt(
+                            evidence, "zsteg", None,
+                            lambda: self.zsteg_engine.run(path, stego_output_dir),
+                            uses_wordlists=False,
+                        )
                 elif evidence.ext in {".png", ".bmp"}:
-                    success = self.zsteg_engine.run(path, stego_output_dir)
-
-            elif evidence.is_archive:
-                success = self._handle_archive(evidence, wordlists)
-
-            elif evidence.ext in {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"}:
-                success = self._handle_encrypted_file(evidence, wordlists)
-
-            elif evidence.ext == ".hash":
-                success = self._handle_hash_file(evidence, wordlists)
-
-            elif evidence.is_text:
-                self.logger.info(
-                    "Plain text file detected (%s) - no cracking applied, skipping", evidence.name
-                )
-                # Future: could add keyword search, entropy analysis, etc.
-
-            else:
-                self.logger.warning("Unsupported file type for %s - skipping", evidence.name)
+                    success = self._attempt(
+                        evidence, "zsteg", None,
+                        lambda: self.zsteg_engine.run(path, stego_output_dir),
+                        uses_wordlists=False,
+                    )
+
+        elif evidence.is_archive:
+            success = self._handle_archive(evidence, wordlists)
+
+        elif evidence.is_text:
+            self.logger.info(
+                "Plain text file detected (%s) - no cracking applied, skipping", evidence.name
+            )
+            # Future: could add keyword search, entropy analysis, etc.
 
-            if success:
-                self.success_count += 1
-            self.processed_count += 1
+        else:
+            self.logger.warning("Unsupported file type for %s - skipping", evidence.name)
 
-        self.logger.info(
-            "Execution complete. Processed %d files, %d successes.",
-            self.processed_count,
-            self.success_count,
-        )
+        return success
 
-    def extract_hash(self, evidence: EvidenceFile) -> str | None:
+    def extract_hash(self, evidence: EvidenceFile, encryption: str | None = None) -> str | None:
+        """
+        Write the hashes of `evidence` to a .hash file and return its path.
+        In a ZIP the cheapest member is targeted (of those using
+        `encryption`, if given).
+        """
         ext = evidence.ext.lower()
         hash_extract_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.hash")
 
@@ -341,12 +690,24 @@ class ForensiCrackApp:
             self.logger.warning(f"No hash extraction tool for {ext}")
             return None
 
+        # In-process extraction (or a cached earlier result) avoids the *2john startup;
+        # in a ZIP it targets the member that is cheapest to verify
+        member = self.archive_engine.cheapest_member(evidence.path, encryption) if ext == ".zip" else None
+        lines = self.hash_extractor.extract(evidence.path, ext, member)
+        if lines:
+            with open(hash_extract_path, "w", encoding="utf-8") as f:
+                f.write("".join(line + "\n" for line in lines))
+            self.logger.info(f"Hash extracted to {hash_extract_path}")
+            return hash_extract_path
+
         cmd = [tool, evidence.path]
         self.logger.info(f"Extracting hash with {' '.join(cmd)}")
         try:
             with open(hash_extract_path, "w") as f:
                 subprocess.run(cmd, check=True, stdout=f)
             self.logger.info(f"Hash extracted to {hash_extract_path}")
+            with open(hash_extract_path, "r", encoding="utf-8", errors="replace") as f:
+                self.hash_extractor.remember(evidence.path, [line.rstrip("\n") for line in f if line.strip()])
             return hash_extract_path
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Hash extraction failed: {e.stderr}")
@@ -369,66 +730,112 @@ class ForensiCrackApp:
             decrypted_zip = os.path.join(
                 self.config.EXTRACTED_OUTPUT_DIR, f"decrypted_{evidence.name}.zip"
             )
-            success = self.archive_engine.run_bkcrack(evidence.path, decrypted_zip)
+            def run():
+                with self.scheduler.slot("bkcrack"):
+                    return self.archive_engine.run_bkcrack(evidence.path, decrypted_zip)
+
+            # Never "exhausted": a known plaintext added later can make it succeed
+            success = self._attempt(evidence, "bkcrack", mode, run, lambda: False, uses_wordlists=False)
             if success:
                 extracted_dir = self.archive_engine.extract_to_archive_dir(decrypted_zip)
                 if extracted_dir:
                     self.logger.info(f"Decrypted archive extracted to: {extracted_dir}")
-            return success
-
-        else:
-            # Extract hash first
-            hash_path = self.extract_hash(evidence)
-            if not hash_path:
+                    self._expand(evidence, extracted_dir)
+                return success
+            if self.runner.expired():
                 return False
-            crack_target = hash_path
-
-            # Try Hashcat first
-            success = self.hashcat_engine.crack_hashfile(
-                crack_target, mode, wordlists, output_path
+            self.logger.info(
+                "bkcrack failed - running the wordlists against the cheapest ZipCrypto member of %s", evidence.name
             )
-            if not success:
-                self.logger.info(
-                    "Hashcat failed - falling back to John for %s", evidence.name
-                )
-                success = self.john_engine.crack(crack_target, wordlists, output_path)
-
-            if success:
-                # Optional future: if password recovered, attempt auto-extraction
-                # self.archive_engine.extract_to_archive_dir(evidence.path)
-                pass
-            return success
-
-    def _handle_encrypted_file(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
-        mode = self.hashcat_engine.resolve_hashcat_mode(evidence, self.file_id)
-        if mode is None or isinstance(mode, str):
-            self.logger.warning("Invalid mode for encrypted file %s", evidence.name)
-            return False
+            mode = self.PKZIP_MODES
 
         # Extract hash first
-        hash_path = self.extract_hash(evidence)
+        hash_path = self.extract_hash(evidence, "zipcrypto" if mode == self.PKZIP_MODES else None)
         if not hash_path:
             return False
         crack_target = hash_path
-
-        output_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.pot")
-        success = self.hashcat_engine.crack_hashfile(
-            crack_target, mode, wordlists, output_path
-        )
-        if not success:
-            success = self.john_engine.crack(crack_target, wordlists, output_path)
+        hashes = read_hash_lines(hash_path)
+        if mode == self.PKZIP_MODES:
+            # zip2john (or a hash cached by an older run) may still target an
+            # AES entry of a mixed archive; the signature names the real mode
+            mode = detect_mode(hashes) or mode
+        mode = self.hashcat_engine.exact_mode(mode, hashes, evidence.name)
+
+        # Try Hashcat first; a password is verified before it is recorded
+        verified = []
+        verify = self._archive_check(evidence, verified)
+        success = self._crack_hashcat(evidence, mode, crack_target, wordlists, output_path, verify)
+        # John would only report a rejected password again
+        if not success and not verified:
+            self.logger.info(
+                "Hashcat failed - falling back to John for %s", evidence.name
+            )
+            success = self._crack_john(evidence, mode, crack_target, wordlists, output_path, verify)
+        if success:
+            self._unpack(evidence, verified[-1])
         return success
 
-    def _handle_hash_file(self, evidence: EvidenceFile, wordlists: List[str]) -> bool:
-        mode = self.hashcat_engine.resolve_hashcat_mode(evidence, self.file_id)
-        if mode is None or isinstance(mode, str):
-            self.logger.warning("Invalid mode for hash file %s", evidence.name)
-            return False
-
-        output_path = os.path.join(self.config.CRACKED_OUTPUT_DIR, f"{evidence.name}.pot")
-        success = self.hashcat_engine.crack_hashfile(
-            evidence.path, mode, wordlists, output_path
+    def _unpack(self, evidence: EvidenceFile, password: bytes):
+        """Extract an archive whose password was recovered and queue its contents as child evidence."""
+        if evidence.ext != ".zip":
+            self.logger.info("No in-process extractor for %s archives - %s stays packed", evidence.ext, evidence.name)
+            return
+        extracted_dir = self.archive_engine.extract_to_archive_dir(
+            evidence.path, password, os.path.basename(self._extraction_dir(evidence))
         )
-        if not success:
-            success = self.john_engine.crack(evidence.path, wordlists, output_path)
-        return success
+        if extracted_dir:
+            self.logger.info("Decrypted archive extracted to: %s", extracted_dir)
+            self._expand(evidence, extracted_dir)
+
+    def _archive_check(self, evidence: EvidenceFile, verified: list | None = None):
+        """
+        `verify` callback for an archive's attempts (None for other evidence):
+        checks the recovered passwords, appending the outcome of each check
+        (the password, or None if rejected) to `verified`.
+        """
+        if not evidence.is_archive:
+            return None
+
+        def verify(found: dict[str, str]) -> bool:
+            password = self._verify_archive(evidence, found)
+            if verified is not None:
+                verified.append(password)
+            return password is not None
+
+        return verify
+
+    def _verify_archive(self, evidence: EvidenceFile, found: dict[str, str]) -> bytes | None:
+        """
+        Check the recovered password(s) against every encrypted member, and
+        return the one that opens the most (as raw bytes). The hash only
+        covered the cheapest member, so members needing another password are
+        reported, and a crack no member accepts is rejected as a false
+        positive (None).
+        """
+        passwords = sorted({candidate_bytes(p) for p in found.values()})
+        best, best_opened = None, set()
+        opened = set()
+        rejected = set()
+        for password in passwords:
+            checked = self.archive_engine.verify_password(evidence.path, password)
+            if checked is None:
+                return password
+            accepted = {name for name, ok in checked.items() if ok}
+            if len(accepted) > len(best_opened):
+                best, best_opened = password, accepted
+            opened |= accepted
+            rejected |= set(checked) - accepted
+        rejected -= opened
+        if not opened:
+            self.logger.warning(
+                "Recovered password does not open any member of %s - treating it as a false positive", evidence.name
+            )
+            return None
+        if rejected:
+            self.logger.warning(
+                "%d member(s) of %s use a different password: %s",
+                len(rejected), evidence.name, ", ".join(sorted(rejected)),
+            )
+        else:
+            self.logger.info("Recovered password opens all %d encrypted member(s) of %s", len(opened), evidence.name)
+        return best
@@ -1,79 +1,696 @@
 import os
+import re
+import hmac
+import zlib
+import lzma
+import struct
 import zipfile
+import hashlib
 import subprocess
 import logging
 import shutil
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .models import ArchiveMember, ZipProfile
+from .keystore import ZipKeyStore
+from .plaintexts import PlaintextIndex
+
+_ZIP_EOCD = b"PK\x05\x06"
+_ZIP64_LOCATOR = b"PK\x06\x07"
+_ZIP_CENTRAL = b"PK\x01\x02"
+_ZIP64_EXTRA = 0x0001
+_STRONG_EXTRA = 0x0017
+_AES_EXTRA = 0x9901
+_AES_METHOD = 99
+# General purpose flags
+_FLAG_ENCRYPTED = 0x0001
+_FLAG_DESCRIPTOR = 0x0008
+_FLAG_STRONG = 0x0040
+_FLAG_UTF8 = 0x0800
+# WinZip AES strength -> key length (the salt is half of it)
+_AES_KEY = {1: 16, 2: 24, 3: 32}
+_AES_PBKDF2_ROUNDS = 1000
+# Compression methods hashcat/John can inflate to check a ZipCrypto member's CRC
+_PKZIP_METHODS = {zipfile.ZIP_STORED: 1, zipfile.ZIP_DEFLATED: 4}
+_READ_BLOCK = 1024 * 1024
+# bkcrack needs at least 12 known bytes (8 of them contiguous)
+_BKCRACK_MIN_PLAINTEXT = 12
+# "Keys: k0 k1 k2", or "Keys" with the triple on the next line (newer bkcrack)
+_BKCRACK_KEYS = re.compile(r"Keys:?\s+([0-9a-fA-F]{8})\s+([0-9a-fA-F]{8})\s+([0-9a-fA-F]{8})\b")
+# Partial known plaintext per entry extension: alternative [(offset, bytes), ...] sets,
+# each with at least 8 contiguous bytes; negative offsets count from the end of the entry
+_ZIP_TAIL = (-22, b"PK\x05\x06\x00\x00\x00\x00")   # end record of a single-disk ZIP without comment
+_OOXML = [[
+    (0, b"PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00\x21\x00"),  # as written by Microsoft Office
+    (26, b"\x13\x00"),
+    (30, b"[Content_Types].xml"),
+]]
+_FORMAT_PLAINTEXT = {
+    ".png": [[(0, b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR")]],
+    ".zip": [[(0, b"PK\x03\x04\x14\x00"), _ZIP_TAIL], [(0, b"PK\x03\x04\x0a\x00"), _ZIP_TAIL]],
+    ".docx": _OOXML,
+    ".xlsx": _OOXML,
+    ".pptx": _OOXML,
+    # The version digit is guessed, most common first
+    ".pdf": [[(0, f"%PDF-1.{v}".encode()), (-6, b"%%EOF\n")] for v in (7, 4, 5, 6, 3)],
+}
+# Members up to this size are decrypted and CRC-checked in full when testing cached keys;
+# of a larger deflated member only this much is decrypted and must inflate cleanly
+_KEY_CHECK_MAX = 64 * 1024
+# Check bytes compared per archive, and how many must match when no member's content can be checked
+_KEY_CHECK_ENTRIES = 16
+_KEY_CHECK_MIN_BYTES = 3
+
+
+def _crc_table() -> list[int]:
+    table = []
+    for n in range(256):
+        c = n
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def _zipcrypto_decrypt(keys: tuple[int, int, int], data: bytes) -> bytes:
+    """Decrypt ZipCrypto data from the internal key state bkcrack recovers."""
+    k0, k1, k2 = keys
+    out = bytearray(len(data))
+    for i, c in enumerate(data):
+        t = (k2 | 2) & 0xFFFF
+        p = c ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+        out[i] = p
+        k0 = _CRC_TABLE[(k0 ^ p) & 0xFF] ^ (k0 >> 8)
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = _CRC_TABLE[(k2 ^ (k1 >> 24)) & 0xFF] ^ (k2 >> 8)
+    return bytes(out)
+
+
+def _extra_fields(extra: bytes) -> dict[int, bytes]:
+    fields = {}
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, pos)
+        fields[header_id] = extra[pos + 4: pos + 4 + length]
+        pos += 4 + length
+    return fields
+
+
+def _zip64_values(field: bytes, usize: int, csize: int, offset: int) -> tuple[int, int, int]:
+    # The ZIP64 field holds, in order, a 64-bit value for each of these that is 0xFFFFFFFF
+    values = iter(struct.unpack_from("<Q", field, i)[0] for i in range(0, len(field) - 7, 8))
+    if usize == 0xFFFFFFFF:
+        usize = next(values, usize)
+    if csize == 0xFFFFFFFF:
+        csize = next(values, csize)
+    if offset == 0xFFFFFFFF:
+        offset = next(values, offset)
+    return usize, csize, offset
+
+
+def _member_cost(member: ArchiveMember) -> float:
+    """
+    Work to test one candidate against `member`, in SHA-1 compressions.
+    AES pays PBKDF2 for every candidate; the HMAC over the data only runs for
+    the 1 in 65536 that pass the password verifier. ZipCrypto costs a few
+    table lookups per candidate plus decrypting (and inflating) the data for
+    the ones that pass the check byte(s).
+    """
+    if member.encryption == "aes":
+        blocks = -(-(2 * _AES_KEY[member.aes_strength] + 2) // 20)
+        return blocks * 2 * _AES_PBKDF2_ROUNDS + member.compressed_size / 64 / 65536
+    passing = 256 if member.flags & _FLAG_DESCRIPTOR else 65536
+    return 1 + member.compressed_size * _PKZIP_METHODS.get(member.method, 8) / passing
+
+
+def _central_directory(f, size: int) -> tuple[int, int, int]:
+    """(entry count, directory offset, prefix length) from the end records."""
+    tail_len = min(size, 65535 + 22)
+    f.seek(size - tail_len)
+    tail = f.read(tail_len)
+    eocd = tail.rfind(_ZIP_EOCD)
+    if eocd < 0:
+        raise zipfile.BadZipFile("no end of central directory record")
+    entries, cd_size, cd_offset = struct.unpack_from("<HII", tail, eocd + 10)
+    if entries == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+        locator = tail.rfind(_ZIP64_LOCATOR, 0, eocd)
+        if locator < 0:
+            raise zipfile.BadZipFile("ZIP64 locator missing")
+        f.seek(struct.unpack_from("<Q", tail, locator + 8)[0])
+        entries, cd_size, cd_offset = struct.unpack_from("<QQQ", f.read(56), 32)
+        return entries, cd_offset, 0
+    # Self-extracting stubs and other prefixed data shift every stored offset
+    prefix = max(0, size - tail_len + eocd - cd_size - cd_offset)
+    return entries, cd_offset + prefix, prefix
+
+
+def profile_zip(zip_path: str) -> ZipProfile:
+    """
+    Encryption, compression, sizes and CRC of every entry of a ZIP, from
+    one sequential pass over its central directory (no member data is read).
+    """
+    profile = ZipProfile(zip_path)
+    with open(zip_path, "rb") as f:
+        entries, cd_offset, prefix = _central_directory(f, os.fstat(f.fileno()).st_size)
+        f.seek(cd_offset)
+        for _ in range(entries):
+            record = f.read(46)
+            if len(record) < 46 or record[:4] != _ZIP_CENTRAL:
+                raise zipfile.BadZipFile("truncated central directory")
+            flags, method, mod_time, _date, crc, csize, usize, name_len, extra_len, comment_len = (
+                struct.unpack_from("<HHHHIIIHHH", record, 8)
+            )
+            offset = struct.unpack_from("<I", record, 42)[0]
+            name = f.read(name_len)
+            extra = _extra_fields(f.read(extra_len))
+            f.seek(comment_len, os.SEEK_CUR)
+            if _ZIP64_EXTRA in extra:
+                usize, csize, offset = _zip64_values(extra[_ZIP64_EXTRA], usize, csize, offset)
+
+            member = ArchiveMember(
+                name=name.decode("utf-8" if flags & _FLAG_UTF8 else "cp437", errors="replace"),
+                offset=offset + prefix,
+                compressed_size=csize,
+                size=usize,
+                crc=crc,
+                method=method,
+                flags=flags,
+                dos_time=mod_time,
+            )
+            aes = extra.get(_AES_EXTRA)
+            if not flags & _FLAG_ENCRYPTED:
+                member.verifiable = False
+            elif flags & _FLAG_STRONG or _STRONG_EXTRA in extra:
+                # PKWARE strong encryption: nothing here can attack it
+                member.encryption = "strong"
+                member.verifiable = False
+            elif method == _AES_METHOD:
+                member.encryption = "aes"
+                if aes and len(aes) >= 7 and aes[4] in _AES_KEY:
+                    member.aes_strength = aes[4]
+                    member.method = struct.unpack_from("<H", aes, 5)[0]
+                else:
+                    member.verifiable = False
+            else:
+                member.encryption = "zipcrypto"
+                member.verifiable = method in _PKZIP_METHODS
+            if member.verifiable:
+                member.cost = _member_cost(member)
+            profile.members.append(member)
+    return profile
 
 
 class ArchiveEngine:
-    def __init__(self, archive_dir: str, plaintexts_dir: str, logger: logging.Logger | None = None):
+    def __init__(self, archive_dir: str, plaintexts_dir: str, logger: logging.Logger | None = None,
+                 plaintext_index: str | None = None, key_store: str | None = None, extract_workers: int = 4, max_extract_bytes: int = 8 * 1024 ** 3,
+                 max_extract_ratio: int = 200, max_extract_members: int = 20_000,
+                 bkcrack_threads: int | None = None, bkcrack_parallel: int = 2, bkcrack_max_attacks: int = 8):
         self.archive_dir = archive_dir
         self.plaintexts_dir = plaintexts_dir
         os.makedirs(self.archive_dir, exist_ok=True)
         os.makedirs(self.plaintexts_dir, exist_ok=True)
         self.logger = logger or logging.getLogger("ForensiCrack.Archive")
+        self.plaintext_index = PlaintextIndex(plaintexts_dir, plaintext_index, self.logger)
+        self.key_store = ZipKeyStore(key_store, self.logger)
+        # bkcrack: cores shared by the attacks on one archive, attacks at once, header attacks per archive
+        self.bkcrack_threads = max(1, int(bkcrack_threads or os.cpu_count() or 1))
+        self.bkcrack_parallel = max(1, int(bkcrack_parallel))
+        self.bkcrack_max_attacks = max(1, int(bkcrack_max_attacks))
+        # Decompression bomb ceilings, per extracted archive
+        self.extract_workers = max(1, int(extract_workers))
+        self.max_extract_bytes = max_extract_bytes
+        self.max_extract_ratio = max_extract_ratio
+        self.max_extract_members = max_extract_members
+        # path -> (stat key, profile)
+        self._profiles: dict[str, tuple[str, ZipProfile]] = {}
+        self._lock = threading.Lock()
+
+    def profile(self, zip_path: str) -> ZipProfile:
+        """Central directory profile of `zip_path`, read once per version of the file."""
+        st = os.stat(zip_path)
+        key = f"{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        path = os.path.abspath(zip_path)
+        with self._lock:
+            cached = self._profiles.get(path)
+            if cached and cached[0] == key:
+                return cached[1]
+        profile = profile_zip(zip_path)
+        self.logger.info(f"{os.path.basename(zip_path)}: {len(profile.members)} entries ({profile.summary()})")
+        with self._lock:
+            self._profiles[path] = (key, profile)
+        return profile
+
+    def zip_members(self, zip_path: str) -> list[ArchiveMember]:
+        """Encrypted members of `zip_path`, cheapest verifiable target first."""
+        return self.profile(zip_path).encrypted
+
+    def cheapest_member(self, zip_path: str, encryption: str | None = None) -> ArchiveMember | None:
+        """
+        The encrypted member whose hash is cheapest to attack, if any can be
+        verified; only members using `encryption` ("zipcrypto", "aes") if given.
+        """
+        try:
+            members = self.zip_members(zip_path)
+        except (OSError, zipfile.BadZipFile, struct.error) as e:
+            self.logger.error(f"Bad zip {zip_path}: {e}")
+            return None
+        if encryption:
+            members = [m for m in members if m.encryption == encryption]
+        if not members or not members[0].verifiable:
+            return None
+        best = members[0]
+        if len(members) > 1:
+            self.logger.info(
+                f"Targeting {best.name} ({best.compressed_size} bytes, {best.cipher}) "
+                f"- cheapest of {len(members)} encrypted member(s) in {os.path.basename(zip_path)}"
+            )
+        return best
 
     def detect_zip_encryption(self, zip_path: str) -> str | None:
+        """"zipcrypto", "aes", "strong", "mixed", or None for an unencrypted (or unreadable) ZIP."""
         try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                for zinfo in zf.infolist():
-                    if zinfo.flag_bits & 0x1:
-                        return "zipcrypto"
-        except zipfile.BadZipFile as e:
+            return self.profile(zip_path).encryption
+        except (OSError, zipfile.BadZipFile, struct.error) as e:
             self.logger.error(f"Bad zip {zip_path}: {e}")
         return None
 
+    def verify_password(self, archive_path: str, password: bytes) -> dict[str, bool] | None:
+        """
+        Check a recovered password (raw bytes, as decoded from hashcat's
+        output) against the encrypted members of an archive: member name ->
+        whether it opens. ZIP members are checked in process (ZipCrypto by
+        CRC, AES by PBKDF2 verifier and HMAC); 7z is tested with `7z t` as a
+        whole ("*"). None if it cannot be checked.
+        """
+        if archive_path.lower().endswith(".7z"):
+            return self._verify_7z(archive_path, password)
+        try:
+            members = self.zip_members(archive_path)
+        except (OSError, zipfile.BadZipFile, struct.error) as e:
+            self.logger.error(f"Cannot verify password on {archive_path}: {e}")
+            return None
+        opened = {}
+        with open(archive_path, "rb") as f, zipfile.ZipFile(f) as zf:
+            for member in members:
+                if member.encryption == "aes" and member.verifiable:
+                    opened[member.name] = self._verify_aes(f, member, password)
+                elif member.encryption == "zipcrypto":
+                    opened[member.name] = self._verify_zipcrypto(zf, member, password)
+        return opened
+
+    @staticmethod
+    def _verify_zipcrypto(zf: zipfile.ZipFile, member: ArchiveMember, pwd: bytes) -> bool:
+        try:
+            with zf.open(member.name, pwd=pwd) as entry:
+                # Reading to the end makes zipfile compare the CRC
+                while entry.read(_READ_BLOCK):
+                    pass
+            return True
+        except (RuntimeError, zipfile.BadZipFile, NotImplementedError, EOFError, zlib.error,
+                lzma.LZMAError, OSError, ValueError):
+            # Bad check byte, CRC mismatch, or the inflater choked on a wrong key
+            return False
+
+    @staticmethod
+    def _verify_aes(f, member: ArchiveMember, pwd: bytes) -> bool:
+        key_len = _AES_KEY[member.aes_strength]
+        salt_len = key_len // 2
+        f.seek(member.offset)
+        local = f.read(30)
+        if len(local) < 30:
+            return False
+        name_len, extra_len = struct.unpack_from("<HH", local, 26)
+        f.seek(member.offset + 30 + name_len + extra_len)
+        salt = f.read(salt_len)
+        verifier = f.read(2)
+        key = hashlib.pbkdf2_hmac("sha1", pwd, salt, _AES_PBKDF2_ROUNDS, 2 * key_len + 2)
+        if key[-2:] != verifier:
+            return False
+        mac = hmac.new(key[key_len:2 * key_len], digestmod=hashlib.sha1)
+        remaining = member.compressed_size - salt_len - 2 - 10
+        while remaining > 0:
+            block = f.read(min(_READ_BLOCK, remaining))
+            if not block:
+                return False
+            mac.update(block)
+            remaining -= len(block)
+        return hmac.compare_digest(mac.digest()[:10], f.read(10))
+
+    def _verify_7z(self, archive_path: str, password: bytes) -> dict[str, bool] | None:
+        tool = shutil.which("7z") or shutil.which("7za")
+        if not tool:
+            self.logger.info("7z not installed - cannot verify the recovered password")
+            return None
+        try:
+            res = subprocess.run(
+                # surrogateescape round-trips non-UTF-8 bytes through the argument list
+                [tool, "t", "-y", "-p" + password.decode("utf-8", "surrogateescape"), archive_path],
+                capture_output=True, text=True, errors="replace",
+            )
+        except OSError as e:
+            self.logger.warning(f"7z test failed to start: {e}")
+            return None
+        return {"*": res.returncode == 0}
+
     def find_matching_plaintext(self, encrypted_zip: str) -> tuple[str | None, str | None]:
+        """
+        A known plaintext for one stored ZipCrypto entry, looked up by the
+        CRC32 and size the central directory lists (names do not matter).
+        Deflated entries are left out: bkcrack compares the plaintext with
+        the stored bytes, which for them are the compressed ones, so the
+        caller falls back to format_plaintexts.
+        """
         try:
-            with zipfile.ZipFile(encrypted_zip, "r") as zf:
-                encrypted_files = {info.filename for info in zf.infolist() if info.flag_bits & 0x1}
+            # bkcrack only attacks ZipCrypto entries, and only stored ones match a plaintext file
+            candidates = [
+                m for m in self.zip_members(encrypted_zip)
+                if m.encryption == "zipcrypto" and m.method == zipfile.ZIP_STORED
+                and m.size >= _BKCRACK_MIN_PLAINTEXT
+            ]
         except Exception as e:
             self.logger.error(f"Cannot read encrypted ZIP {encrypted_zip}: {e}")
             return None, None
 
-        for root, _, files in os.walk(self.plaintexts_dir):
-            for fname in files:
-                if fname in encrypted_files:
-                    full_path = os.path.join(root, fname)
-                    self.logger.info(f"Found known plaintext match: {full_path} → {fname}")
-                    return full_path, fname
-        self.logger.warning(f"No filename match found in {self.plaintexts_dir}")
+        self.plaintext_index.refresh()
+        candidates.sort(key=lambda m: -m.size)
+        for member in candidates:
+            full_path = self.plaintext_index.lookup(member.crc, member.size)
+            if full_path:
+                self.logger.info(f"Found known plaintext match: {full_path} → {member.name}")
+                return full_path, member.name
+        self.logger.warning(f"No known plaintext in {self.plaintexts_dir} matches a stored entry of {encrypted_zip}")
         return None, None
 
     def run_bkcrack(self, encrypted_zip: str, output_zip: str) -> bool:
+        """Recover the archive's internal keys (cached or by attack) and write the decrypted copy to `output_zip`."""
+        keys = self.recover_keys(encrypted_zip)
+        return keys is not None and self.decrypt_with_keys(encrypted_zip, keys, output_zip)
+
+    def recover_keys(self, encrypted_zip: str) -> tuple[int, int, int] | None:
+        """
+        ZipCrypto internal keys of `encrypted_zip`: known ones first, then
+        every cached key family (archives sharing a password share keys),
+        and only then a bkcrack known-plaintext attack - with a plaintext
+        file from the library, or else with partial plaintext guessed from
+        the file-format headers of stored entries.
+        """
+        keys = self.key_store.keys_for(encrypted_zip)
+        if keys:
+            self.logger.info(f"Keys for {encrypted_zip} were recovered earlier: {ZipKeyStore.format(keys)}")
+            return keys
+        for keys in self.key_store.families():
+            if self.keys_open(encrypted_zip, keys):
+                self.logger.info(f"Cached bkcrack keys {ZipKeyStore.format(keys)} open {encrypted_zip} - skipping the attack")
+                self.key_store.remember(keys, encrypted_zip)
+                return keys
+
         plaintext_path, internal_name = self.find_matching_plaintext(encrypted_zip)
-        if not plaintext_path or not internal_name:
-            self.logger.error("Cannot run bkcrack: no matching known plaintext")
+        if plaintext_path and internal_name:
+            # Note: -P is not used; -p is for plaintext file
+            attacks = [["-c", internal_name, "-p", plaintext_path]]
+        else:
+            attacks = self.format_plaintexts(encrypted_zip)
+            if not attacks:
+                self.logger.error("Cannot run bkcrack: no matching known plaintext")
+                return None
+            self.logger.info(
+                f"No known plaintext file for {encrypted_zip} - trying {len(attacks)} partial "
+                f"plaintext(s) from file-format headers"
+            )
+        keys = self._bkcrack_attacks(encrypted_zip, attacks)
+        if keys:
+            self.logger.info(f"bkcrack recovered keys {ZipKeyStore.format(keys)} for {encrypted_zip}")
+            self.key_store.remember(keys, encrypted_zip)
+        return keys
+
+    def format_plaintexts(self, zip_path: str) -> list[list[str]]:
+        """
+        bkcrack arguments (-c entry, -x offset hex ...) for every stored
+        ZipCrypto entry whose extension has a known header, most reliable
+        guesses first. Deflated entries cannot be attacked this way: their
+        stored bytes are compressed.
+        """
+        attacks = []
+        for member in self.zip_members(zip_path):
+            if member.encryption != "zipcrypto" or member.method != zipfile.ZIP_STORED:
+                continue
+            for known in _FORMAT_PLAINTEXT.get(os.path.splitext(member.name)[1].lower(), []):
+                # Negative offsets count back from the end of the entry
+                pieces = [(offset if offset >= 0 else member.size + offset, data) for offset, data in known]
+                if all(0 <= offset and offset + len(data) <= member.size for offset, data in pieces):
+                    args = ["-c", member.name]
+                    for offset, data in pieces:
+                        args += ["-x", str(offset), data.hex()]
+                    attacks.append(args)
+        return attacks[:self.bkcrack_max_attacks]
+
+    def _bkcrack_attacks(self, encrypted_zip: str, attacks: list[list[str]]) -> tuple[int, int, int] | None:
+        """
+        Run the bkcrack attacks, up to bkcrack_parallel at once with the
+        cores split between them; the first to recover the keys stops the rest.
+        """
+        parallel = min(self.bkcrack_parallel, len(attacks))
+        threads = max(1, self.bkcrack_threads // parallel)
+        found = threading.Event()
+        running: set[subprocess.Popen] = set()
+        lock = threading.Lock()
+
+        def attack(args: list[str]) -> tuple[int, int, int] | None:
+            if found.is_set():
+                return None
+            cmd = ["bkcrack", "-C", encrypted_zip, *args, "-j", str(threads)]
+            self.logger.info(f"Running bkcrack: {' '.join(cmd)}")
+            try:
+                proc = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, errors="replace"
+                )
+            except OSError as e:
+                self.logger.warning(f"bkcrack failed: {e}")
+                return None
+            with lock:
+                running.add(proc)
+            try:
+                stdout, stderr = proc.communicate()
+            finally:
+                with lock:
+                    running.discard(proc)
+            match = _BKCRACK_KEYS.search(stdout)
+            if proc.returncode != 0 or not match:
+                if not found.is_set():
+                    self.logger.warning(f"bkcrack failed: {stderr.strip() or 'no keys found'}")
+                return None
+            found.set()
+            with lock:
+                for other in running:
+                    other.kill()
+            return tuple(int(k, 16) for k in match.groups())
+
+        with ThreadPoolExecutor(parallel, thread_name_prefix="forensicrack-bkcrack") as pool:
+            for keys in pool.map(attack, attacks):
+                if keys:
+                    return keys
+        return None
+
+    def keys_open(self, zip_path: str, keys: tuple[int, int, int]) -> bool:
+        """
+        True if `keys` decrypt the ZipCrypto entries of `zip_path`. Every
+        entry's check byte must match (one byte passes 1 wrong family in
+        256), and one entry's content must check out as well: a small entry
+        is inflated in full against its CRC, a large deflated one must
+        inflate a decrypted prefix without error. With no such entry, at
+        least _KEY_CHECK_MIN_BYTES check bytes must match.
+        """
+        try:
+            members = [m for m in self.zip_members(zip_path) if m.encryption == "zipcrypto"]
+        except (OSError, zipfile.BadZipFile, struct.error):
+            return False
+        if not members:
+            return False
+        members = members[:_KEY_CHECK_ENTRIES]
+        content = next(
+            (m for m in members if m.compressed_size <= _KEY_CHECK_MAX and m.method in _PKZIP_METHODS),
+            next((m for m in members if m.method == zipfile.ZIP_DEFLATED), None),
+        )
+        with open(zip_path, "rb") as f:
+            for member in members:
+                f.seek(member.offset)
+                local = f.read(30)
+                if len(local) < 30:
+                    return False
+                name_len, extra_len = struct.unpack_from("<HH", local, 26)
+                f.seek(member.offset + 30 + name_len + extra_len)
+                data = f.read(min(member.compressed_size, 12 + _KEY_CHECK_MAX) if member is content else 12)
+                plain = _zipcrypto_decrypt(keys, data)
+                check = (member.dos_time >> 8) if member.flags & _FLAG_DESCRIPTOR else (member.crc >> 24)
+                if len(plain) < 12 or plain[11] != check & 0xFF:
+                    return False
+                if member is content and not self._key_content_ok(member, plain[12:]):
+                    return False
+        return content is not None or len(members) >= _KEY_CHECK_MIN_BYTES
+
+    @staticmethod
+    def _key_content_ok(member: ArchiveMember, body: bytes) -> bool:
+        """Whether decrypted member data (all of it, or a prefix of a large member) is plausible."""
+        try:
+            if member.method == zipfile.ZIP_DEFLATED:
+                inflater = zlib.decompressobj(-15)
+                out = inflater.decompress(body)
+                if len(body) < member.compressed_size - 12:
+                    # Only a prefix was read: wrong keys turn the prefix into noise that fails to inflate (or ends the stream early)
+                    return not inflater.eof
+                body = out
+        except zlib.error:
             return False
+        return zlib.crc32(body) == member.crc
 
-        cmd = [
-            "bkcrack",
-            "-C", encrypted_zip,
-            "-c", internal_name,
-            "-p", plaintext_path,  # Note: -P is not used; -p is for plaintext file
-        ]
+    def decrypt_with_keys(self, encrypted_zip: str, keys: tuple[int, int, int], output_zip: str) -> bool:
+        """Write a decrypted copy of `encrypted_zip` with bkcrack's decipher option (-D)."""
+        os.makedirs(os.path.dirname(output_zip) or ".", exist_ok=True)
+        cmd = ["bkcrack", "-C", encrypted_zip, "-k", *ZipKeyStore.format(keys).split(), "-D", output_zip]
         self.logger.info(f"Running bkcrack: {' '.join(cmd)}")
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            self.logger.info(f"bkcrack succeeded → {output_zip}")
-            return True
-        except subprocess.CalledProcessError as e:
-            self.logger.warning(f"bkcrack failed: {e.stderr}")
+            subprocess.run(cmd, check=True, capture_output=True, text=True, errors="replace")
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.logger.warning(f"bkcrack decryption failed: {getattr(e, 'stderr', None) or e}")
+            return False
+        if not os.path.exists(output_zip):
+            self.logger.warning(f"bkcrack did not write {output_zip}")
             return False
+        self.logger.info(f"bkcrack succeeded → {output_zip}")
+        return True
 
-    def extract_to_archive_dir(self, zip_path: str) -> str:
-        base = os.path.basename(zip_path)
-        name, _ = os.path.splitext(base)
+    def extract_to_archive_dir(self, zip_path: str, password: bytes | None = None, name: str | None = None) -> str:
+        """
+        Extract `zip_path` into ARCHIVE_DIR/<name> (the archive's own name
+        without extension by default), incrementally: members
+        already on disk with the same size and CRC are left alone, nothing is
+        deleted. Members are planned from the profile and refused when they
+        would exceed the member count, the total size or the compression
+        ratio ceiling; the rest are decompressed on a worker pool in
+        fixed-size buffers. ZipCrypto members are decrypted with `password`.
+        Returns the directory, or "" on failure.
+        """
+        if name is None:
+            name, _ = os.path.splitext(os.path.basename(zip_path))
         out_dir = os.path.join(self.archive_dir, name)
-        if os.path.exists(out_dir):
-            shutil.rmtree(out_dir, ignore_errors=True)
         os.makedirs(out_dir, exist_ok=True)
 
         try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extractall(out_dir)
-            self.logger.info(f"Extracted {zip_path} → {out_dir}")
-            return out_dir
+            plan, refused = self._plan_extraction(zip_path, out_dir, password)
+        except (OSError, zipfile.BadZipFile, struct.error) as e:
+            self.logger.error(f"Extraction failed for {zip_path}: {e}")
+            return ""
+
+        local = threading.local()
+        handles = []
+
+        def extract(item: tuple[ArchiveMember, str]) -> str:
+            member, target = item
+            if self._unchanged(target, member):
+                return "unchanged"
+            zf = getattr(local, "zf", None)
+            if zf is None:
+                # One handle per worker: members decompress independently
+                zf = local.zf = zipfile.ZipFile(zip_path, "r")
+                handles.append(zf)
+            return self._extract_member(zf, member, target, password)
+
+        try:
+            with ThreadPoolExecutor(self.extract_workers, thread_name_prefix="forensicrack-extract") as pool:
+                outcomes = Counter(pool.map(extract, plan))
         except Exception as e:
             self.logger.error(f"Extraction failed for {zip_path}: {e}")
             return ""
+        finally:
+            for zf in handles:
+                zf.close()
+
+        self.logger.info(
+            f"Extracted {zip_path} → {out_dir}: {outcomes['extracted']} written, "
+            f"{outcomes['unchanged']} unchanged, {outcomes['failed'] + refused} refused or failed"
+        )
+        return out_dir
+
+    def _plan_extraction(self, zip_path: str, out_dir: str, password: bytes | None) -> tuple[list, int]:
+        """(member, target path) pairs that fit the ceilings, and the number refused."""
+        plan, refused, total = [], 0, 0
+        for member in self.profile(zip_path).members:
+            target = self._safe_target(out_dir, member.name)
+            if target is None:
+                self.logger.warning(f"Refusing unsafe member path {member.name!r} in {zip_path}")
+                refused += 1
+                continue
+            if member.name.endswith("/"):
+                os.makedirs(target, exist_ok=True)
+                continue
+            if member.encryption != "none" and (member.encryption != "zipcrypto" or not password):
+                self.logger.info(f"Cannot extract {member.name} ({member.cipher}) from {zip_path}")
+                refused += 1
+                continue
+            if len(plan) >= self.max_extract_members:
+                self.logger.warning(f"{zip_path}: member ceiling ({self.max_extract_members}) reached")
+                refused += 1
+                continue
+            if member.size > max(member.compressed_size, 1) * self.max_extract_ratio:
+                self.logger.warning(
+                    f"Refusing {member.name} in {zip_path}: compression ratio "
+                    f"{member.size // max(member.compressed_size, 1)}:1 looks like a decompression bomb"
+                )
+                refused += 1
+                continue
+            if total + member.size > self.max_extract_bytes:
+                self.logger.warning(f"Refusing {member.name} in {zip_path}: total extraction ceiling reached")
+                refused += 1
+                continue
+            total += member.size
+            plan.append((member, target))
+        return plan, refused
+
+    @staticmethod
+    def _safe_target(out_dir: str, name: str) -> str | None:
+        """Path of `name` under `out_dir`, or None if it would escape it."""
+        parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".")]
+        if not parts or ".." in parts or ":" in parts[0]:
+            return None
+        return os.path.join(out_dir, *parts)
+
+    @staticmethod
+    def _unchanged(target: str, member: ArchiveMember) -> bool:
+        try:
+            if os.path.getsize(target) != member.size:
+                return False
+            crc = 0
+            with open(target, "rb") as f:
+                while block := f.read(_READ_BLOCK):
+                    crc = zlib.crc32(block, crc)
+            return crc == member.crc
+        except OSError:
+            return False
+
+    def _extract_member(self, zf: zipfile.ZipFile, member: ArchiveMember, target: str, pwd: bytes | None) -> str:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = target + ".part"
+        written = 0
+        try:
+            with zf.open(member.name, pwd=pwd) as src, open(tmp, "wb") as dst:
+                while block := src.read(_READ_BLOCK):
+                    written += len(block)
+                    # zipfile stops at the declared size; this guards against it trusting a lie
+                    if written > member.size:
+                        raise zipfile.BadZipFile("member is larger than declared")
+                    dst.write(block)
+            os.replace(tmp, target)
+            return "extracted"
+        except (RuntimeError, zipfile.BadZipFile, NotImplementedError, EOFError, zlib.error,
+                lzma.LZMAError, OSError, ValueError) as e:
+            self.logger.warning(f"Could not extract {member.name}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return "failed"
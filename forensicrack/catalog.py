@@ -0,0 +1,243 @@
+import os
+import json
+import mmap
+import hashlib
+import logging
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from .streaming import is_stream_source
+
+# Fingerprint segment size: one digest per ~256 MB, cut at a line boundary
+_SEGMENT = 256 * 1024 * 1024
+# Bytes split into lines at once while building the length histogram
+_STEP = 8 * 1024 * 1024
+# Candidates of this length or longer share the last histogram bucket
+_MAX_LENGTH = 64
+
+
+@dataclass
+class WordlistInfo:
+    """Catalog entry of one wordlist, stored as a sidecar next to it."""
+    path: str
+    size: int
+    mtime_ns: int
+    lines: int
+    fingerprint: str
+    # candidate length -> number of lines (the last bucket is "_MAX_LENGTH or more")
+    lengths: dict[int, int] = field(default_factory=dict)
+    # [end offset, blake2b digest] per segment; lets an appended list be rescanned from the end only
+    segments: list[list] = field(default_factory=list)
+    # Candidates hashcat itself counts in the list (--keyspace), once asked for
+    hashcat_keyspace: int | None = None
+
+
+class WordlistCatalog:
+    """
+    Size, line count, content fingerprint and length histogram of every
+    wordlist, kept in a hidden sidecar (".<name>.catalog.json") next to it.
+
+    A list is scanned once through mmap in fixed steps, the first time its
+    line count or fingerprint is needed. Later lookups only stat the file;
+    if it grew by appending, only the new tail is scanned. Line counts size
+    hashcat keyspace chunks and ETAs, and the fingerprint tells caches
+    derived from a list (dedup tiers, chunk ledgers) that it changed.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.logger = logger or logging.getLogger("ForensiCrack.Catalog")
+        self._entries: dict[str, WordlistInfo] = {}
+        # path -> set once the scan running for it is done; other callers wait on it
+        self._scanning: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def sidecar_path(path: str) -> str:
+        directory, name = os.path.split(os.path.abspath(path))
+        return os.path.join(directory, f".{name}.catalog.json")
+
+    def get(self, path: str, scan: bool = True) -> WordlistInfo | None:
+        """
+        Catalog entry for `path`, refreshed if the file changed. With
+        scan=False a stale or missing entry returns None instead of reading
+        the list. Streamed (7z) wordlists cannot be mapped and return None.
+
+        Scans run outside the lock, so lookups of other lists never wait on
+        them; a second caller for a list being scanned waits for that scan.
+        """
+        if is_stream_source(path):
+            return None
+
+        key = os.path.abspath(path)
+        while True:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+            with self._lock:
+                info = self._entries.get(key) or self._load(key)
+                if info and info.size == st.st_size and info.mtime_ns == st.st_mtime_ns:
+                    self._entries[key] = info
+                    return info
+                if not scan:
+                    return None
+                pending = self._scanning.get(key)
+                if pending is None:
+                    pending = self._scanning[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            if info and st.st_size > info.size and self._appended(key, info):
+                self.logger.info(f"Catalog: {os.path.basename(path)} grew - scanning the new {st.st_size - info.size} byte(s)")
+                info = self._scan(key, st, info)
+            else:
+                self.logger.info(f"Catalog: scanning {path} ({st.st_size / 1024 ** 3:.1f} GB)")
+                info = self._scan(key, st)
+            self._save(info)
+            with self._lock:
+                self._entries[key] = info
+            return info
+        finally:
+            with self._lock:
+                del self._scanning[key]
+            pending.set()
+
+    def lines(self, path: str, scan: bool = True) -> int | None:
+        info = self.get(path, scan)
+        return info.lines if info else None
+
+    def keyspace(self, wordlists: list[str], scan: bool = True) -> int | None:
+        """Total candidates across `wordlists`, or None if any of them cannot be counted."""
+        total = 0
+        for path in wordlists:
+            lines = self.lines(path, scan)
+            if lines is None:
+                return None
+            total += lines
+        return total
+
+    def hashcat_keyspace(self, path: str, count: Callable[[str], int | None]) -> int | None:
+        """
+        Candidates hashcat counts in `path`, which can differ from its line
+        count (hashcat drops lines too long for any kernel). `count` asks
+        hashcat once per version of the list; the answer is kept in the
+        sidecar. None if the list cannot be cataloged or counted.
+        """
+        info = self.get(path)
+        if info is None:
+            return None
+        if info.hashcat_keyspace is None:
+            keyspace = count(path)
+            if keyspace is None:
+                return None
+            with self._lock:
+                info.hashcat_keyspace = keyspace
+                self._save(info)
+        return info.hashcat_keyspace
+
+    def fingerprint(self, path: str) -> str:
+        """
+        Content fingerprint of one wordlist. Streamed lists, which cannot be
+        scanned, are identified by their name, size and mtime instead.
+        """
+        info = self.get(path)
+        if info:
+            return info.fingerprint
+        try:
+            st = os.stat(path)
+        except OSError:
+            return os.path.basename(path)
+        return f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+    def set_fingerprint(self, wordlists: list[str]) -> str:
+        """
+        One fingerprint for an ordered set of wordlists, from their names,
+        sizes and mtimes: taken at startup, it must not scan the lists.
+        Content-level caches (exhausted attacks, chunk ledgers) use
+        fingerprint(), which scans a list the first time it is attacked.
+        """
+        digest = hashlib.sha1()
+        for path in wordlists:
+            try:
+                st = os.stat(path)
+                identity = f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}"
+            except OSError:
+                identity = os.path.basename(path)
+            digest.update(identity.encode() + b"\0")
+        return digest.hexdigest()
+
+    def _load(self, key: str) -> WordlistInfo | None:
+        try:
+            with open(self.sidecar_path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data["lengths"] = {int(k): v for k, v in data.get("lengths", {}).items()}
+            return WordlistInfo(**data)
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
+
+    def _save(self, info: WordlistInfo):
+        path = self.sidecar_path(info.path)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(info), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write catalog sidecar {path}: {e}")
+
+    @staticmethod
+    def _digest(data) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _appended(self, key: str, info: WordlistInfo) -> bool:
+        """True if the old content is still a prefix of the file (checked on the last segment)."""
+        if not info.segments or info.size == 0:
+            return False
+        start = info.segments[-2][0] if len(info.segments) > 1 else 0
+        end, digest = info.segments[-1]
+        with open(key, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        # An unterminated last line may have been extended, so rescan from scratch
+        return data.endswith(b"\n") and self._digest(data) == digest
+
+    def _scan(self, key: str, st: os.stat_result, resume: WordlistInfo | None = None) -> WordlistInfo:
+        size = st.st_size
+        lines = resume.lines if resume else 0
+        lengths = Counter(resume.lengths if resume else {})
+        segments = [list(s) for s in resume.segments] if resume else []
+        pos = resume.size if resume else 0
+
+        if size:
+            with open(key, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while pos < size:
+                    seg_end = self._line_boundary(mm, pos + _SEGMENT, size)
+                    digest = hashlib.blake2b(digest_size=16)
+                    while pos < seg_end:
+                        end = self._line_boundary(mm, pos + _STEP, seg_end)
+                        block = mm[pos:end]
+                        digest.update(block)
+                        parts = block.split(b"\n")
+                        if block.endswith(b"\n"):
+                            parts.pop()
+                        lines += len(parts)
+                        lengths.update(map(len, parts))
+                        pos = end
+                    segments.append([seg_end, digest.hexdigest()])
+
+        folded = Counter()
+        for length, count in lengths.items():
+            folded[min(length, _MAX_LENGTH)] += count
+        fingerprint = self._digest(f"{size}:{''.join(d for _, d in segments)}".encode())
+        return WordlistInfo(key, size, st.st_mtime_ns, lines, fingerprint, dict(sorted(folded.items())), segments)
+
+    @staticmethod
+    def _line_boundary(mm: mmap.mmap, target: int, limit: int) -> int:
+        """First offset at or after `target` that starts a new line (capped at `limit`)."""
+        if target >= limit:
+            return limit
+        nl = mm.find(b"\n", target, limit)
+        return limit if nl == -1 else nl + 1
@@ -0,0 +1,101 @@
+import os
+import json
+import logging
+import threading
+
+from .hashes import hash_digests
+
+
+def plan_chunks(lines: int, min_lines: int, target_chunks: int) -> list[tuple[int, int | None]]:
+    """
+    Split a wordlist of `lines` candidates into (skip, limit) keyspace chunks
+    of at least `min_lines` each, aiming for `target_chunks` of them. The
+    last chunk has no limit so it always runs to the real end of the list.
+
+    --skip/--limit count the candidates hashcat accepts, not lines. Sized
+    from a plain line count, the chunks are still contiguous and cover the
+    whole list, but their boundaries drift by the lines hashcat drops.
+    """
+    size = max(min_lines, -(-lines // max(1, target_chunks)))
+    chunks: list[tuple[int, int | None]] = [(skip, size) for skip in range(0, lines, size)]
+    if chunks:
+        chunks[-1] = (chunks[-1][0], None)
+    return chunks or [(0, None)]
+
+
+class ChunkLedger:
+    """
+    Persistent done/pending state of the keyspace chunks of one attack
+    (evidence, mode, wordlist). A rerun only attacks chunks that are not
+    done yet, so an interrupted or failed chunk is retried on its own.
+
+    The ledger is only trusted for the same wordlist content (catalog
+    fingerprint), chunk layout and
+    set of target hashes (or a subset of it); anything else starts over.
+    """
+
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(
+        self,
+        path: str | None,
+        fingerprint: str,
+        chunks: list[tuple[int, int | None]],
+        targets: list[str],
+        logger: logging.Logger | None = None,
+    ):
+        self.path = path
+        # Catalog fingerprint of the wordlist content the chunks index into
+        self.fingerprint = fingerprint
+        self.chunks = chunks
+        self.logger = logger or logging.getLogger("ForensiCrack.Chunks")
+        self.targets = hash_digests(targets)
+        self._lock = threading.Lock()
+        self.status: dict[int, str] = self._load()
+
+    def _load(self) -> dict[int, str]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if (
+            state.get("fingerprint") != self.fingerprint
+            or [tuple(c) for c in state.get("chunks", [])] != self.chunks
+            or not set(self.targets) <= set(state.get("targets", []))
+        ):
+            return {}
+        return {int(i): s for i, s in state.get("status", {}).items()}
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "fingerprint": self.fingerprint,
+                "chunks": self.chunks,
+                "targets": self.targets,
+                "status": {str(i): s for i, s in self.status.items()},
+            }, f)
+        os.replace(tmp, self.path)
+
+    def pending(self) -> list[tuple[int, int, int | None]]:
+        """(index, skip, limit) of every chunk not done yet, in keyspace order."""
+        with self._lock:
+            return [(i, skip, limit) for i, (skip, limit) in enumerate(self.chunks) if self.status.get(i) != self.DONE]
+
+    def mark(self, index: int, status: str):
+        with self._lock:
+            self.status[index] = status
+            self._save()
+
+    def summary(self) -> str:
+        with self._lock:
+            done = sum(1 for s in self.status.values() if s == self.DONE)
+            failed = sum(1 for s in self.status.values() if s == self.FAILED)
+        return f"{done}/{len(self.chunks)} chunk(s) done" + (f", {failed} failed" if failed else "")
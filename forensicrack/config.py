@@ -16,6 +16,8 @@ class Config:
     ARCHIVE_DIR = os.path.join(RUNTIME_DIR, "archives")
     WORDLIST_DIR = os.path.join(RUNTIME_DIR, "wordlists")
     PLAINTEXTS_DIR = os.path.join(RUNTIME_DIR, "plaintexts")
+    SESSION_DIR = os.path.join(RUNTIME_DIR, "sessions")   # hashcat .restore / John .rec files
+    CACHE_DIR = os.path.join(RUNTIME_DIR, "cache")         # derived data that is safe to delete
 
     # Wordlist filenames
     BROCKYOU = os.path.join(WORDLIST_DIR, "brockyou.txt")              
@@ -23,18 +25,89 @@ class Config:
 
     LOG_FILE = os.path.join(LOG_DIR, "forensicrack.log")
 
+    # RAM ceiling for the external sort used by --dedup-wordlists
+    DEDUP_RAM_LIMIT = 512 * 1024 ** 2
+
+    # Stream RockYou2021 out of its 7z parts into hashcat/John instead of extracting it
+    ROCKYOU2021_STREAM = False
+
     SUPPORTED_ARCHIVES = [".zip", ".7z"]
     SUPPORTED_STEGO = [".jpg", ".jpeg", ".png", ".bmp"]
     SUPPORTED_HASHES = [".hash"]
 
+    # Global wall-clock budget in seconds for cracking runs (None = unlimited).
+    # When it runs out, running sessions are paused and resume on the next --execute.
+    TIME_BUDGET = None
+
+    # Seconds between machine-readable status updates from hashcat / John
+    STATUS_TIMER = 30
+
+    # Attack all escalation tiers in one hashcat process per mode
+    HASHCAT_SINGLE_PASS = True
+
+    # Wordlists with more lines than this are attacked in --skip/--limit chunks
+    # (about HASHCAT_CHUNK_COUNT of them), tracked in sessions/*.chunks.json.
+    # Set to None to attack every wordlist in one piece.
+    HASHCAT_CHUNK_MIN_LINES = 200_000_000
+    HASHCAT_CHUNK_COUNT = 32
+
     # Hashcat modes
     ZIP_AES_MODE = 13600
     SEVENZIP_AES_MODE = 11600
 
+    # Scheduler limits: total worker threads and per-engine-class slots
+    MAX_WORKERS = 8
+    CPU_WORKERS = max(1, (os.cpu_count() or 2) // 2)  # John / zsteg / stegseek
+    HASHCAT_SLOTS = 1                                 # one GPU device
+    BKCRACK_SLOTS = 1
+    # bkcrack threads (-j) shared by the attacks on one archive, attacks run at once,
+    # and the most partial-plaintext (file header) attacks tried per archive
+    BKCRACK_THREADS = os.cpu_count() or 1
+    BKCRACK_PARALLEL = 2
+    BKCRACK_MAX_ATTACKS = 8
+
+    # Recursive processing of archive contents: files unpacked into ARCHIVE_DIR are
+    # triaged as child evidence up to this nesting depth, file count and total size
+    EXPANSION_MAX_DEPTH = 4
+    EXPANSION_MAX_FILES = 10_000
+    EXPANSION_MAX_BYTES = 20 * 1024 ** 3
+
+    # Archive extraction: worker threads per archive and decompression bomb ceilings
+    # (total uncompressed bytes, uncompressed:compressed ratio, member count)
+    EXTRACT_WORKERS = 4
+    EXTRACT_MAX_BYTES = 8 * 1024 ** 3
+    EXTRACT_MAX_RATIO = 200
+    EXTRACT_MAX_MEMBERS = 20_000
+
     # Functional output subdirectories
     STEGO_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "stego")
     CRACKED_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "cracked")
     EXTRACTED_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "extracted")
+    BATCH_DIR = os.path.join(CRACKED_OUTPUT_DIR, "batches")
+
+    # Case-wide result cache and per-engine potfiles (hashcat and John formats differ)
+    RESULT_STORE = os.path.join(OUTPUT_DIR, "case_results.jsonl")
+    HASHCAT_POTFILE = os.path.join(CRACKED_OUTPUT_DIR, "case.hashcat.pot")
+    JOHN_POTFILE = os.path.join(CRACKED_OUTPUT_DIR, "case.john.pot")
+    # ZipCrypto internal keys recovered by bkcrack, reused on archives sharing a password
+    BKCRACK_KEYS = os.path.join(OUTPUT_DIR, "case_bkcrack_keys.jsonl")
+    # (hash, engine, mode, wordlist content) attacks that ran to the end without a crack
+    EXHAUSTED_INDEX = os.path.join(OUTPUT_DIR, "case_exhausted.jsonl")
+
+    # --watch: durable queue of evidence jobs, and the polling fallback interval (s)
+    JOB_QUEUE = os.path.join(SESSION_DIR, "job_queue.jsonl")
+    WATCH_POLL_INTERVAL = 5
+
+    # SQLite ledger of evidence, attack attempts and results; reruns skip finished work
+    LEDGER = os.path.join(SESSION_DIR, "ledger.sqlite3")
+
+    # Content signatures of evidence, keyed by inode + mtime + size
+    FILE_ID_CACHE = os.path.join(CACHE_DIR, "file_signatures.json")
+    # Extracted hashes, one file per evidence fingerprint (native extractors or *2john)
+    HASH_CACHE_DIR = os.path.join(CACHE_DIR, "hashes")
+
+    # CRC32 + size index of PLAINTEXTS_DIR for bkcrack known-plaintext matching
+    PLAINTEXT_INDEX = os.path.join(CACHE_DIR, "plaintext_index.json")
 
     # Create directories on init
     def __post_init__(self):
@@ -46,8 +119,11 @@ class Config:
             self.ARCHIVE_DIR,
             self.WORDLIST_DIR,
             self.PLAINTEXTS_DIR,
+            self.SESSION_DIR,
+            self.CACHE_DIR,
             self.STEGO_OUTPUT_DIR,
             self.CRACKED_OUTPUT_DIR,
             self.EXTRACTED_OUTPUT_DIR,
+            self.BATCH_DIR,
         ]:
             os.makedirs(path, exist_ok=True)
@@ -1,14 +1,75 @@
 import os
-import subprocess
 import logging
 import sys
 import re
+import json
+import hashlib
+import threading
+import subprocess
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Callable, ContextManager
+
+from .catalog import WordlistCatalog
+from .chunks import ChunkLedger, plan_chunks
+from .exhausted import ExhaustedIndex
+from .hashes import candidate_modes, detect_mode, hash_digests, match_result_line, read_hash_lines, write_results
+from .models import CrackResult
+from .runner import RunResult, StreamingRunner, format_eta
+from .streaming import CandidateStream, is_stream_source
+from .results import ResultStore
+from .wordlists import attribute_tiers
+
+# Outcome of one wordlist pass
+_COMPLETE = "complete"
+_INCOMPLETE = "incomplete"
+_PAUSED = "paused"
+
+# Attack parameters in exhausted-index keys (straight dictionary attack)
+_STRAIGHT = "-a 0"
 
 
 class HashcatEngine:
-    def __init__(self, logger: logging.Logger | None = None):
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        result_store: ResultStore | None = None,
+        potfile_path: str | None = None,
+        single_pass: bool = True,
+        runner: StreamingRunner | None = None,
+        session_dir: str | None = None,
+        chunk_min_lines: int | None = None,
+        chunk_count: int = 32,
+        slot: Callable[[], ContextManager] | None = None,
+        catalog: WordlistCatalog | None = None,
+        exhausted: ExhaustedIndex | None = None,
+    ):
         self.logger = logger or logging.getLogger("ForensiCrack.Hashcat")
+        # Case-wide cracked-result cache and potfile, shared across evidence files
+        self.result_store = result_store
+        self.potfile_path = potfile_path
+        # Feed all escalation tiers to one hashcat process (one device init,
+        # kernel build and hash load) instead of one process per wordlist
+        self.single_pass = single_pass
+        self.runner = runner or StreamingRunner(logger=self.logger)
+        # Restore files for named sessions; interrupted attacks resume from here
+        self.session_dir = session_dir
+        # Wordlists longer than chunk_min_lines are attacked in about
+        # chunk_count --skip/--limit chunks (None disables chunking)
+        self.chunk_min_lines = chunk_min_lines
+        self.chunk_count = chunk_count
+        # Context manager factory holding the hashcat device for one process
+        self.slot = slot or nullcontext
+        # Line counts and fingerprints of the wordlists (chunk sizes, ETAs, ledgers)
+        self.catalog = catalog or WordlistCatalog(self.logger)
+        # (hash, mode, wordlist) attacks that already ran to the end uncracked
+        self.exhausted = exhausted
+        # Last measured speed per mode, for whole-wordlist ETAs
+        self._speed: dict[int, float] = {}
+        # Per-thread outcome of the last attack (see last_run_complete)
+        self._last = threading.local()
+        # Workers run concurrently; only one may prompt on the terminal at a time
+        self._prompt_lock = threading.Lock()
 
         # NOTE: Keep keys lowercase because resolve_hashcat_mode() lowercases inputs
         self.KNOWN_HASH_MAP = {
@@ -46,6 +107,8 @@ class HashcatEngine:
             "office2016": 9700,
             "office365": 9800,
             "office2019": 9900,
+            # RAR - narrowed to the exact mode from the rar2john signature
+            "rar": [13000, 23800, 23700, 12500],
             # common plain hashes if upstream passes these labels
             "md5": 0,
             "sha1": 100,
@@ -90,105 +153,418 @@ class HashcatEngine:
         out_dir = os.path.dirname(output_path) or "."
         os.makedirs(out_dir, exist_ok=True)
 
-        # Dedicated potfile for hashcat ONLY (never share with John)
-        pot_path = output_path + ".hashcat.pot"
-
-        def _decode(b: bytes | None) -> str:
-            return b.decode("utf-8", errors="replace") if b else ""
-
-        def _filter_show_lines(show_text: str) -> list[str]:
-            lines: list[str] = []
-            for line in (show_text or "").splitlines():
-                s = line.strip()
-                if not s:
-                    continue
-                low = s.lower()
-                # Drop hashcat informational headers that confused your GUI before
-                if "the following" in low and "hash-modes" in low:
-                    continue
-                if "hash-modes match the structure" in low:
-                    continue
-                if low.startswith(("hashcat", "usage:", "session", "started", "warning:", "error:")):
-                    continue
-                # outfile-format 2 is typically "hash:plain" (hash might include colons for some modes)
-                if ":" in s and not s.endswith(":"):
-                    lines.append(s)
-            return lines
-
-        def _run_show(mode: int) -> list[str]:
-            show_cmd = [
-                "hashcat",
-                "--show",
-                "-m", str(mode),
-                "--outfile-format", "2",
-                "--potfile-path", pot_path,
-                hashfile,
-            ]
-            self.logger.info(f"Hashcat show: {' '.join(show_cmd)}")
-            res = subprocess.run(show_cmd, capture_output=True)
-            out = _decode(res.stdout)
-            err = _decode(res.stderr)
-            if err.strip():
-                self.logger.debug(f"Hashcat --show stderr:\n{err.strip()}")
-            return _filter_show_lines(out)
-
-        def _crack_with_mode(mode: int, wordlists: list[str]) -> bool:
-            for wordlist in wordlists:
-                cmd = [
-                    "hashcat",
-                    "-m", str(mode),
-                    "-a", "0",
-                    hashfile,
-                    wordlist,
-                    "--potfile-path", pot_path,
-                    "--outfile", output_path,
-                    "--outfile-format", "2",
-                    "--quiet",
-                    "--force",
-                ]
-                self.logger.info(f"Running Hashcat: {' '.join(cmd)}")
-
-                try:
-                    res = subprocess.run(cmd, capture_output=True)
-
-                    stdout_str = _decode(res.stdout).strip()
-                    stderr_str = _decode(res.stderr).strip()
-
-                    # Hashcat often prints useful info to stdout; log both at debug.
-                    if stdout_str:
-                        self.logger.debug(f"Hashcat stdout:\n{stdout_str}")
-                    if stderr_str:
-                        self.logger.debug(f"Hashcat stderr:\n{stderr_str}")
-
-                    # Always decide success by --show results (not by exit code)
-                    show_lines = _run_show(mode)
-                    if show_lines:
-                        # Write filtered results so the rest of your app can read one predictable file
-                        with open(output_path, "w", encoding="utf-8", errors="replace") as f:
-                            f.write("\n".join(show_lines) + "\n")
-
-                        self.logger.info(f"Hashcat succeeded → wrote {len(show_lines)} result line(s): {output_path}")
-                        self.logger.info(f"Hashcat completed on {hashfile} with {wordlist}")
-                        return True
-
-                    # No cracks for this wordlist
-                    self.logger.info(f"No passwords cracked this run for {hashfile} with {wordlist} (exit {res.returncode})")
-
-                except Exception as e:
-                    self.logger.error(f"Unexpected error running Hashcat: {e}")
-
+        hashes = read_hash_lines(hashfile)
+        if not hashes:
+            self.logger.warning(f"No usable hashes in {hashfile}")
             return False
 
-        # If mode is a list, try each in order
-        if isinstance(hash_type_code, list):
-            for m in hash_type_code:
-                self.logger.info(f"Trying Hashcat mode {m} for {hashfile}")
-                if _crack_with_mode(m, wordlists):
-                    return True
+        hash_type_code = self.exact_mode(hash_type_code, hashes, hashfile)
+        # Dedicated potfile for hashcat ONLY (never share with John)
+        results = self._attack(hashes, hash_type_code, wordlists, output_path + ".hashcat", hashfile)
+        if not results:
             self.logger.warning(f"All modes exhausted for {hashfile}")
             return False
-        else:
-            return _crack_with_mode(hash_type_code, wordlists)
+
+        write_results(output_path, {r.hash: r.plaintext for r in results.values()})
+        self.logger.info(f"Hashcat succeeded → wrote {len(results)} result line(s): {output_path}")
+        return True
+
+    def crack_batch(
+        self,
+        hashes_by_key: dict[str, list[str]],
+        hash_type_code: int | list[int],
+        wordlists: list[str],
+        work_dir: str,
+    ) -> dict[str, list[CrackResult]]:
+        """
+        Attack the hashes of many evidence files in one hashcat run per
+        (mode, wordlist pass). `hashes_by_key` maps an evidence key to its
+        normalized hashes; the return value maps each key to the
+        CrackResults recovered for it.
+        """
+        os.makedirs(work_dir, exist_ok=True)
+        modes = hash_type_code if isinstance(hash_type_code, list) else [hash_type_code]
+        label = "_".join(str(m) for m in modes)
+
+        owners: dict[str, list[str]] = {}
+        for key, hashes in hashes_by_key.items():
+            for h in hashes:
+                owners.setdefault(h, []).append(key)
+
+        # Batches of one mode can run at once on the scheduler's workers, so
+        # the hashfile, outfile and session state are named after the target set
+        targets = hashlib.sha1("".join(hash_digests(list(owners))).encode()).hexdigest()[:12]
+        self.logger.info(f"Batching {len(owners)} hash(es) from {len(hashes_by_key)} file(s) for mode {label}")
+        cracked = self._attack(
+            list(owners), hash_type_code, wordlists,
+            os.path.join(work_dir, f"batch_m{label}_{targets}"), ", ".join(hashes_by_key),
+        )
+
+        results: dict[str, list[CrackResult]] = {key: [] for key in hashes_by_key}
+        for h, result in cracked.items():
+            for key in owners[h]:
+                results[key].append(result)
+        return results
+
+    def _attack(
+        self,
+        hashes: list[str],
+        hash_type_code: int | list[int],
+        wordlists: list[str],
+        stem: str,
+        source: str,
+    ) -> dict[str, CrackResult]:
+        """
+        Run straight-mode attacks over `hashes` for each mode and wordlist
+        pass until everything is cracked. Success is read from the run's own
+        --outfile (hash:plain), never from a separate `hashcat --show`.
+        """
+        modes = hash_type_code if isinstance(hash_type_code, list) else [hash_type_code]
+        cracked: dict[str, CrackResult] = {}
+        self._last.complete = False
+        complete = True
+        if self.result_store:
+            for h, plain in self.result_store.lookup_many(hashes).items():
+                cracked[h] = CrackResult(h, plain, engine="cache")
+            if cracked:
+                self.logger.info(f"{len(cracked)} of {len(hashes)} hash(es) already cracked (case cache)")
+
+        for mode in modes:
+            if len(cracked) == len(hashes):
+                break
+            if len(modes) > 1:
+                self.logger.info(f"Trying Hashcat mode {mode} for {source}")
+            todo = wordlists
+            if self.exhausted:
+                todo = self.exhausted.untried(
+                    wordlists, [h for h in hashes if h not in cracked], "hashcat", mode, _STRAIGHT
+                )
+            for tier_group in self._passes(todo):
+                remaining = [h for h in hashes if h not in cracked]
+                if not remaining:
+                    break
+                if is_stream_source(tier_group[0]):
+                    status = self._stream_pass(remaining, mode, tier_group, stem, source, cracked)
+                elif self._chunk_plan(tier_group):
+                    status = self._chunked_pass(remaining, mode, tier_group, stem, source, cracked)
+                else:
+                    keyspace = self.catalog.keyspace(tier_group, scan=False)
+                    if keyspace and self._speed.get(mode):
+                        self.logger.info(
+                            f"Keyspace {keyspace:,} candidate(s), ETA {format_eta(keyspace / self._speed[mode])} "
+                            "at the last measured speed"
+                        )
+                    status = self._status(self._run_pass(remaining, mode, tier_group, stem, source, cracked))
+                if status == _PAUSED:
+                    return cracked
+                complete = complete and status == _COMPLETE
+                if status == _COMPLETE and self.exhausted:
+                    survivors = [h for h in remaining if h not in cracked]
+                    self.exhausted.mark(survivors, "hashcat", mode, _STRAIGHT, tier_group)
+
+        self._last.complete = complete or len(cracked) == len(hashes)
+        return cracked
+
+    def last_run_complete(self) -> bool:
+        """
+        Whether the last attack in this thread ran every pass to the end
+        (so uncracked hashes are exhausted for these wordlists) rather than
+        being paused or hitting a hashcat error.
+        """
+        return getattr(self._last, "complete", False)
+
+    @staticmethod
+    def _status(res: RunResult | None) -> str:
+        if res is None:
+            return _INCOMPLETE
+        if res.paused:
+            return _PAUSED
+        # 0 = cracked, 1 = exhausted; anything else is an abort or error
+        return _COMPLETE if res.returncode in (0, 1) else _INCOMPLETE
+
+    def _run_pass(
+        self,
+        remaining: list[str],
+        mode: int,
+        tier_group: list[str],
+        stem: str,
+        source: str,
+        cracked: dict[str, CrackResult],
+        extra_args: list[str] | None = None,
+        stream: CandidateStream | None = None,
+        chunk: int | None = None,
+    ) -> RunResult | None:
+        """
+        One hashcat process over `remaining` with the given wordlists (or a
+        stream on stdin). New cracks are added to `cracked` and the store.
+        """
+        hashfile = stem + ".hash"
+        outfile = stem + ".out"
+        pot_path = self.potfile_path or stem + ".pot"
+        wordlist = ", ".join(tier_group)
+        cmd = [
+            "hashcat",
+            "-m", str(mode),
+            "-a", "0",
+            hashfile,
+            # Streamed tiers arrive on stdin instead of as a dictionary argument
+            *([] if stream else tier_group),
+            *(extra_args or []),
+            "--potfile-path", pot_path,
+            "--outfile", outfile,
+            "--outfile-format", "1,2",
+            "--status",
+            "--status-json",
+            f"--status-timer={self.runner.status_timer}",
+            "--force",
+        ]
+        if stream:
+            # hashcat cannot restore stdin attacks; the stream keeps its own offset
+            cmd.append("--restore-disable")
+        job = f"{os.path.basename(stem)}:m{mode}" + (f":c{chunk}" if chunk is not None else "")
+        try:
+            # Hold the device only while hashcat runs, so other evidence can
+            # get in between the chunks of a long attack. The hashfile and
+            # session state are written under it, right before hashcat reads them.
+            with self.slot():
+                with open(hashfile, "w", encoding="utf-8") as f:
+                    f.write("\n".join(remaining) + "\n")
+                if not stream:
+                    cmd = self._with_session(cmd, stem, mode, tier_group, remaining, chunk)
+                self.logger.info(f"Running Hashcat ({len(remaining)} hash(es)): {' '.join(cmd)}")
+                res = self.runner.run(cmd, job, "hashcat", feed=stream.feed if stream else None)
+        except Exception as e:
+            self.logger.error(f"Unexpected error running Hashcat: {e}")
+            return None
+
+        if res.last and res.last.speed:
+            self._speed[mode] = res.last.speed
+        if stream:
+            progress = (res.last.raw.get("progress") or [None])[0] if res.last else None
+            stream.finish(res.returncode in (0, 1) and not res.paused, progress)
+
+        output = "\n".join(res.tail)
+        if res.paused:
+            self.logger.info(f"Hashcat paused on {source} (mode {mode}); rerun --execute to resume")
+        # 0 = cracked, 1 = exhausted; anything else is an abort or error
+        if res.returncode not in (0, 1):
+            self.logger.warning(f"Hashcat exited with {res.returncode}: {output}")
+        elif output:
+            self.logger.debug(f"Hashcat output:\n{output}")
+
+        # Hashes already in the potfile are skipped by hashcat and never
+        # reach the outfile, so read both.
+        found = self._read_results([outfile, pot_path], remaining)
+        tiers = self._attribute(found, tier_group)
+        for h, plain in found.items():
+            cracked[h] = CrackResult(h, plain, mode, tiers.get(plain))
+            if self.result_store:
+                self.result_store.record(h, plain, "hashcat", mode, source, tiers.get(plain))
+        if found:
+            self.logger.info(f"Hashcat completed on {source} with {wordlist}: {len(found)} new crack(s)")
+        elif not res.paused:
+            self.logger.info(f"No passwords cracked this run for {source} with {wordlist} (exit {res.returncode})")
+        return res
+
+    def _stream_pass(self, remaining, mode, tier_group, stem, source, cracked) -> str:
+        """Attack with a streamed tier on stdin. Returns the pass status."""
+        stream = CandidateStream(
+            tier_group[0], self._state_path(stem, mode, tier_group, ".stream.json"), remaining, self.logger
+        )
+        if stream.done:
+            self.logger.info(f"Stream {tier_group[0]} already exhausted for these hashes (mode {mode}) - skipping")
+            return _COMPLETE
+        return self._status(self._run_pass(remaining, mode, tier_group, stem, source, cracked, stream=stream))
+
+    def _chunk_plan(self, tier_group: list[str]) -> list[tuple[int, int | None]] | None:
+        """Keyspace chunks for a single large on-disk wordlist, or None to attack it whole."""
+        if not self.chunk_min_lines or len(tier_group) != 1:
+            return None
+        wordlist = tier_group[0]
+        try:
+            # Every line is at least one byte, so small files cannot need chunking
+            if os.path.getsize(wordlist) <= self.chunk_min_lines:
+                return None
+        except OSError:
+            return None
+        lines = self._wordlist_keyspace(wordlist)
+        if lines is None:
+            return None
+        chunks = plan_chunks(lines, self.chunk_min_lines, self.chunk_count)
+        return chunks if len(chunks) > 1 else None
+
+    def _wordlist_keyspace(self, wordlist: str) -> int | None:
+        """
+        Candidates in `wordlist` as hashcat counts them, which --skip/--limit
+        refer to. If hashcat cannot report it, the catalog line count stands
+        in: chunks still cover the list end to end (the last one has no
+        limit), but their boundaries may be off by the lines hashcat drops.
+        """
+        keyspace = self.catalog.hashcat_keyspace(wordlist, self._count_keyspace)
+        return keyspace if keyspace is not None else self.catalog.lines(wordlist)
+
+    def _count_keyspace(self, wordlist: str) -> int | None:
+        cmd = ["hashcat", "--keyspace", "-a", "0", wordlist]
+        self.logger.info(f"Counting the hashcat keyspace of {wordlist}")
+        try:
+            res = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            return int(res.stdout.split()[-1])
+        except (OSError, subprocess.CalledProcessError, ValueError, IndexError) as e:
+            self.logger.warning(f"{' '.join(cmd)} failed ({e}) - chunking by line count")
+            return None
+
+    def _chunked_pass(self, remaining, mode, tier_group, stem, source, cracked) -> str:
+        """
+        Attack one wordlist chunk by chunk with --skip/--limit, recording each
+        chunk in a ledger. Returns the pass status (complete only if every
+        chunk is done).
+        """
+        ledger = ChunkLedger(
+            self._state_path(stem, mode, tier_group, ".chunks.json"),
+            self.catalog.get(tier_group[0]).fingerprint,
+            self._chunk_plan(tier_group),
+            remaining,
+            self.logger,
+        )
+        pending = ledger.pending()
+        if not pending:
+            self.logger.info(f"All chunks of {tier_group[0]} already attacked for these hashes (mode {mode})")
+            return _COMPLETE
+        self.logger.info(f"{os.path.basename(tier_group[0])} (mode {mode}): {ledger.summary()}, {len(pending)} to run")
+        lines = self._wordlist_keyspace(tier_group[0])
+
+        for n, (index, skip, limit) in enumerate(pending):
+            remaining = [h for h in remaining if h not in cracked]
+            if not remaining:
+                break
+            if self._speed.get(mode):
+                left = sum(lim if lim else lines - sk for _, sk, lim in pending[n:])
+                self.logger.info(
+                    f"{len(pending) - n} chunk(s) left ({left:,} candidates), "
+                    f"ETA {format_eta(left / self._speed[mode])} at the last measured speed"
+                )
+            args = ["--skip", str(skip)] + (["--limit", str(limit)] if limit else [])
+            status = self._status(
+                self._run_pass(remaining, mode, tier_group, stem, source, cracked, args, chunk=index)
+            )
+            if status == _PAUSED:
+                return _PAUSED
+            ledger.mark(index, ChunkLedger.DONE if status == _COMPLETE else ChunkLedger.FAILED)
+
+        self.logger.info(f"{os.path.basename(tier_group[0])} (mode {mode}): {ledger.summary()}")
+        return _COMPLETE if not ledger.pending() else _INCOMPLETE
+
+    def _session_name(self, stem: str, mode: int, tier_group: list[str], chunk: int | None = None) -> str:
+        tiers = hashlib.sha1("\0".join(tier_group).encode()).hexdigest()[:8]
+        name = f"{os.path.basename(stem)}_m{mode}_{tiers}" + (f"_c{chunk}" if chunk is not None else "")
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+    def _state_path(self, stem: str, mode: int, tier_group: list[str], suffix: str) -> str | None:
+        if not self.session_dir:
+            return None
+        return os.path.join(self.session_dir, self._session_name(stem, mode, tier_group) + suffix)
+
+    def _with_session(
+        self,
+        cmd: list[str],
+        stem: str,
+        mode: int,
+        tier_group: list[str],
+        targets: list[str],
+        chunk: int | None = None,
+    ) -> list[str]:
+        """
+        Name the session after (evidence, mode, wordlists) and keep its restore
+        file in session_dir. If a restore point exists from an interrupted
+        run against the same targets, resume it instead of starting the
+        wordlist from line 1.
+        """
+        if not self.session_dir:
+            return cmd
+        os.makedirs(self.session_dir, exist_ok=True)
+        name = self._session_name(stem, mode, tier_group, chunk)
+        restore_file = os.path.join(self.session_dir, f"{name}.restore")
+        targets_file = os.path.join(self.session_dir, f"{name}.targets.json")
+        session_args = ["--session", name, "--restore-file-path", restore_file]
+
+        digests = hash_digests(targets)
+        if os.path.exists(restore_file):
+            try:
+                with open(targets_file, "r", encoding="utf-8") as f:
+                    saved = set(json.load(f))
+            except (OSError, json.JSONDecodeError):
+                saved = set()
+            # Hashes added since the checkpoint never saw the skipped keyspace
+            if set(digests) <= saved:
+                self.logger.info(f"Resuming Hashcat session {name} from {restore_file}")
+                return ["hashcat", *session_args, "--restore"]
+            self.logger.info(f"Target set changed since checkpoint {name} - starting over")
+            os.remove(restore_file)
+
+        with open(targets_file, "w", encoding="utf-8") as f:
+            json.dump(digests, f)
+        return cmd + session_args
+
+    def _passes(self, wordlists: list[str]) -> list[list[str]]:
+        """
+        Group wordlists into hashcat runs; hashcat attacks multiple
+        dictionaries in the given order. Streamed tiers (fed through stdin)
+        and chunked tiers (--skip/--limit address one dictionary) run alone.
+        """
+        def alone(w: str) -> bool:
+            return is_stream_source(w) or bool(self._chunk_plan([w]))
+
+        passes: list[list[str]] = []
+        for w in wordlists:
+            if self.single_pass and passes and not alone(w) and not alone(passes[-1][0]):
+                passes[-1].append(w)
+            else:
+                passes.append([w])
+        return passes
+
+    def _attribute(self, found: dict[str, str], tier_group: list[str]) -> dict[str, str]:
+        """Log (and return) which escalation tier produced each plaintext of a multi-wordlist run."""
+        if not found:
+            return {}
+        tiers = attribute_tiers(list(set(found.values())), tier_group)
+        if len(tier_group) > 1:
+            for h, plain in found.items():
+                self.logger.info(f"Crack for {h[:32]}… came from tier {os.path.basename(tiers.get(plain, '?'))}")
+        return tiers
+
+    @staticmethod
+    def _read_results(paths: list[str], hashes: list[str]) -> dict[str, str]:
+        wanted = {h.lower(): h for h in hashes}
+        found: dict[str, str] = {}
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    match = match_result_line(line, wanted)
+                    if match:
+                        found[match[0]] = match[1]
+        return found
+
+    def exact_mode(self, mode: int | list[int], hashes: list[str], source: str) -> int | list[int]:
+        """
+        Narrow a list of candidate modes (PDF, Office, RAR) to the one the
+        extracted hash signatures name, so only that mode is attacked. A
+        single mode (a filename tag, or one resolved for ZIP/7z) is kept.
+        """
+        detected = detect_mode(hashes)
+        if detected is None or detected == mode:
+            return mode
+        if not isinstance(mode, list):
+            self.logger.warning(f"Hash signature of {source} suggests mode {detected} - keeping resolved mode {mode}")
+            return mode
+        if detected not in mode:
+            self.logger.warning(
+                f"Hash signature of {source} suggests mode {detected}, which is not among {mode} - trying those"
+            )
+            return mode
+        self.logger.info(f"Hash signature of {source} selects mode {detected} (instead of trying {mode})")
+        return detected
 
     def resolve_hashcat_mode(self, evidence, file_identifier, zip_info=None):
         if evidence.known_hash_algo:
@@ -217,11 +593,21 @@ class HashcatEngine:
         if ext == ".7z":
             return 11600
 
+        if ext == ".rar":
+            return self.KNOWN_HASH_MAP.get("rar")  # Returns list
+
         if ext == ".zip" and zip_info:
             if zip_info == "aes":
                 return 13600
             elif zip_info == "zipcrypto":
                 return "USE_PKCRACK"
+            elif zip_info == "mixed":
+                # The ZipCrypto entries are the weak point: known plaintext, or the cheapest hash
+                self.logger.info(f"{evidence.path} mixes ZipCrypto and AES entries - attacking the ZipCrypto ones")
+                return "USE_PKCRACK"
+            elif zip_info == "strong":
+                self.logger.warning(f"{evidence.path} uses PKWARE strong encryption, which cannot be attacked")
+                return None
             else:
                 self.logger.warning(f"Unknown ZIP encryption type for {evidence.path} - assuming AES")
                 return 13600
@@ -236,13 +622,27 @@ class HashcatEngine:
         if m:
             return int(m.group(1))
 
+        # Untagged hash files: the hash signatures themselves ($pdf$, $krb5tgs$, ...)
+        if ext == ".hash":
+            hashes = read_hash_lines(p_str)
+            mode = detect_mode(hashes)
+            if mode is not None:
+                self.logger.info(f"Detected Hashcat mode {mode} from the hash signatures in {fname}")
+                return mode
+            # Bare hex digests: every mode of that digest length, in turn
+            candidates = candidate_modes(hashes)
+            if candidates:
+                self.logger.info(f"{fname} holds unsalted hex digests - trying modes {candidates}")
+                return candidates
+
         # If running under GUI/non-interactive, do NOT prompt (prevents EOFError)
         if not sys.stdin or not sys.stdin.isatty():
             return None
 
-        mode_str = input(
-            f"Unknown mode for {evidence.path}. Enter Hashcat mode (integer) or blank to skip:."
-        ).strip()
+        with self._prompt_lock:
+            mode_str = input(
+                f"Unknown mode for {evidence.path}. Enter Hashcat mode (integer) or blank to skip:."
+            ).strip()
         if not mode_str:
             return None
         try:
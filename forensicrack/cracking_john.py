@@ -1,30 +1,185 @@
 import os
-import subprocess
+import re
 import logging
+import threading
+
+from .exhausted import ExhaustedIndex
+from .hashes import match_result_line, normalize_hash_line, write_results
+from .results import ResultStore
+from .runner import StreamingRunner
+from .streaming import CandidateStream, is_stream_source
+
+# John prints each crack as "<password>   (<label>)"
+_CRACKED_LINE = re.compile(r"^(?P<plain>.*?)\s+\((?P<label>[^()]*)\)\s*$")
+# Attack parameters in exhausted-index keys (plain wordlist mode, no rules)
+_WORDLIST_MODE = "--wordlist"
 
 
 class JohnEngine:
-    def __init__(self, logger: logging.Logger | None = None):
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        result_store: ResultStore | None = None,
+        potfile_path: str | None = None,
+        runner: StreamingRunner | None = None,
+        session_dir: str | None = None,
+        exhausted: ExhaustedIndex | None = None,
+    ):
         self.logger = logger or logging.getLogger("ForensiCrack.John")
+        # Case-wide cracked-result cache and potfile, shared across evidence files
+        self.result_store = result_store
+        self.potfile_path = potfile_path
+        self.runner = runner or StreamingRunner(logger=self.logger)
+        # .rec files for named sessions; interrupted attacks resume from here
+        self.session_dir = session_dir
+        # (hash, wordlist) attacks that already ran to the end uncracked
+        self.exhausted = exhausted
+        # Per-thread outcome of the last crack() (see last_run_complete)
+        self._last = threading.local()
+
+    def last_run_complete(self) -> bool:
+        """
+        Whether the last crack() in this thread ran every wordlist to the
+        end, rather than being paused or failing on one of them.
+        """
+        return getattr(self._last, "complete", False)
 
     def crack(self, hashfile: str, wordlists: list[str], output_path: str) -> bool:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        pot_path = self.potfile_path or output_path
+        labels = self._read_labels(hashfile)
+        hashes = list(dict.fromkeys(labels.values()))
+        self._last.complete = False
+        complete = True
 
+        if self.result_store and hashes:
+            known = self.result_store.lookup_many(hashes)
+            if len(known) == len(hashes):
+                self._write_results(output_path, pot_path, known)
+                self.logger.info(f"All {len(known)} hash(es) in {hashfile} already cracked (case cache)")
+                self._last.complete = True
+                return True
+
+        if self.exhausted:
+            wordlists = self.exhausted.untried(wordlists, hashes, "john", None, _WORDLIST_MODE)
         for wordlist in wordlists:
-            cmd = [
-                "john",
-                f"--wordlist={wordlist}",
-                hashfile,
-                f"--pot={output_path}",
-            ]
+            # One named session per (evidence, wordlist) so concurrent workers
+            # don't share john.rec and an interrupted run can be restored
+            session = self._session_path(output_path, wordlist)
+            stream = None
+            if is_stream_source(wordlist):
+                # John cannot restore a stdin session; the stream tracks its own offset
+                stream = CandidateStream(wordlist, session + ".stream.json", hashes, self.logger)
+                if stream.done:
+                    self.logger.info(f"Stream {wordlist} already exhausted for {hashfile} - skipping")
+                    continue
+                cmd = [
+                    "john",
+                    "--stdin",
+                    hashfile,
+                    f"--pot={pot_path}",
+                    f"--session={session}",
+                    f"--progress-every={self.runner.status_timer}",
+                ]
+            elif os.path.exists(session + ".rec"):
+                self.logger.info(f"Resuming John session {session}")
+                cmd = ["john", f"--restore={session}"]
+            else:
+                cmd = [
+                    "john",
+                    f"--wordlist={wordlist}",
+                    hashfile,
+                    f"--pot={pot_path}",
+                    f"--session={session}",
+                    f"--progress-every={self.runner.status_timer}",
+                ]
             self.logger.info(f"Running John: {' '.join(cmd)}")
+            crack_lines: list[str] = []
             try:
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+                result = self.runner.run(
+                    cmd,
+                    f"{os.path.basename(hashfile)}:{os.path.basename(wordlist)}",
+                    "john",
+                    on_line=lambda line: _CRACKED_LINE.match(line) and crack_lines.append(line),
+                    feed=stream.feed if stream else None,
+                )
+            except OSError as e:
+                self.logger.warning(f"John attempt failed: {e}")
+                complete = False
+                continue
+            if stream:
+                stream.finish(result.returncode == 0 and not result.paused)
+            if result.paused:
+                self.logger.info(f"John paused on {hashfile}; rerun --execute to resume session {session}")
+                return False
+            if result.returncode != 0:
+                self.logger.warning(f"John attempt failed: {' '.join(result.tail[-5:])}")
+                complete = False
+                continue
+            self.logger.debug("\n".join(result.tail))
+
+            found = self._collect(pot_path, crack_lines, hashes, labels)
+            if found:
+                self._write_results(output_path, pot_path, found)
+                if self.result_store:
+                    for h, plain in found.items():
+                        self.result_store.record(h, plain, "john", source=hashfile)
                 self.logger.info(f"John succeeded on {hashfile} with {wordlist}")
-                self.logger.debug(result.stdout)
+                self._last.complete = True
                 return True
-            except subprocess.CalledProcessError as e:
-                self.logger.warning(f"John attempt failed: {e.stderr}")
+            self.logger.info(f"No passwords cracked by John for {hashfile} with {wordlist}")
+            if self.exhausted:
+                self.exhausted.mark(hashes, "john", None, _WORDLIST_MODE, [wordlist])
 
+        self._last.complete = complete
         self.logger.warning(f"John exhausted all wordlists for {hashfile}")
-        return False
\ No newline at end of file
+        return False
+
+    def _session_path(self, output_path: str, wordlist: str) -> str:
+        base = f"{os.path.basename(output_path)}.{os.path.splitext(os.path.basename(wordlist))[0]}"
+        session_dir = self.session_dir or os.path.dirname(output_path)
+        os.makedirs(session_dir, exist_ok=True)
+        return os.path.join(session_dir, base)
+
+    @staticmethod
+    def _read_labels(hashfile: str) -> dict[str, str]:
+        """Map John's per-line label (text before the first ':' of *2john output) to its hash."""
+        labels: dict[str, str] = {}
+        if not os.path.exists(hashfile):
+            return labels
+        with open(hashfile, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                h = normalize_hash_line(line)
+                if not h:
+                    continue
+                raw = line.strip()
+                label = raw.split(":", 1)[0] if not raw.startswith("$") and ":$" in raw else "?"
+                labels.setdefault(label, h)
+                labels.setdefault(h, h)
+        return labels
+
+    @staticmethod
+    def _collect(pot_path: str, crack_lines: list[str], hashes: list[str], labels: dict[str, str]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        wanted = {h.lower(): h for h in hashes}
+        if os.path.exists(pot_path):
+            with open(pot_path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    match = match_result_line(line, wanted)
+                    if match:
+                        found[match[0]] = match[1]
+
+        # Long hashes are stored truncated ($SOURCE_HASH$) in the pot; fall back
+        # to the crack lines John printed for this run.
+        for line in crack_lines:
+            m = _CRACKED_LINE.match(line)
+            if m and m.group("label") in labels:
+                found.setdefault(labels[m.group("label")], m.group("plain"))
+        return found
+
+    @staticmethod
+    def _write_results(output_path: str, pot_path: str, found: dict[str, str]):
+        # When John writes to its own per-file pot, leave that file alone
+        if os.path.abspath(output_path) == os.path.abspath(pot_path):
+            return
+        write_results(output_path, found)
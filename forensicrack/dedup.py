@@ -0,0 +1,230 @@
+import os
+import json
+import mmap
+import heapq
+import shutil
+import struct
+import logging
+import tempfile
+
+from .catalog import WordlistCatalog
+from .streaming import is_stream_source, open_wordlist
+
+# Run-file record: line length, tier index, line number, then the raw line
+_HEADER = struct.Struct(">IHQ")
+# Rough per-record cost of a (bytes, int, int) tuple held in a Python list
+_RECORD_OVERHEAD = 120
+# Maximum number of run files merged at once
+_FAN_IN = 256
+
+
+class TierDeduplicator:
+    """
+    Builds deduplicated escalation tiers: tier N keeps only candidates that do
+    not appear in any earlier tier (or earlier in itself), in original order.
+
+    Works in bounded memory so it can handle RockYou2021 (~100 GB):
+      1. every tier is streamed into sorted run files of at most `ram_limit`
+         bytes, keyed by (candidate, tier, line number);
+      2. the runs are k-way merged; the first occurrence of each candidate is
+         marked in an on-disk (mmap) keep-bitmap per tier;
+      3. each tier is streamed once more, writing only the kept lines.
+
+    Streamed (7z) tiers are passed through as they are: a deduplicated copy
+    of RockYou2021 would put the ~100 GB back on disk that streaming avoids.
+    They are not read at all, so later tiers are not filtered against them.
+
+    Results are cached in `cache_dir` with a manifest of the source lists'
+    catalog fingerprints and only rebuilt when one of them changes.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ram_limit: int,
+        logger: logging.Logger | None = None,
+        catalog: WordlistCatalog | None = None,
+    ):
+        self.cache_dir = cache_dir
+        self.ram_limit = ram_limit
+        self.logger = logger or logging.getLogger("ForensiCrack.Dedup")
+        self.catalog = catalog or WordlistCatalog(self.logger)
+
+    def _source_state(self, path: str) -> dict:
+        # Content fingerprint where the catalog can map the list; streamed
+        # (7z) sources fall back to size and mtime of the first volume
+        info = self.catalog.get(path)
+        if info:
+            return {"path": os.path.abspath(path), "fingerprint": info.fingerprint}
+        st = os.stat(path)
+        return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.cache_dir, self.MANIFEST)
+
+    def cached(self, tiers: list[str]) -> list[str] | None:
+        """Deduplicated tier paths if the cache matches the current source lists, else None."""
+        try:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            sources = [self._source_state(p) for p in tiers]
+        except (OSError, json.JSONDecodeError):
+            return None
+        if manifest.get("sources") != sources:
+            return None
+        outputs = manifest.get("outputs", [])
+        if len(outputs) != len(tiers) or not all(os.path.exists(p) for p in outputs):
+            return None
+        return outputs
+
+    def build(self, tiers: list[str]) -> list[str]:
+        cached = self.cached(tiers)
+        if cached:
+            self.logger.info("Deduplicated tiers are up to date")
+            return cached
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="dedup_", dir=self.cache_dir)
+        try:
+            sources = [self._source_state(p) for p in tiers]
+            runs, line_counts = self._write_runs(tiers, work_dir)
+            bitmaps = self._mark_first_occurrences(runs, line_counts, work_dir)
+            outputs = self._write_tiers(tiers, bitmaps)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        with open(self._manifest_path(), "w", encoding="utf-8") as f:
+            json.dump({"sources": sources, "outputs": outputs}, f, indent=2)
+        return outputs
+
+    # -- phase 1: sorted runs -------------------------------------------------
+
+    def _write_runs(self, tiers: list[str], work_dir: str) -> tuple[list[str], list[int]]:
+        runs: list[str] = []
+        line_counts: list[int] = []
+        buffer: list[tuple[bytes, int, int]] = []
+        used = 0
+
+        for tier, path in enumerate(tiers):
+            if is_stream_source(path):
+                self.logger.info(f"Dedup: {path} is streamed - keeping it as it is")
+                line_counts.append(0)
+                continue
+            self.logger.info(f"Dedup: reading {path}")
+            lineno = -1
+            with open_wordlist(path) as f:
+                for lineno, line in enumerate(f):
+                    line = line.rstrip(b"\r\n")
+                    if not line:
+                        continue
+                    buffer.append((line, tier, lineno))
+                    used += len(line) + _RECORD_OVERHEAD
+                    if used >= self.ram_limit:
+                        runs.append(self._flush_run(buffer, work_dir, len(runs)))
+                        buffer, used = [], 0
+            line_counts.append(lineno + 1)
+
+        if buffer:
+            runs.append(self._flush_run(buffer, work_dir, len(runs)))
+        self.logger.info(f"Dedup: wrote {len(runs)} sorted run(s)")
+        return runs, line_counts
+
+    @staticmethod
+    def _flush_run(buffer: list, work_dir: str, index: int) -> str:
+        buffer.sort()
+        path = os.path.join(work_dir, f"run_{index:06d}.bin")
+        with open(path, "wb", buffering=1024 * 1024) as f:
+            for line, tier, lineno in buffer:
+                f.write(_HEADER.pack(len(line), tier, lineno))
+                f.write(line)
+        return path
+
+    @staticmethod
+    def _read_run(path: str):
+        with open(path, "rb", buffering=1024 * 1024) as f:
+            while True:
+                header = f.read(_HEADER.size)
+                if not header:
+                    return
+                length, tier, lineno = _HEADER.unpack(header)
+                yield f.read(length), tier, lineno
+
+    def _reduce_runs(self, runs: list[str], work_dir: str) -> list[str]:
+        """Merge runs in groups until they fit in one k-way merge."""
+        level = 0
+        while len(runs) > _FAN_IN:
+            merged = []
+            for i in range(0, len(runs), _FAN_IN):
+                group = runs[i:i + _FAN_IN]
+                path = os.path.join(work_dir, f"merge_{level}_{i // _FAN_IN:06d}.bin")
+                with open(path, "wb", buffering=1024 * 1024) as f:
+                    for line, tier, lineno in heapq.merge(*(self._read_run(r) for r in group)):
+                        f.write(_HEADER.pack(len(line), tier, lineno))
+                        f.write(line)
+                for r in group:
+                    os.remove(r)
+                merged.append(path)
+            runs, level = merged, level + 1
+        return runs
+
+    # -- phase 2: keep-bitmaps ------------------------------------------------
+
+    def _mark_first_occurrences(self, runs: list[str], line_counts: list[int], work_dir: str) -> list[str]:
+        runs = self._reduce_runs(runs, work_dir)
+
+        bitmap_paths = []
+        maps = []
+        files = []
+        for tier, count in enumerate(line_counts):
+            path = os.path.join(work_dir, f"keep_{tier}.bitmap")
+            with open(path, "wb") as f:
+                f.truncate(max(1, (count + 7) // 8))
+            fh = open(path, "r+b")
+            files.append(fh)
+            maps.append(mmap.mmap(fh.fileno(), 0))
+            bitmap_paths.append(path)
+
+        previous = None
+        kept = [0] * len(line_counts)
+        try:
+            for line, tier, lineno in heapq.merge(*(self._read_run(r) for r in runs)):
+                if line == previous:
+                    continue
+                previous = line
+                maps[tier][lineno >> 3] |= 1 << (lineno & 7)
+                kept[tier] += 1
+        finally:
+            for m in maps:
+                m.flush()
+                m.close()
+            for fh in files:
+                fh.close()
+
+        for tier, count in enumerate(kept):
+            if not line_counts[tier]:
+                continue
+            self.logger.info(f"Dedup: tier {tier} keeps {count} of {line_counts[tier]} line(s)")
+        return bitmap_paths
+
+    # -- phase 3: filtered tiers ---------------------------------------------
+
+    def _write_tiers(self, tiers: list[str], bitmaps: list[str]) -> list[str]:
+        outputs = []
+        for tier, (path, bitmap_path) in enumerate(zip(tiers, bitmaps)):
+            if is_stream_source(path):
+                outputs.append(path)
+                continue
+            name = os.path.splitext(os.path.basename(path))[0]
+            out_path = os.path.join(self.cache_dir, f"{tier:02d}_{name}.dedup.txt")
+            tmp_path = out_path + ".part"
+            with open(bitmap_path, "rb") as bf, mmap.mmap(bf.fileno(), 0, access=mmap.ACCESS_READ) as keep, \
+                    open_wordlist(path) as src, open(tmp_path, "wb", buffering=1024 * 1024) as dst:
+                for lineno, line in enumerate(src):
+                    if keep[lineno >> 3] & (1 << (lineno & 7)):
+                        dst.write(line.rstrip(b"\r\n") + b"\n")
+            os.replace(tmp_path, out_path)
+            outputs.append(out_path)
+            self.logger.info(f"Dedup: wrote {out_path}")
+        return outputs
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from .catalog import WordlistCatalog
+from .results import ResultStore
+
+
+class ExhaustedIndex:
+    """
+    Case-wide record of attacks that ran to the end without cracking a
+    hash: (hash, engine, mode, attack parameters, wordlist fingerprint).
+
+    Engines consult it before each wordlist and skip the ones every target
+    already exhausted, so a rerun goes straight to the tiers that were not
+    tried. The wordlist part of the key is the catalog's content
+    fingerprint, so editing a list invalidates its entries automatically.
+    Backed by an append-only JSON-lines file, like the ResultStore.
+    """
+
+    def __init__(self, path: str, catalog: WordlistCatalog | None = None, logger: logging.Logger | None = None):
+        self.path = path
+        self.logger = logger or logging.getLogger("ForensiCrack.Exhausted")
+        self.catalog = catalog or WordlistCatalog(self.logger)
+        self._lock = threading.Lock()
+        self._keys: set[str] = set()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    self._keys.add(json.loads(line)["key"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        self.logger.info(f"Loaded {len(self._keys)} exhausted attack(s) from {self.path}")
+
+    @staticmethod
+    def _key(target: str, engine: str, mode, params: str, wordlist_fp: str) -> str:
+        raw = f"{engine}|{mode}|{params}|{wordlist_fp}|{ResultStore.key(target)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def exhausted(self, targets: list[str], engine: str, mode, params: str, wordlist: str) -> bool:
+        """True if every target already survived this attack with this wordlist's current content."""
+        if not targets:
+            return False
+        wordlist_fp = self.catalog.fingerprint(wordlist)
+        with self._lock:
+            return all(self._key(t, engine, mode, params, wordlist_fp) in self._keys for t in targets)
+
+    def untried(self, wordlists: list[str], targets: list[str], engine: str, mode, params: str) -> list[str]:
+        """The wordlists, in order, that some target has not yet exhausted."""
+        todo = []
+        for wordlist in wordlists:
+            if self.exhausted(targets, engine, mode, params, wordlist):
+                self.logger.info(
+                    f"{engine} (mode {mode}) already exhausted {os.path.basename(wordlist)} "
+                    f"for these {len(targets)} target(s) - skipping it"
+                )
+            else:
+                todo.append(wordlist)
+        return todo
+
+    def mark(self, targets: list[str], engine: str, mode, params: str, wordlists: list[str]):
+        """Record that `targets` survived a complete attack with each of `wordlists`."""
+        entries = []
+        for wordlist in wordlists:
+            wordlist_fp = self.catalog.fingerprint(wordlist)
+            for target in targets:
+                key = self._key(target, engine, mode, params, wordlist_fp)
+                entries.append({
+                    "key": key,
+                    "engine": engine,
+                    "mode": mode,
+                    "wordlist": os.path.basename(wordlist),
+                    "time": int(time.time()),
+                })
+        with self._lock:
+            new = [e for e in entries if e["key"] not in self._keys]
+            if not new:
+                return
+            self._keys.update(e["key"] for e in new)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(e) + "\n" for e in new)
@@ -0,0 +1,53 @@
+import os
+import logging
+import threading
+
+
+class ExpansionBudget:
+    """
+    Run-wide limits on evidence unpacked from archives and fed back into
+    triage: how deep archives may nest (checked by the caller against
+    max_depth), and how many files and bytes may be taken on as child
+    evidence in total. Children past a limit are logged and left on disk
+    unprocessed, so a zip bomb or a deeply nested bundle cannot swamp the
+    worker pool.
+
+    It also remembers the content fingerprints already taken on this run,
+    so an archive that contains itself (or a copy of another piece of
+    evidence) is only processed once.
+    """
+
+    def __init__(self, max_depth: int, max_files: int, max_bytes: int, logger: logging.Logger | None = None):
+        self.max_depth = max_depth
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger("ForensiCrack.Expansion")
+        self.files = 0
+        self.bytes = 0
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+
+    def admit(self, path: str) -> bool:
+        """Charge one extracted file against the budget; False if it does not fit."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        with self._lock:
+            if self.files + 1 > self.max_files or self.bytes + size > self.max_bytes:
+                self.logger.warning(
+                    f"Expansion budget spent ({self.files} file(s), {self.bytes / 1024 ** 2:.0f} MB) "
+                    f"- leaving {path} unprocessed"
+                )
+                return False
+            self.files += 1
+            self.bytes += size
+        return True
+
+    def first_visit(self, fingerprint: str) -> bool:
+        """True the first time a content fingerprint is seen on this run."""
+        with self._lock:
+            if fingerprint in self._seen:
+                return False
+            self._seen.add(fingerprint)
+            return True
@@ -0,0 +1,949 @@
+import os
+import re
+import zlib
+import lzma
+import base64
+import struct
+import zipfile
+import hashlib
+import logging
+import xml.etree.ElementTree as ET
+
+from .archives import profile_zip
+from .models import ArchiveMember
+
+# Encrypted payload bytes inlined into one hash; bigger targets fall back to *2john
+_MAX_DATA = 1024 * 1024
+
+# --- ZIP ---------------------------------------------------------------------
+
+_ZIP_LOCAL = 0x04034B50
+# hashcat's limit on the encrypted data inlined in a $pkzip2$ hash
+_PKZIP_MAX_DATA = 320 * 1024
+# WinZip AES strength -> salt length
+_AES_SALT = {1: 8, 2: 12, 3: 16}
+
+# --- 7z ----------------------------------------------------------------------
+
+_7Z_SIGNATURE = b"7z\xbc\xaf\x27\x1c"
+_7Z_AES = b"\x06\xf1\x07\x01"
+# Coder that reads the AES output -> 7z2john "type of data" (0 = stored)
+_7Z_COMPRESSION = {
+    b"\x00": 0,
+    b"\x03\x01\x01": 1,   # LZMA
+    b"\x21": 2,           # LZMA2
+    b"\x03\x04\x01": 3,   # PPMd
+    b"\x04\x02\x02": 6,   # BZip2
+    b"\x04\x01\x08": 7,   # Deflate
+}
+(_K_END, _K_HEADER, _K_ARCHIVE_PROPERTIES, _K_ADDITIONAL_STREAMS, _K_MAIN_STREAMS, _K_FILES,
+ _K_PACK_INFO, _K_UNPACK_INFO, _K_SUBSTREAMS, _K_SIZE, _K_CRC, _K_FOLDER, _K_UNPACK_SIZE,
+ _K_NUM_UNPACK_STREAM) = range(14)
+_K_ENCODED_HEADER = 0x17
+
+# --- PDF ---------------------------------------------------------------------
+
+_PDF_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_PDF_REF = re.compile(rb"(\d+)\s+(\d+)\s+R")
+_PDF_OBJ = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_PDF_ID = re.compile(rb"\[\s*<([0-9A-Fa-f\s]*)>")
+_PDF_SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)[ \t]*(?:\r\n|\r|\n)")
+_PDF_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_PDF_STREAM = re.compile(rb">>\s*stream(?:\r\n|\n|\r)")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+# Bytes read at the end for startxref, and per dictionary or object
+_PDF_TAIL = 1024
+_PDF_WINDOW = 64 * 1024
+# Largest xref stream read, and longest /Prev chain followed
+_PDF_MAX_XREF_STREAM = 64 * 1024 * 1024
+_PDF_MAX_SECTIONS = 256
+
+# --- Office ------------------------------------------------------------------
+
+_OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_OLE_FREE = 0xFFFFFFFF
+_OLE_END = 0xFFFFFFFE
+_KEY_ENCRYPTOR = "{http://schemas.microsoft.com/office/2006/keyEncryptor/password}encryptedKey"
+
+
+class _Unsupported(Exception):
+    """The file uses a layout the native extractors do not handle; use *2john instead."""
+
+
+class HashExtractor:
+    """
+    Pure-Python hash extraction for ZIP (ZipCrypto and WinZip AES), 7z, PDF
+    and encrypted OOXML Office files. Only the structures a hash needs are
+    read (the local header of the cheapest ZIP member, 7z headers, the PDF
+    encrypt dictionary, the OLE EncryptionInfo stream) and hashcat-ready
+    lines are returned directly.
+
+    Results are cached by file fingerprint (device, inode, mtime, size)
+    under `cache_dir`, so a rerun never re-parses an unchanged file.
+    Anything unsupported returns None and the caller falls back to *2john.
+    """
+
+    def __init__(self, cache_dir: str | None = None, logger: logging.Logger | None = None):
+        self.cache_dir = cache_dir
+        self.logger = logger or logging.getLogger("ForensiCrack.Extract")
+        self._parsers = {
+            ".zip": self._zip,
+            ".7z": self._sevenzip,
+            ".pdf": self._pdf,
+            ".doc": self._office,
+            ".docx": self._office,
+            ".xls": self._office,
+            ".xlsx": self._office,
+            ".ppt": self._office,
+            ".pptx": self._office,
+        }
+
+    def supports(self, ext: str) -> bool:
+        return ext in self._parsers
+
+    def extract(self, path: str, ext: str, member: ArchiveMember | None = None) -> list[str] | None:
+        """
+        Hash lines for `path` (cached or parsed natively), or None if it
+        needs *2john. For a ZIP, `member` picks the entry to target.
+        """
+        cached = self.cached(path)
+        if cached is not None:
+            self.logger.info(f"Using cached hash for {os.path.basename(path)}")
+            return cached
+        parser = self._parsers.get(ext)
+        if parser is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                lines = parser(f, size, member) if member else parser(f, size)
+        except _Unsupported as e:
+            self.logger.info(f"Native extractor cannot handle {os.path.basename(path)} ({e}) - using *2john")
+            return None
+        except (OSError, struct.error, IndexError, ValueError, lzma.LZMAError, zlib.error, ET.ParseError,
+                zipfile.BadZipFile) as e:
+            self.logger.warning(f"Native extraction failed on {path}: {e} - using *2john")
+            return None
+        if lines:
+            self.remember(path, lines)
+        return lines or None
+
+    def _cache_path(self, path: str) -> str | None:
+        if not self.cache_dir:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".hash")
+
+    def cached(self, path: str) -> list[str] | None:
+        cache = self._cache_path(path)
+        if not cache or not os.path.exists(cache):
+            return None
+        with open(cache, "r", encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()] or None
+
+    def remember(self, path: str, lines: list[str]):
+        """Cache extracted hash lines (native or from *2john) for this version of `path`."""
+        cache = self._cache_path(path)
+        if not cache:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = cache + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+        os.replace(tmp, cache)
+
+    # --- ZIP -----------------------------------------------------------------
+
+    def _zip(self, f, size: int, member: ArchiveMember | None = None) -> list[str]:
+        """
+        $zip2$ (WinZip AES) or $pkzip2$ (ZipCrypto) for one member: the one
+        given, or the cheapest verifiable one (every member normally shares
+        the password).
+        """
+        if member is None:
+            members = profile_zip(f.name).encrypted
+            member = members[0] if members else None
+        if member is None or not member.verifiable:
+            raise _Unsupported("no verifiable encrypted member")
+
+        f.seek(member.offset)
+        local = f.read(30)
+        if struct.unpack_from("<I", local)[0] != _ZIP_LOCAL:
+            raise ValueError("bad local header")
+        name_len, extra_len = struct.unpack_from("<HH", local, 26)
+        data_offset = member.offset + 30 + name_len + extra_len
+        f.seek(data_offset)
+
+        if member.encryption == "zipcrypto":
+            if member.compressed_size > _PKZIP_MAX_DATA:
+                raise _Unsupported(f"cheapest ZipCrypto member holds {member.compressed_size} bytes")
+            data = f.read(member.compressed_size)
+            # Members written with a data descriptor only check one byte (the time's high byte)
+            check_bytes = 1 if member.flags & 0x8 else 2
+            return [
+                f"$pkzip2$1*{check_bytes}*2*0*{member.compressed_size:x}*{member.size:x}*{member.crc:x}"
+                f"*{member.offset:x}*{data_offset - member.offset:x}*{member.method:x}*{len(data):x}"
+                f"*{member.crc >> 16:04x}*{member.dos_time:04x}*{data.hex()}*$/pkzip2$"
+            ]
+
+        strength = member.aes_strength
+        data_len = member.compressed_size - _AES_SALT[strength] - 2 - 10
+        if data_len < 0:
+            raise ValueError("AES member shorter than its salt and MAC")
+        if data_len > _MAX_DATA:
+            raise _Unsupported(f"cheapest AES member holds {data_len} bytes")
+        salt = f.read(_AES_SALT[strength])
+        verifier = f.read(2)
+        data = f.read(data_len)
+        auth = f.read(10)
+        return [
+            f"$zip2$*0*{strength}*0*{salt.hex()}*{verifier.hex()}*{data_len:x}*{data.hex()}*{auth.hex()}*$/zip2$"
+        ]
+
+    # --- 7z ------------------------------------------------------------------
+
+    def _sevenzip(self, f, size: int) -> list[str]:
+        """$7z$ for the encrypted header, or for the smallest encrypted folder."""
+        start = f.read(32)
+        if not start.startswith(_7Z_SIGNATURE):
+            raise ValueError("not a 7z archive")
+        next_offset, next_size = struct.unpack_from("<QQ", start, 12)
+        if next_size > 64 * 1024 * 1024:
+            raise _Unsupported("header too large")
+        f.seek(32 + next_offset)
+        header = _Reader(f.read(next_size))
+
+        kind = header.byte()
+        if kind == _K_ENCODED_HEADER:
+            streams = _parse_streams_info(header)
+            folder = streams["folders"][0]
+            if _7Z_AES in [c[0] for c in folder["coders"]]:
+                # Header encryption (-mhe): the header stream itself is the target
+                return [self._sevenzip_hash(f, streams, 0)]
+            header = _Reader(self._decode_header(f, streams))
+            kind = header.byte()
+        if kind != _K_HEADER:
+            raise ValueError("unexpected 7z header type")
+
+        prop = header.byte()
+        if prop == _K_ARCHIVE_PROPERTIES:
+            while header.byte() != _K_END:
+                header.skip(header.number())
+            prop = header.byte()
+        if prop == _K_ADDITIONAL_STREAMS:
+            raise _Unsupported("additional streams")
+        if prop != _K_MAIN_STREAMS:
+            raise _Unsupported("no encrypted streams")
+        streams = _parse_streams_info(header)
+        candidates = [
+            i for i, folder in enumerate(streams["folders"])
+            if _7Z_AES in [c[0] for c in folder["coders"]]
+        ]
+        if not candidates:
+            raise _Unsupported("no AES-encrypted folder")
+        cheapest = min(candidates, key=lambda i: sum(streams["pack_sizes"][j] for j in streams["pack_index"][i]))
+        return [self._sevenzip_hash(f, streams, cheapest)]
+
+    @staticmethod
+    def _decode_header(f, streams: dict) -> bytes:
+        """Decompress an unencrypted (LZMA/LZMA2/copy) encoded header."""
+        folder = streams["folders"][0]
+        if len(folder["coders"]) != 1:
+            raise _Unsupported("filtered header")
+        coder_id, props = folder["coders"][0][:2]
+        f.seek(32 + streams["pack_pos"])
+        packed = f.read(streams["pack_sizes"][0])
+        if coder_id == b"\x00":
+            return packed
+        return _lzma_decode(coder_id, props, packed, folder["unpack_sizes"][-1])
+
+    @staticmethod
+    def _sevenzip_hash(f, streams: dict, index: int) -> str:
+        folder = streams["folders"][index]
+        coders = folder["coders"]
+        if len(folder["packed_streams"]) != 1 or len(coders) > 2 or any(c[2] != 1 or c[3] != 1 for c in coders):
+            raise _Unsupported("filter chain")
+        aes_index = [c[0] for c in coders].index(_7Z_AES)
+        if len(coders) == 2 and folder["bind_pairs"] != [(1 - aes_index, aes_index)]:
+            raise _Unsupported("unexpected coder order")
+        if folder["packed_streams"][0] != aes_index:
+            raise _Unsupported("AES is not the first stage")
+
+        props = coders[aes_index][1]
+        cycles = props[0] & 0x3F
+        salt = iv = b""
+        if props[0] & 0xC0:
+            salt_len = ((props[0] >> 7) & 1) + (props[1] >> 4)
+            iv_len = ((props[0] >> 6) & 1) + (props[1] & 0x0F)
+            salt = props[2: 2 + salt_len]
+            iv = props[2 + salt_len: 2 + salt_len + iv_len]
+
+        if len(coders) == 2:
+            compressor, attributes = coders[1 - aes_index][:2]
+            if compressor not in _7Z_COMPRESSION:
+                raise _Unsupported("compression method")
+            data_type = _7Z_COMPRESSION[compressor]
+            final_size = folder["unpack_sizes"][1 - aes_index]
+        else:
+            data_type, attributes = 0, b""
+            final_size = folder["unpack_sizes"][aes_index]
+        aes_size = folder["unpack_sizes"][aes_index]
+
+        crc, crc_len = folder["crc"], final_size
+        if crc is None:
+            sub = streams["substreams"][index]
+            if not sub or sub[0][1] is None:
+                raise _Unsupported("no CRC for the encrypted stream")
+            crc_len, crc = sub[0]
+
+        pack = folder["packed_streams_global"][0]
+        pack_size = streams["pack_sizes"][pack]
+        if pack_size > _MAX_DATA:
+            raise _Unsupported(f"smallest encrypted stream holds {pack_size} bytes")
+        f.seek(32 + streams["pack_pos"] + sum(streams["pack_sizes"][:pack]))
+        data = f.read(pack_size)
+
+        iv_hex = iv.ljust(16, b"\0").hex()
+        line = (
+            f"$7z${data_type}${cycles}${len(salt)}${salt.hex()}${len(iv)}${iv_hex}"
+            f"${crc}${pack_size}${aes_size}${data.hex()}"
+        )
+        if data_type:
+            line += f"${crc_len}${attributes.hex()}"
+        return line
+
+    # --- PDF -----------------------------------------------------------------
+
+    def _pdf(self, f, size: int) -> list[str]:
+        """$pdf$ from the encryption dictionary: startxref -> trailer /Encrypt -> its object offset."""
+        xref = _PdfXref(f, size)
+        encrypt = xref.trailer(b"Encrypt")
+        if encrypt is None:
+            raise _Unsupported("not encrypted")
+        ids = _PDF_ID.match(xref.trailer(b"ID") or b"")
+        if not ids:
+            raise _Unsupported("no /ID")
+        file_id = bytes.fromhex(re.sub(rb"\s", b"", ids.group(1)).decode())
+
+        ref = _PDF_REF.fullmatch(encrypt)
+        if ref:
+            body = self._pdf_object(f, xref, int(ref.group(1)), int(ref.group(2)))
+        elif encrypt.startswith(b"<<"):
+            body = encrypt
+        else:
+            raise _Unsupported("malformed /Encrypt")
+        entries = _pdf_dict(body)
+
+        if entries.get(b"Filter") != b"/Standard":
+            raise _Unsupported("not the standard security handler")
+        revision = int(entries[b"R"])
+        key_len = 32 if revision <= 4 else 48
+        owner, user = entries[b"O"][:key_len], entries[b"U"][:key_len]
+        version = int(entries.get(b"V", b"0"))
+        length = int(entries.get(b"Length", b"40" if revision == 2 else b"128"))
+        if revision >= 5:
+            length = 256
+        permissions = struct.unpack("<i", struct.pack("<I", int(entries[b"P"]) & 0xFFFFFFFF))[0]
+        encrypt_metadata = 0 if entries.get(b"EncryptMetadata") == b"false" else 1
+        return [
+            f"$pdf${version}*{revision}*{length}*{permissions}*{encrypt_metadata}*{len(file_id)}*{file_id.hex()}"
+            f"*{len(user)}*{user.hex()}*{len(owner)}*{owner.hex()}"
+        ]
+
+    @staticmethod
+    def _pdf_object(f, xref: "_PdfXref", number: int, generation: int) -> bytes:
+        """Body of object `number` at the offset the cross-reference sections give for it."""
+        offset = xref.offset(number)
+        if offset is None:
+            raise _Unsupported("encryption dictionary is not in the cross-reference table")
+        f.seek(offset)
+        data = f.read(_PDF_WINDOW)
+        match = _PDF_OBJ.match(data)
+        if not match or (int(match.group(1)), int(match.group(2))) != (number, generation):
+            raise _Unsupported("cross-reference offset does not point at the encryption dictionary")
+        return data[match.end():]
+
+    # --- Office --------------------------------------------------------------
+
+    def _office(self, f, size: int) -> list[str]:
+        """$office$ from the EncryptionInfo stream of an encrypted OOXML container."""
+        stream = _OleFile(f, size).stream("EncryptionInfo")
+        if stream is None:
+            raise _Unsupported("no EncryptionInfo stream (legacy Office encryption)")
+        major, minor = struct.unpack_from("<HH", stream)
+        if (major, minor) == (4, 4):
+            return [self._office_agile(stream[8:])]
+        if minor == 2 and major in (2, 3, 4):
+            return [self._office_standard(stream)]
+        raise _Unsupported(f"EncryptionInfo version {major}.{minor}")
+
+    @staticmethod
+    def _office_standard(stream: bytes) -> str:
+        header_size = struct.unpack_from("<I", stream, 8)[0]
+        key_bits = struct.unpack_from("<I", stream, 12 + 16)[0]
+        verifier = 12 + header_size
+        salt_size = struct.unpack_from("<I", stream, verifier)[0]
+        salt = stream[verifier + 4: verifier + 4 + salt_size]
+        encrypted_verifier = stream[verifier + 4 + salt_size: verifier + 20 + salt_size]
+        hash_size = struct.unpack_from("<I", stream, verifier + 20 + salt_size)[0]
+        encrypted_hash = stream[verifier + 24 + salt_size: verifier + 24 + salt_size + hash_size]
+        return (
+            f"$office$*2007*{hash_size}*{key_bits}*{salt_size}*{salt.hex()}"
+            f"*{encrypted_verifier.hex()}*{encrypted_hash.hex()}"
+        )
+
+    @staticmethod
+    def _office_agile(xml: bytes) -> str:
+        root = ET.fromstring(xml.rstrip(b"\0"))
+        key = next((e for e in root.iter(_KEY_ENCRYPTOR)), None)
+        if key is None:
+            raise _Unsupported("no password key encryptor")
+        algorithm = key.get("hashAlgorithm", "")
+        version = {"SHA1": "2010", "SHA512": "2013"}.get(algorithm)
+        if version is None:
+            raise _Unsupported(f"agile hash {algorithm}")
+        salt = base64.b64decode(key.get("saltValue"))
+        hash_input = base64.b64decode(key.get("encryptedVerifierHashInput"))
+        hash_value = base64.b64decode(key.get("encryptedVerifierHashValue"))[:32]
+        return (
+            f"$office$*{version}*{key.get('spinCount')}*{key.get('keyBits')}*{len(salt)}*{salt.hex()}"
+            f"*{hash_input.hex()}*{hash_value.hex()}"
+        )
+
+
+class _Reader:
+    """Cursor over a 7z header with its variable-length number encoding."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def byte(self) -> int:
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def read(self, n: int) -> bytes:
+        value = self.data[self.pos: self.pos + n]
+        if len(value) < n:
+            raise ValueError("truncated 7z header")
+        self.pos += n
+        return value
+
+    def skip(self, n: int):
+        self.read(n)
+
+    def number(self) -> int:
+        first = self.byte()
+        mask, value = 0x80, 0
+        for i in range(8):
+            if not first & mask:
+                return value | ((first & (mask - 1)) << (8 * i))
+            value |= self.byte() << (8 * i)
+            mask >>= 1
+        return value
+
+    def uint32(self) -> int:
+        return struct.unpack("<I", self.read(4))[0]
+
+    def bits(self, count: int) -> list[bool]:
+        data = self.read((count + 7) // 8)
+        return [bool(data[i // 8] & (0x80 >> (i % 8))) for i in range(count)]
+
+    def defined(self, count: int) -> list[bool]:
+        return [True] * count if self.byte() else self.bits(count)
+
+    def digests(self, count: int) -> list[int | None]:
+        return [self.uint32() if d else None for d in self.defined(count)]
+
+
+def _parse_streams_info(r: _Reader) -> dict:
+    streams = {"pack_pos": 0, "pack_sizes": [], "folders": [], "substreams": []}
+    prop = r.byte()
+    if prop == _K_PACK_INFO:
+        streams["pack_pos"] = r.number()
+        count = r.number()
+        prop = r.byte()
+        while prop != _K_END:
+            if prop == _K_SIZE:
+                streams["pack_sizes"] = [r.number() for _ in range(count)]
+            elif prop == _K_CRC:
+                r.digests(count)
+            else:
+                raise _Unsupported(f"pack info property {prop}")
+            prop = r.byte()
+        prop = r.byte()
+
+    if prop == _K_UNPACK_INFO:
+        if r.byte() != _K_FOLDER:
+            raise ValueError("folder list expected")
+        count = r.number()
+        if r.byte():
+            raise _Unsupported("external folders")
+        streams["folders"] = [_parse_folder(r) for _ in range(count)]
+        if r.byte() != _K_UNPACK_SIZE:
+            raise ValueError("unpack sizes expected")
+        for folder in streams["folders"]:
+            outputs = sum(c[3] for c in folder["coders"])
+            folder["unpack_sizes"] = [r.number() for _ in range(outputs)]
+        prop = r.byte()
+        if prop == _K_CRC:
+            for folder, crc in zip(streams["folders"], r.digests(count)):
+                folder["crc"] = crc
+            prop = r.byte()
+        if prop != _K_END:
+            raise ValueError("unpack info not terminated")
+        prop = r.byte()
+
+    pack = 0
+    streams["pack_index"] = []
+    for folder in streams["folders"]:
+        folder.setdefault("crc", None)
+        folder["packed_streams_global"] = list(range(pack, pack + len(folder["packed_streams"])))
+        streams["pack_index"].append(folder["packed_streams_global"])
+        pack += len(folder["packed_streams"])
+
+    if prop == _K_SUBSTREAMS:
+        streams["substreams"] = _parse_substreams(r, streams["folders"])
+        prop = r.byte()
+    else:
+        streams["substreams"] = [[(f["unpack_sizes"][_final_output(f)], f["crc"])] for f in streams["folders"]]
+    if prop != _K_END:
+        raise ValueError("streams info not terminated")
+    return streams
+
+
+def _parse_folder(r: _Reader) -> dict:
+    coders = []
+    for _ in range(r.number()):
+        flags = r.byte()
+        coder_id = r.read(flags & 0x0F)
+        inputs, outputs = (r.number(), r.number()) if flags & 0x10 else (1, 1)
+        props = r.read(r.number()) if flags & 0x20 else b""
+        if flags & 0x80:
+            raise _Unsupported("alternative coder methods")
+        coders.append((coder_id, props, inputs, outputs))
+    total_out = sum(c[3] for c in coders)
+    total_in = sum(c[2] for c in coders)
+    bind_pairs = [(r.number(), r.number()) for _ in range(total_out - 1)]
+    packed_count = total_in - len(bind_pairs)
+    if packed_count == 1:
+        bound = {b[0] for b in bind_pairs}
+        packed = [next(i for i in range(total_in) if i not in bound)]
+    else:
+        packed = [r.number() for _ in range(packed_count)]
+    return {"coders": coders, "bind_pairs": bind_pairs, "packed_streams": packed}
+
+
+def _final_output(folder: dict) -> int:
+    bound = {b[1] for b in folder["bind_pairs"]}
+    return next(i for i in range(len(folder["unpack_sizes"])) if i not in bound)
+
+
+def _parse_substreams(r: _Reader, folders: list[dict]) -> list[list[tuple[int, int | None]]]:
+    """(size, crc) of every file stream, per folder."""
+    counts = [1] * len(folders)
+    prop = r.byte()
+    if prop == _K_NUM_UNPACK_STREAM:
+        counts = [r.number() for _ in folders]
+        prop = r.byte()
+    sizes = []
+    for folder, count in zip(folders, counts):
+        total = folder["unpack_sizes"][_final_output(folder)]
+        if count == 0:
+            sizes.append([])
+            continue
+        known = [r.number() for _ in range(count - 1)] if prop == _K_SIZE else []
+        sizes.append(known + [total - sum(known)])
+    if prop == _K_SIZE:
+        prop = r.byte()
+
+    # CRCs follow only for streams whose folder does not already carry one
+    unknown = sum(c for f, c in zip(folders, counts) if not (c == 1 and f["crc"] is not None))
+    crcs: list[int | None] = [None] * unknown
+    if prop == _K_CRC:
+        crcs = r.digests(unknown)
+        prop = r.byte()
+    if prop != _K_END:
+        raise ValueError("substreams info not terminated")
+
+    result, pos = [], 0
+    for folder, folder_sizes in zip(folders, sizes):
+        if len(folder_sizes) == 1 and folder["crc"] is not None:
+            result.append([(folder_sizes[0], folder["crc"])])
+            continue
+        result.append([(s, crcs[pos + i]) for i, s in enumerate(folder_sizes)])
+        pos += len(folder_sizes)
+    return result
+
+
+def _lzma_decode(coder_id: bytes, props: bytes, data: bytes, size: int) -> bytes:
+    if coder_id == b"\x03\x01\x01":
+        d = props[0]
+        lzma_filter = {
+            "id": lzma.FILTER_LZMA1,
+            "lc": d % 9,
+            "lp": (d // 9) % 5,
+            "pb": d // 45,
+            "dict_size": struct.unpack_from("<I", props, 1)[0],
+        }
+    elif coder_id == b"\x21":
+        bits = props[0]
+        dict_size = 0xFFFFFFFF if bits == 40 else (2 | (bits & 1)) << (bits // 2 + 11)
+        lzma_filter = {"id": lzma.FILTER_LZMA2, "dict_size": dict_size}
+    else:
+        raise _Unsupported("header compression method")
+    return lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[lzma_filter]).decompress(data, size)
+
+
+def _pdf_dict(body: bytes) -> dict[bytes, bytes]:
+    """Top-level /Key value pairs of a PDF dictionary; strings are returned decoded."""
+    entries: dict[bytes, bytes] = {}
+    pos = body.index(b"<<") + 2
+    while pos < len(body):
+        while pos < len(body) and body[pos: pos + 1].isspace():
+            pos += 1
+        if body.startswith(b">>", pos):
+            break
+        if body[pos: pos + 1] != b"/":
+            raise ValueError("malformed encryption dictionary")
+        end = pos + 1
+        while end < len(body) and body[end: end + 1] not in b" \t\r\n/<>[]()":
+            end += 1
+        name = body[pos + 1: end]
+        pos = end
+        while body[pos: pos + 1].isspace():
+            pos += 1
+        value, pos = _pdf_value(body, pos)
+        entries[name] = value
+    return entries
+
+
+def _pdf_value(body: bytes, pos: int) -> tuple[bytes, int]:
+    if body.startswith(b"<<", pos):
+        depth, end = 0, pos
+        while end < len(body):
+            if body.startswith(b"<<", end):
+                depth += 1
+                end += 2
+            elif body.startswith(b">>", end):
+                depth -= 1
+                end += 2
+                if depth == 0:
+                    break
+            else:
+                end += 1
+        return body[pos:end], end
+    if body.startswith(b"<", pos):
+        end = body.index(b">", pos)
+        digits = re.sub(rb"\s", b"", body[pos + 1: end])
+        if len(digits) % 2:
+            digits += b"0"
+        return bytes.fromhex(digits.decode()), end + 1
+    if body.startswith(b"(", pos):
+        return _pdf_literal(body, pos)
+    if body.startswith(b"[", pos):
+        end = body.index(b"]", pos)
+        return body[pos: end + 1], end + 1
+    if body.startswith(b"/", pos):
+        end = pos + 1
+        while end < len(body) and body[end: end + 1] not in b" \t\r\n/<>[]()":
+            end += 1
+        return body[pos:end], end
+    end = pos
+    while end < len(body) and body[end: end + 1] not in b"/>[<(\r\n":
+        end += 1
+    value = body[pos:end].strip()
+    # Indirect values ("12 0 R") are kept verbatim; numbers and names as written
+    return value, end
+
+
+def _pdf_literal(body: bytes, pos: int) -> tuple[bytes, int]:
+    out = bytearray()
+    depth = 1
+    pos += 1
+    while depth:
+        c = body[pos: pos + 1]
+        pos += 1
+        if c == b"\\":
+            nxt = body[pos: pos + 1]
+            pos += 1
+            if nxt in _PDF_ESCAPES:
+                out += _PDF_ESCAPES[nxt]
+            elif nxt.isdigit():
+                digits = nxt
+                while len(digits) < 3 and body[pos: pos + 1].isdigit() and body[pos: pos + 1] in b"01234567":
+                    digits += body[pos: pos + 1]
+                    pos += 1
+                out.append(int(digits, 8) & 0xFF)
+            elif nxt == b"\r":
+                if body[pos: pos + 1] == b"\n":
+                    pos += 1
+            elif nxt != b"\n":
+                out += nxt
+        else:
+            if c == b"(":
+                depth += 1
+            elif c == b")":
+                depth -= 1
+                if not depth:
+                    break
+            out += c
+    return bytes(out), pos
+
+
+class _PdfXref:
+    """
+    Cross-reference sections of a PDF, newest first: the one startxref
+    points at, then every /Prev (and hybrid /XRefStm) section behind it.
+    Only the trailers are read up front; an object offset is looked up by
+    seeking to its entry in a table, or decoding the xref streams.
+    """
+
+    def __init__(self, f, size: int):
+        self.f = f
+        self.size = size
+        f.seek(max(0, size - _PDF_TAIL))
+        found = list(_PDF_STARTXREF.finditer(f.read()))
+        if not found:
+            raise _Unsupported("no startxref")
+        # (trailer entries, object number -> offset lookup) per section
+        self.sections = []
+        pending = [int(found[-1].group(1))]
+        seen = set()
+        while pending and len(seen) < _PDF_MAX_SECTIONS:
+            offset = pending.pop(0)
+            if offset in seen:
+                continue
+            seen.add(offset)
+            trailer, lookup = self._section(offset)
+            self.sections.append((trailer, lookup))
+            pending[:0] = [int(trailer[key]) for key in (b"XRefStm", b"Prev") if trailer.get(key, b"").isdigit()]
+
+    def trailer(self, key: bytes) -> bytes | None:
+        """Value of `key` in the newest trailer that has it."""
+        for trailer, _ in self.sections:
+            if key in trailer:
+                return trailer[key]
+        return None
+
+    def offset(self, number: int) -> int | None:
+        for _, lookup in self.sections:
+            offset = lookup(number)
+            if offset is not None:
+                return offset
+        return None
+
+    def _section(self, offset: int):
+        if not 0 <= offset < self.size:
+            raise _Unsupported("startxref points outside the file")
+        self.f.seek(offset)
+        head = self.f.read(64)
+        if head.lstrip().startswith(b"xref"):
+            return self._table(offset + head.index(b"xref") + 4)
+        if _PDF_OBJ.match(head):
+            return self._stream(offset)
+        raise _Unsupported("startxref does not point at a cross-reference section")
+
+    def _table(self, pos: int):
+        """Classic xref table: subsection headers are read, the 20-byte entries skipped."""
+        subsections = []
+        while True:
+            if pos >= self.size:
+                raise _Unsupported("xref table without a trailer")
+            self.f.seek(pos)
+            chunk = self.f.read(64)
+            stripped = chunk.lstrip()
+            if stripped.startswith(b"trailer"):
+                self.f.seek(pos + len(chunk) - len(stripped) + 7)
+                trailer = _pdf_dict(self.f.read(_PDF_WINDOW))
+                break
+            match = _PDF_SUBSECTION.match(chunk)
+            if not match:
+                raise _Unsupported("malformed xref table")
+            start, count = int(match.group(1)), int(match.group(2))
+            subsections.append((start, count, pos + match.end()))
+            pos += match.end() + 20 * count
+
+        def lookup(number: int) -> int | None:
+            for start, count, entries in subsections:
+                if start <= number < start + count:
+                    self.f.seek(entries + 20 * (number - start))
+                    entry = _PDF_XREF_ENTRY.match(self.f.read(20))
+                    if not entry:
+                        raise _Unsupported("malformed xref entry")
+                    return int(entry.group(1)) if entry.group(3) == b"n" else None
+            return None
+
+        return trailer, lookup
+
+    def _stream(self, offset: int):
+        """Cross-reference stream (PDF 1.5+): its dictionary doubles as the trailer."""
+        self.f.seek(offset)
+        data = self.f.read(_PDF_WINDOW)
+        trailer = _pdf_dict(data)
+        if trailer.get(b"Type") != b"/XRef":
+            raise _Unsupported("startxref does not point at an xref stream")
+        start = _PDF_STREAM.search(data)
+        if not start:
+            raise _Unsupported("xref stream without data")
+        rows = None
+
+        def lookup(number: int) -> int | None:
+            nonlocal rows
+            if rows is None:
+                rows = self._rows(offset + start.end(), trailer)
+            for first, count, table in rows:
+                if first <= number < first + count:
+                    kind, field2 = table[number - first]
+                    if kind == 2:
+                        raise _Unsupported("encryption dictionary is in an object stream")
+                    return field2 if kind == 1 else None
+            return None
+
+        return trailer, lookup
+
+    def _rows(self, pos: int, trailer: dict[bytes, bytes]) -> list[tuple[int, int, list[tuple[int, int]]]]:
+        """Decoded (first object, count, [(type, offset or stream)]) per /Index range."""
+        length = trailer.get(b"Length", b"")
+        self.f.seek(pos)
+        if length.isdigit():
+            raw = self.f.read(int(length))
+        else:
+            raw = self.f.read(_PDF_MAX_XREF_STREAM)
+            end = raw.find(b"endstream")
+            if end < 0:
+                raise _Unsupported("xref stream too large")
+            raw = raw[:end]
+        filters = re.findall(rb"/\w+", trailer.get(b"Filter", b""))
+        if filters == [b"/FlateDecode"]:
+            raw = zlib.decompress(raw)
+        elif filters:
+            raise _Unsupported("xref stream filter")
+        widths = [int(w) for w in re.findall(rb"\d+", trailer[b"W"])]
+        if len(widths) != 3:
+            raise _Unsupported("xref stream field widths")
+        columns = sum(widths)
+        params = _pdf_dict(trailer[b"DecodeParms"]) if trailer.get(b"DecodeParms", b"").startswith(b"<<") else {}
+        if int(params.get(b"Predictor", b"1")) >= 10:
+            raw = _png_unpredict(raw, columns)
+        index = [int(n) for n in re.findall(rb"\d+", trailer.get(b"Index", b""))] or [0, int(trailer[b"Size"])]
+
+        ranges, row = [], 0
+        for first, count in zip(index[::2], index[1::2]):
+            table = []
+            for _ in range(count):
+                fields, pos = [], row * columns
+                for width in widths:
+                    fields.append(int.from_bytes(raw[pos: pos + width], "big"))
+                    pos += width
+                # A zero-width type field means type 1
+                table.append((fields[0] if widths[0] else 1, fields[1]))
+                row += 1
+            ranges.append((first, count, table))
+        return ranges
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """Undo the PNG row predictors (Predictor >= 10) of a Flate stream."""
+    out = bytearray()
+    previous = bytearray(columns)
+    for pos in range(0, len(data) - columns, columns + 1):
+        kind, row = data[pos], bytearray(data[pos + 1: pos + 1 + columns])
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                corner = previous[i - 1] if i else 0
+                estimate = left + up - corner
+                near = min((abs(estimate - left), 0, left), (abs(estimate - up), 1, up), (abs(estimate - corner), 2, corner))
+                row[i] = (row[i] + near[2]) & 0xFF
+        out += row
+        previous = row
+    return bytes(out)
+
+
+class _OleFile:
+    """Minimal Compound File reader: locates one stream through the FAT without loading the file."""
+
+    def __init__(self, f, size: int):
+        self.f = f
+        f.seek(0)
+        header = f.read(512)
+        if not header.startswith(_OLE_SIGNATURE):
+            raise _Unsupported("not an OLE container")
+        self.sector_size = 1 << struct.unpack_from("<H", header, 0x1E)[0]
+        self.mini_size = 1 << struct.unpack_from("<H", header, 0x20)[0]
+        fat_sectors, self.dir_start = struct.unpack_from("<II", header, 0x2C)
+        self.cutoff, mini_fat_start, mini_fat_count, difat_start, difat_count = struct.unpack_from(
+            "<IIIII", header, 0x38
+        )
+        difat = list(struct.unpack_from("<109I", header, 0x4C))
+        sector = difat_start
+        per_sector = self.sector_size // 4
+        for _ in range(difat_count):
+            if sector in (_OLE_END, _OLE_FREE):
+                break
+            entries = struct.unpack(f"<{per_sector}I", self._sector(sector))
+            difat.extend(entries[:-1])
+            sector = entries[-1]
+        self.fat: list[int] = []
+        for sector in difat[:fat_sectors]:
+            self.fat.extend(struct.unpack(f"<{per_sector}I", self._sector(sector)))
+        self.mini_fat = []
+        if mini_fat_count:
+            raw = self._chain(mini_fat_start)
+            self.mini_fat = list(struct.unpack(f"<{len(raw) // 4}I", raw))
+
+    def _sector(self, index: int) -> bytes:
+        self.f.seek((index + 1) * self.sector_size)
+        return self.f.read(self.sector_size)
+
+    def _chain(self, start: int, limit: int | None = None) -> bytes:
+        out = bytearray()
+        sector, seen = start, 0
+        while sector not in (_OLE_END, _OLE_FREE) and seen <= len(self.fat):
+            out += self._sector(sector)
+            if limit is not None and len(out) >= limit:
+                break
+            sector = self.fat[sector]
+            seen += 1
+        return bytes(out if limit is None else out[:limit])
+
+    def stream(self, name: str) -> bytes | None:
+        directory = self._chain(self.dir_start)
+        wanted = name.encode("utf-16-le")
+        root_start = root_size = None
+        target = None
+        for pos in range(0, len(directory) - 127, 128):
+            entry = directory[pos: pos + 128]
+            name_len = struct.unpack_from("<H", entry, 0x40)[0]
+            entry_type = entry[0x42]
+            start, size = struct.unpack_from("<IQ", entry, 0x74)
+            if entry_type == 5:
+                root_start, root_size = start, size
+            elif entry_type == 2 and entry[: max(name_len - 2, 0)] == wanted:
+                target = (start, size & 0xFFFFFFFF if self.sector_size == 512 else size)
+        if target is None:
+            return None
+        start, size = target
+        if size >= self.cutoff:
+            return self._chain(start, size)
+        mini_stream = self._chain(root_start, root_size)
+        out = bytearray()
+        sector, seen = start, 0
+        while sector not in (_OLE_END, _OLE_FREE) and len(out) < size and seen <= len(self.mini_fat):
+            out += mini_stream[sector * self.mini_size: (sector + 1) * self.mini_size]
+            sector = self.mini_fat[sector]
+            seen += 1
+        return bytes(out[:size])
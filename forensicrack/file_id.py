@@ -1,22 +1,222 @@
 import mimetypes
 import os
+import re
+import json
+import struct
+import logging
+import threading
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class FileSignature:
+    """What a file's content says it is, independent of its name."""
+    kind: str                  # canonical extension of the detected format, e.g. ".zip"
+    encrypted: bool | None     # None when the bounded header/tail window cannot tell
+    scheme: str | None = None  # e.g. "zipcrypto", "aes", "rar5-headers", "ooxml"
+
+
+# OLE (Compound File) stream names that identify the Office application
+_OLE_STREAMS = (
+    ("EncryptedPackage".encode("utf-16-le"), ".docx"),
+    ("WordDocument".encode("utf-16-le"), ".doc"),
+    ("Workbook".encode("utf-16-le"), ".xls"),
+    ("PowerPoint Document".encode("utf-16-le"), ".ppt"),
+)
+_OOXML_PARTS = ((b"word/", ".docx"), (b"xl/", ".xlsx"), (b"ppt/", ".pptx"))
+_PDF_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_PDF_OBJ = re.compile(rb"\s*\d+\s+\d+\s+obj")
 
 
 class FileIdentifier:
     GRAPHIC_EXT = {".jpg", ".jpeg", ".png", ".bmp", ".gif"}
-    ARCHIVE_EXT = {".zip", ".7z"}
+    ARCHIVE_EXT = {".zip", ".7z", ".rar"}
     PDF_EXT = {".pdf"}
     OFFICE_EXT = {".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"}
     TEXT_EXT = {".txt"}
 
+    # Bytes read from each end of a file; evidence is never read in full
+    HEAD_BYTES = 64 * 1024
+    TAIL_BYTES = 64 * 1024
+    # Bumped when sniffing changes, so signatures cached by older versions are dropped
+    CACHE_VERSION = 2
+
+    # Extensions that are just another name for a detected kind
+    EQUIVALENT_EXT = {
+        ".jpg": {".jpg", ".jpeg"},
+        ".doc": OFFICE_EXT,
+        ".docx": OFFICE_EXT,
+        ".xls": OFFICE_EXT,
+        ".xlsx": OFFICE_EXT,
+        ".ppt": OFFICE_EXT,
+        ".pptx": OFFICE_EXT,
+    }
+
+    def __init__(self, cache_path: str | None = None, logger: logging.Logger | None = None):
+        self.logger = logger or logging.getLogger("ForensiCrack.FileID")
+        # Signatures keyed by "dev:inode:mtime_ns:size", persisted across runs
+        self.cache_path = cache_path
+        self._cache: dict[str, dict | None] = self._load_cache()
+        self._dirty = False
+        self._lock = threading.Lock()
+
     def identify(self, path: str):
         ext = os.path.splitext(path)[1].lower()
-        mime, _ = mimetypes.guess_type(path)
+        sig = self.sniff(path)
+        if sig and ext not in self.EQUIVALENT_EXT.get(sig.kind, {sig.kind}):
+            self.logger.info(f"{os.path.basename(path)}: content is {sig.kind}, not {ext or 'extensionless'}")
+            ext = sig.kind
+        mime, _ = mimetypes.guess_type(f"x{ext}")
         is_graphic = ext in self.GRAPHIC_EXT
         is_archive = ext in self.ARCHIVE_EXT
         is_text = ext in self.TEXT_EXT
         return ext, mime or "", is_graphic, is_archive, is_text
 
+    def sniff(self, path: str) -> FileSignature | None:
+        """Signature of `path` from a bounded head/tail window, or None if unrecognized."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        with self._lock:
+            if key in self._cache:
+                cached = self._cache[key]
+                return FileSignature(**cached) if cached else None
+
+        try:
+            with open(path, "rb") as f:
+                head = f.read(self.HEAD_BYTES)
+                tail = b""
+                if st.st_size > self.HEAD_BYTES:
+                    f.seek(max(self.HEAD_BYTES, st.st_size - self.TAIL_BYTES))
+                    tail = f.read(self.TAIL_BYTES)
+        except OSError as e:
+            self.logger.warning(f"Cannot read {path}: {e}")
+            return None
+
+        sig = self._match(head, tail, st.st_size)
+        with self._lock:
+            self._cache[key] = asdict(sig) if sig else None
+            self._dirty = True
+        return sig
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.CACHE_VERSION, "signatures": self._cache}, f)
+            os.replace(tmp, self.cache_path)
+            self._dirty = False
+
+    def _load_cache(self) -> dict:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("version") != self.CACHE_VERSION:
+            return {}
+        return cache.get("signatures", {})
+
+    def _match(self, head: bytes, tail: bytes, size: int) -> FileSignature | None:
+        if head.startswith(b"PK\x03\x04"):
+            return self._zip(head)
+        if head.startswith(b"7z\xbc\xaf\x27\x1c"):
+            return FileSignature(".7z", None)
+        if head.startswith(b"Rar!\x1a\x07\x01\x00"):
+            return self._rar5(head)
+        if head.startswith(b"Rar!\x1a\x07\x00"):
+            # RAR 4 main header flags: 0x0080 = block headers encrypted (-hp)
+            flags = struct.unpack_from("<H", head, 10)[0] if len(head) >= 12 else 0
+            return FileSignature(".rar", True if flags & 0x0080 else None, "rar4-headers" if flags & 0x0080 else None)
+        if head.startswith(b"%PDF-"):
+            return self._pdf(head, tail, size)
+        if head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+            return self._ole(head + tail)
+        if head.startswith(b"\xff\xd8\xff"):
+            return FileSignature(".jpg", False)
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return FileSignature(".png", False)
+        if head.startswith((b"GIF87a", b"GIF89a")):
+            return FileSignature(".gif", False)
+        if head.startswith(b"BM") and len(head) >= 14 and struct.unpack_from("<I", head, 10)[0] < 1024:
+            # "BM" alone is too common; also require a plausible pixel-data offset
+            return FileSignature(".bmp", False)
+        return None
+
+    @staticmethod
+    def _zip(head: bytes) -> FileSignature:
+        for part, kind in _OOXML_PARTS:
+            if b"[Content_Types].xml" in head and part in head:
+                # Password-protected OOXML is an OLE container, so a ZIP one is plain
+                return FileSignature(kind, False)
+        if len(head) < 10:
+            return FileSignature(".zip", None)
+        flags, method = struct.unpack_from("<HH", head, 6)
+        if not flags & 0x1:
+            # Only the first member is visible here; later ones may still be encrypted
+            return FileSignature(".zip", None)
+        if method == 99:
+            return FileSignature(".zip", True, "aes")
+        return FileSignature(".zip", True, "zipcrypto")
+
+    @staticmethod
+    def _pdf(head: bytes, tail: bytes, size: int) -> FileSignature:
+        if b"/Encrypt" in head or b"/Encrypt" in tail:
+            return FileSignature(".pdf", True, "pdf")
+        # Only the newest trailer (or xref stream dictionary) proves there is no
+        # /Encrypt, and only if it lies entirely inside one of the windows
+        found = list(_PDF_STARTXREF.finditer(tail or head))
+        if not found:
+            return FileSignature(".pdf", None)
+        offset = int(found[-1].group(1))
+        for window, start in ((head, 0), (tail, size - len(tail))):
+            if not start <= offset < start + len(window):
+                continue
+            section = window[offset - start:]
+            if section.lstrip().startswith(b"xref"):
+                end = section.find(b"startxref")
+                if end >= 0 and b"trailer" in section[:end]:
+                    return FileSignature(".pdf", False)
+            elif _PDF_OBJ.match(section) and b"stream" in section:
+                return FileSignature(".pdf", False)
+        return FileSignature(".pdf", None)
+
+    @staticmethod
+    def _rar5(head: bytes) -> FileSignature:
+        # After the signature: CRC32, header size (vint), header type (vint); type 4 = encryption header
+        pos, value = 12, 0
+        for _ in range(2):
+            value, shift = 0, 0
+            while pos < len(head):
+                byte = head[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if not byte & 0x80:
+                    break
+        if value == 4:
+            return FileSignature(".rar", True, "rar5-headers")
+        return FileSignature(".rar", None)
+
+    @staticmethod
+    def _ole(window: bytes) -> FileSignature | None:
+        for name, kind in _OLE_STREAMS:
+            if name in window:
+                if kind == ".docx":
+                    return FileSignature(kind, True, "ooxml")
+                return FileSignature(kind, None)
+        # Some other Compound File (MSI, Outlook .msg ...); trust the extension
+        return None
+
     def classify_office(self, ext: str) -> str | None:
         if ext in self.OFFICE_EXT:
             if ext in {".docx", ".xlsx", ".pptx"}:
@@ -0,0 +1,185 @@
+import os
+import re
+import hashlib
+
+# *2john helpers wrap these hashes in closing tags; anything after the tag is
+# John metadata (member name, archive name) that hashcat cannot parse.
+_TAGGED_HASHES = (
+    ("$zip2$", "$/zip2$"),
+    ("$pkzip2$", "$/pkzip2$"),
+    ("$pkzip$", "$/pkzip$"),
+)
+
+
+def normalize_hash_line(line: str) -> str:
+    """
+    Reduce one hash line to the form hashcat expects.
+
+    *2john output looks like "<label>:<hash>[:<john fields>]"; the label and
+    trailing fields are stripped. Raw hashes (e.g. from .hash evidence) are
+    returned as-is, since formats like NetNTLMv2 or $krb5asrep$ legitimately
+    contain colons.
+    """
+    s = line.strip()
+    if not s or s.startswith("#"):
+        return ""
+
+    if not s.startswith("$") and ":$" in s:
+        s = s[s.index(":$") + 1:]
+        for opener, closer in _TAGGED_HASHES:
+            if s.startswith(opener) and closer in s:
+                return s[: s.index(closer) + len(closer)]
+        return s.split(":", 1)[0]
+
+    return s
+
+
+def read_hash_lines(path: str) -> list[str]:
+    """Read a hash file and return its unique normalized hashes, in file order."""
+    hashes: list[str] = []
+    seen: set[str] = set()
+    if not os.path.exists(path):
+        return hashes
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            h = normalize_hash_line(line)
+            if h and h not in seen:
+                seen.add(h)
+                hashes.append(h)
+    return hashes
+
+
+def match_result_line(line: str, wanted: dict[str, str]) -> tuple[str, str] | None:
+    """
+    Split a "hash:plain" line (hashcat --outfile-format 1,2 or potfile) into
+    (hash, plain), where hash is one of the keys of `wanted`.
+
+    Hashes may contain colons themselves, so every colon is tried as the
+    split point. `wanted` maps lowercased hashes to their original spelling
+    because hashcat re-encodes hex digests in lowercase.
+    """
+    s = line.rstrip("\r\n")
+    idx = s.find(":")
+    while idx != -1:
+        candidate = s[:idx].lower()
+        if candidate in wanted:
+            return wanted[candidate], s[idx + 1:]
+        idx = s.find(":", idx + 1)
+    return None
+
+
+def write_results(path: str, found: dict[str, str]):
+    """Write recovered {hash: plaintext} pairs as hash:plain lines."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", errors="replace") as f:
+        f.write("".join(f"{h}:{p}\n" for h, p in found.items()))
+
+
+def hash_digests(hashes: list[str]) -> list[str]:
+    """Sorted SHA-1 digests of a target set, used to tell whether saved progress still applies."""
+    return sorted(hashlib.sha1(h.encode()).hexdigest() for h in hashes)
+
+
+# Hash prefixes that identify exactly one hashcat mode
+_PREFIX_MODES = (
+    ("$zip2$", 13600),
+    ("$7z$", 11600),
+    ("$rar5$", 13000),
+    ("$RAR3$*0*", 12500),
+    ("$1$", 500),
+    ("$apr1$", 1600),
+    ("$5$", 7400),
+    ("$6$", 1800),
+    ("$2a$", 3200),
+    ("$2b$", 3200),
+    ("$2y$", 3200),
+    ("$krb5tgs$23$", 13100),
+    ("$krb5asrep$23$", 18200),
+)
+# $pdf$<V>*<R>*...: the revision R decides the algorithm
+_PDF_REVISIONS = {2: 10400, 3: 10500, 4: 10500, 5: 10600, 6: 10700}
+_OFFICE_VERSIONS = {"2007": 9400, "2010": 9500, "2013": 9600}
+# $oldoffice$<type>*...: types 0/1 are MD5 + RC4, 3/4 are SHA1 + RC4
+_OLD_OFFICE_TYPES = {"0": 9700, "1": 9700, "3": 9800, "4": 9800}
+# Unsalted hex digests never name one mode; their length only narrows the candidates
+_HEX_CANDIDATES = {
+    32: [0, 1000, 900],             # MD5, NTLM, MD4
+    40: [100, 300, 6000],           # SHA1, MySQL 4.1+, RIPEMD-160
+    64: [1400, 17400, 17800],       # SHA2-256, SHA3-256, Keccak-256
+    128: [1700, 17600, 17900, 6100],  # SHA2-512, SHA3-512, Keccak-512, Whirlpool
+}
+_HEX = re.compile(r"^[0-9a-fA-F]+$")
+_NETNTLMV2 = re.compile(r"^[^:]*::[^:]*:[0-9a-fA-F]{16}:[0-9a-fA-F]{32}:[0-9a-fA-F]+$")
+_NETNTLMV1 = re.compile(r"^[^:]*::[^:]*:[0-9a-fA-F]{48}:[0-9a-fA-F]{48}:[0-9a-fA-F]{16}$")
+
+
+def classify_hash(h: str) -> int | None:
+    """
+    The hashcat mode a normalized hash line belongs to, read from its
+    signature (e.g. "$rar5$" -> 13000, "$pdf$4*4*" -> 10500), or None if the
+    line does not identify a single mode.
+    """
+    for prefix, mode in _PREFIX_MODES:
+        if h.startswith(prefix):
+            return mode
+    fields = h.split("*")
+    if h.startswith("$pdf$"):
+        try:
+            return _PDF_REVISIONS.get(int(fields[1]))
+        except (IndexError, ValueError):
+            return None
+    if h.startswith("$office$*"):
+        return _OFFICE_VERSIONS.get(fields[1]) if len(fields) > 1 else None
+    if h.startswith("$oldoffice$"):
+        return _OLD_OFFICE_TYPES.get(fields[0][len("$oldoffice$"):])
+    if h.startswith("$RAR3$*1*"):
+        # The last field is the packing method; 0x30 means stored
+        return 23700 if fields[-1] == "30" else 23800
+    if h.startswith(("$pkzip$", "$pkzip2$")):
+        return _pkzip_mode(fields)
+    if _NETNTLMV2.match(h):
+        return 5600
+    if _NETNTLMV1.match(h):
+        return 5500
+    return None
+
+
+def _pkzip_mode(fields: list[str]) -> int | None:
+    """
+    $pkzip2$C*B*[DT*MT{CL*UL*CR*OF*OX}*CT*DL*CS*TC*DA]...: C entries, each
+    with a data type DT (the braced fields are present when DT > 1) and a
+    compression type CT (0 stored, 8 deflated).
+    """
+    try:
+        count = int(fields[0].rsplit("$", 1)[1], 16)
+        pos = 2
+        types = []
+        for _ in range(count):
+            data_type = int(fields[pos], 16)
+            pos += 2 + (5 if data_type > 1 else 0)
+            types.append(int(fields[pos], 16))
+            pos += 5
+    except (IndexError, ValueError):
+        return None
+    if count == 1:
+        return 17210 if types[0] == 0 else 17200
+    return 17220 if all(t == 8 for t in types) else 17225
+
+
+def detect_mode(hashes: list[str]) -> int | None:
+    """The single hashcat mode every hash in `hashes` belongs to, or None if they disagree or are unknown."""
+    modes = {classify_hash(h) for h in hashes}
+    if len(modes) == 1:
+        return modes.pop()
+    return None
+
+
+def candidate_modes(hashes: list[str]) -> list[int] | None:
+    """Modes to try, most common first, for unsalted hex digests that all have one length."""
+    if not hashes or not all(_HEX.match(h) for h in hashes):
+        return None
+    lengths = {len(h) for h in hashes}
+    if len(lengths) != 1:
+        return None
+    candidates = _HEX_CANDIDATES.get(lengths.pop())
+    return list(candidates) if candidates else None
@@ -0,0 +1,137 @@
+import os
+import shutil
+import hashlib
+import logging
+from collections import defaultdict
+
+from .models import EvidenceFile
+from .scheduler import EvidenceScheduler
+
+# Files are hashed in pieces of this size so one large image is spread over the pool
+_PIECE = 64 * 1024 * 1024
+_READ = 1024 * 1024
+
+
+def _hash_piece(path: str, offset: int, length: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while length > 0:
+            block = f.read(min(_READ, length))
+            if not block:
+                break
+            digest.update(block)
+            length -= len(block)
+    return digest.hexdigest()
+
+
+def _combine(pieces: list[str]) -> str:
+    # A file of one piece is identified by its plain SHA-256
+    if len(pieces) == 1:
+        return pieces[0]
+    return hashlib.sha256("".join(pieces).encode()).hexdigest()
+
+
+def content_digest(path: str) -> str:
+    """Content fingerprint of a file, hashed piece by piece in this thread (see EvidenceIntake.fingerprint)."""
+    size = os.path.getsize(path)
+    return _combine([_hash_piece(path, offset, _PIECE) for offset in range(0, max(size, 1), _PIECE)])
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class EvidenceIntake:
+    """
+    Fingerprints evidence by content and groups byte-identical files, so
+    each distinct file is cracked once and its results are copied to the
+    duplicates afterwards.
+
+    Files are SHA-256 hashed in pieces on the scheduler's worker pool and
+    the pieces combined per file. The digest is kept on the evidence as
+    metadata["fingerprint"], the key of the job ledger and the stego result
+    cache, so a file is read once per run (and not at all while its digest
+    is cached).
+    """
+
+    def __init__(self, scheduler: EvidenceScheduler, logger: logging.Logger | None = None):
+        self.scheduler = scheduler
+        self.logger = logger or logging.getLogger("ForensiCrack.Intake")
+
+    def fingerprint(self, evidence_files: list[EvidenceFile], cached=None, remember=None):
+        """
+        Set metadata["fingerprint"] on every file. `cached(path)` returns a
+        digest already known for the file's current version, and
+        `remember(path, digest)` stores a new one (both from the JobLedger).
+        """
+        todo = []
+        for evidence in evidence_files:
+            digest = cached(evidence.path) if cached else None
+            if digest:
+                evidence.metadata["fingerprint"] = digest
+            else:
+                todo.append(evidence)
+
+        pieces = []
+        for index, evidence in enumerate(todo):
+            try:
+                size = os.path.getsize(evidence.path)
+            except OSError:
+                continue
+            for offset in range(0, max(size, 1), _PIECE):
+                pieces.append((index, offset))
+
+        digests: dict[int, dict[int, str]] = defaultdict(dict)
+        for (index, offset), digest in self.scheduler.run(
+            pieces, lambda p: _hash_piece(todo[p[0]].path, p[1], _PIECE), lambda p: "cpu"
+        ):
+            digests[index][offset] = digest
+
+        for index, evidence in enumerate(todo):
+            parts = digests.get(index)
+            if not parts or not all(parts.values()):
+                self.logger.warning(f"Could not fingerprint {evidence.path}")
+                continue
+            digest = _combine([parts[o] for o in sorted(parts)])
+            evidence.metadata["fingerprint"] = digest
+            if remember:
+                remember(evidence.path, digest)
+        if todo:
+            self.logger.info(f"Intake: fingerprinted {len(todo)} file(s), {len(evidence_files) - len(todo)} cached")
+
+    def group(self, evidence_files: list[EvidenceFile]) -> list[tuple[EvidenceFile, list[EvidenceFile]]]:
+        """(representative, duplicates) per distinct content, in input order (after fingerprint())."""
+        groups: dict[str, list[EvidenceFile]] = {}
+        for evidence in evidence_files:
+            # Unfingerprinted (unreadable) files only group with themselves
+            key = evidence.metadata.get("fingerprint") or evidence.path
+            groups.setdefault(key, []).append(evidence)
+
+        result = [(group[0], group[1:]) for group in groups.values()]
+        duplicates = sum(len(dups) for _, dups in result)
+        if duplicates:
+            self.logger.info(f"Intake: {duplicates} duplicate file(s) - cracking {len(result)} distinct file(s)")
+        return result
+
+    def fan_out(self, rep: EvidenceFile, dup: EvidenceFile, outputs: list[tuple[str, str]]):
+        """Copy (hard-link where possible) the representative's outputs to a duplicate's paths."""
+        copied = 0
+        for src, dst in outputs:
+            if not os.path.exists(src) or os.path.abspath(src) == os.path.abspath(dst):
+                continue
+            try:
+                if os.path.isdir(src):
+                    shutil.rmtree(dst, ignore_errors=True)
+                    shutil.copytree(src, dst, copy_function=_link_or_copy)
+                else:
+                    if os.path.exists(dst):
+                        os.remove(dst)
+                    _link_or_copy(src, dst)
+                copied += 1
+            except OSError as e:
+                self.logger.warning(f"Could not copy {src} for duplicate {dup.name}: {e}")
+        self.logger.info(f"{dup.name} is identical to {rep.name} - reused its result ({copied} output(s))")
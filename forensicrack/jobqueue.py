@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+
+
+class JobQueue:
+    """
+    Durable FIFO of evidence files waiting to be processed.
+
+    Every job is identified by (path, size, mtime), so a file that changes
+    after it was processed is queued again. Every state change is appended
+    to a JSON-lines file (the last record of a job wins), which is compacted
+    to one record per job on start and once it grows well past that; jobs
+    that were running when the process died go back to pending on the next
+    start.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    # Compact once the file holds this many times more records than jobs
+    COMPACT_FACTOR = 4
+    COMPACT_MIN_RECORDS = 1000
+
+    def __init__(self, path: str, logger: logging.Logger | None = None):
+        self.path = path
+        self.logger = logger or logging.getLogger("ForensiCrack.Queue")
+        self._cond = threading.Condition()
+        self._jobs: dict[str, dict] = self._load()
+        # Pending job ids, oldest first
+        self._pending = deque(
+            job["id"] for job in sorted(self._jobs.values(), key=lambda j: j["queued"]) if job["state"] == self.PENDING
+        )
+        self._records = 0
+        self._compact()
+
+    def _load(self) -> dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        jobs: dict[str, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        job = json.loads(line)
+                        jobs[job["id"]] = job
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A record cut short by a crash
+                        continue
+        except OSError as e:
+            self.logger.warning(f"Job queue {self.path} unreadable ({e}) - starting empty")
+            return {}
+        requeued = 0
+        for job in jobs.values():
+            if job["state"] == self.RUNNING:
+                job["state"] = self.PENDING
+                requeued += 1
+        if requeued:
+            self.logger.info(f"Requeued {requeued} job(s) interrupted by the last shutdown")
+        return jobs
+
+    def _compact(self):
+        """Rewrite the file atomically with one record per job."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for job in self._jobs.values():
+                f.write(json.dumps(job) + "\n")
+        os.replace(tmp, self.path)
+        self._records = len(self._jobs)
+
+    def _save(self, job: dict):
+        """Append the new state of `job` (caller holds the lock)."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(job) + "\n")
+        self._records += 1
+        if self._records > max(self.COMPACT_MIN_RECORDS, self.COMPACT_FACTOR * len(self._jobs)):
+            self._compact()
+
+    def put(self, path: str) -> bool:
+        """Queue `path` unless this version of it is already known. Returns True if queued."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        job_id = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+        with self._cond:
+            if job_id in self._jobs:
+                return False
+            job = {"id": job_id, "path": path, "state": self.PENDING, "queued": time.time()}
+            self._jobs[job_id] = job
+            self._pending.append(job_id)
+            self._save(job)
+            self._cond.notify()
+        self.logger.info(f"Queued {os.path.basename(path)}")
+        return True
+
+    def claim(self, timeout: float | None = None) -> dict | None:
+        """Oldest pending job (now marked running), waiting up to `timeout` seconds for one."""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while True:
+                if self._pending:
+                    job = self._jobs[self._pending.popleft()]
+                    job["state"] = self.RUNNING
+                    self._save(job)
+                    return dict(job)
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def complete(self, job_id: str, success: bool):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job:
+                job["state"] = self.DONE if success else self.FAILED
+                job["finished"] = time.time()
+                self._save(job)
+
+    def counts(self) -> dict[str, int]:
+        with self._cond:
+            counts: dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["state"]] = counts.get(job["state"], 0) + 1
+            return counts
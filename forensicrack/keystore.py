@@ -0,0 +1,76 @@
+import os
+import json
+import time
+import logging
+import threading
+
+
+class ZipKeyStore:
+    """
+    Case-wide store of ZipCrypto internal keys recovered by bkcrack.
+
+    A password always produces the same three keys, so every archive
+    encrypted with it belongs to one key family. Families are tried on a
+    new ZipCrypto archive before a known-plaintext attack, and an archive
+    whose keys are known is decrypted straight away. Backed by an
+    append-only JSON-lines file, like the ResultStore (in memory only
+    without a path).
+    """
+
+    def __init__(self, path: str | None = None, logger: logging.Logger | None = None):
+        self.path = path
+        self.logger = logger or logging.getLogger("ForensiCrack.Keys")
+        self._lock = threading.Lock()
+        # "k0 k1 k2" -> archive paths it opened, most recent last
+        self._families: dict[str, list[str]] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._families.setdefault(entry["keys"], []).append(entry["archive"])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        self.logger.info(f"Loaded {len(self._families)} bkcrack key family(ies) from {self.path}")
+
+    def keys_for(self, archive: str) -> tuple[int, int, int] | None:
+        """Keys already known to open `archive`."""
+        archive = os.path.abspath(archive)
+        with self._lock:
+            for keys, archives in self._families.items():
+                if archive in archives:
+                    return self.parse(keys)
+        return None
+
+    def families(self) -> list[tuple[int, int, int]]:
+        """Every known key triple, the ones that opened the most archives first."""
+        with self._lock:
+            ranked = sorted(self._families.items(), key=lambda item: -len(item[1]))
+        return [self.parse(keys) for keys, _ in ranked]
+
+    def remember(self, keys: tuple[int, int, int], archive: str):
+        text = self.format(keys)
+        archive = os.path.abspath(archive)
+        with self._lock:
+            archives = self._families.setdefault(text, [])
+            if archive in archives:
+                return
+            archives.append(archive)
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"keys": text, "archive": archive, "time": int(time.time())}) + "\n")
+
+    @staticmethod
+    def format(keys: tuple[int, int, int]) -> str:
+        return " ".join(f"{k:08x}" for k in keys)
+
+    @staticmethod
+    def parse(text: str) -> tuple[int, int, int]:
+        k0, k1, k2 = (int(k, 16) for k in text.split())
+        return k0, k1, k2
@@ -0,0 +1,185 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+from .intake import content_digest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    stat_key TEXT PRIMARY KEY,
+    digest   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evidence (
+    fingerprint TEXT PRIMARY KEY,
+    path        TEXT NOT NULL,
+    file_type   TEXT,
+    mode        TEXT,
+    status      TEXT NOT NULL,
+    first_seen  REAL NOT NULL,
+    updated     REAL NOT NULL,
+    parent      TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    evidence    TEXT NOT NULL,
+    engine      TEXT NOT NULL,
+    mode        TEXT,
+    wordlist_fp TEXT,
+    status      TEXT NOT NULL,
+    started     REAL NOT NULL,
+    duration    REAL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_key ON attempts (evidence, engine, mode, wordlist_fp);
+CREATE TABLE IF NOT EXISTS results (
+    evidence  TEXT NOT NULL,
+    hash      TEXT NOT NULL,
+    plaintext TEXT NOT NULL,
+    engine    TEXT,
+    mode      TEXT,
+    recorded  REAL NOT NULL,
+    PRIMARY KEY (evidence, hash)
+);
+"""
+
+
+class JobLedger:
+    """
+    SQLite record of the work done on a case: every evidence file (by
+    content fingerprint, with its type, resolved mode and the archive it
+    was unpacked from), every attack attempt (engine, mode, wordlist-set
+    fingerprint, status, duration) and every recovered plaintext.
+
+    Reruns consult it to skip evidence that is already cracked and attacks
+    that already ran to the end with the same wordlists; attempts that were
+    paused, interrupted or failed are retried.
+    """
+
+    # Evidence and attempt states
+    PENDING = "pending"
+    RUNNING = "running"
+    CRACKED = "cracked"
+    EXHAUSTED = "exhausted"    # ran to the end without a result
+    PAUSED = "paused"          # time budget ran out; the engine session resumes it
+    INCOMPLETE = "incomplete"  # ended early (engine error, failed pass)
+    FAILED = "failed"
+    INTERRUPTED = "interrupted"
+
+    # Attempts that need not run again for the same wordlists
+    FINISHED = (CRACKED, EXHAUSTED)
+
+    def __init__(self, path: str, logger: logging.Logger | None = None):
+        self.path = path
+        self.logger = logger or logging.getLogger("ForensiCrack.Ledger")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # One connection shared by the worker threads, serialized by the lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            # Ledgers written before child evidence existed lack the parent link
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(evidence)")}
+            if "parent" not in columns:
+                self._db.execute("ALTER TABLE evidence ADD COLUMN parent TEXT")
+            interrupted = self._db.execute(
+                "UPDATE attempts SET status = ? WHERE status = ?", (self.INTERRUPTED, self.RUNNING)
+            ).rowcount
+        if interrupted:
+            self.logger.info(f"Ledger: {interrupted} attempt(s) were interrupted by the last shutdown and will be retried")
+
+    @staticmethod
+    def _stat_key(path: str) -> str:
+        st = os.stat(path)
+        return f"{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+
+    def cached_fingerprint(self, path: str) -> str | None:
+        """Content digest recorded for this version (inode + mtime + size) of `path`."""
+        try:
+            key = self._stat_key(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM fingerprints WHERE stat_key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def remember_fingerprint(self, path: str, digest: str):
+        key = self._stat_key(path)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO fingerprints VALUES (?, ?)", (key, digest))
+
+    def fingerprint(self, path: str) -> str:
+        """Content digest of `path` (see intake.content_digest), hashed here only if not cached."""
+        digest = self.cached_fingerprint(path)
+        if digest:
+            return digest
+        digest = content_digest(path)
+        self.remember_fingerprint(path, digest)
+        return digest
+
+    def register(self, fingerprint: str, path: str, file_type: str, mode, parent: str | None = None) -> str:
+        """
+        Record an evidence file (or refresh its path/mode). `parent` is the
+        fingerprint of the archive it was unpacked from. Returns its current status.
+        """
+        now = time.time()
+        mode = None if mode is None else str(mode)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO evidence VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(fingerprint) DO UPDATE SET path = excluded.path, "
+                "file_type = excluded.file_type, mode = excluded.mode, updated = excluded.updated, "
+                "parent = COALESCE(evidence.parent, excluded.parent)",
+                (fingerprint, path, file_type, mode, self.PENDING, now, now, parent),
+            )
+            return self._db.execute("SELECT status FROM evidence WHERE fingerprint = ?", (fingerprint,)).fetchone()[0]
+
+    def set_status(self, fingerprint: str, status: str):
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE evidence SET status = ?, updated = ? WHERE fingerprint = ?", (status, time.time(), fingerprint)
+            )
+
+    def attempt_finished(self, fingerprint: str, engine: str, mode, wordlist_fp: str | None) -> bool:
+        """True if this attack already ran to the end (cracked or exhausted) with these wordlists."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM attempts WHERE evidence = ? AND engine = ? AND mode IS ? AND wordlist_fp IS ? "
+                f"AND status IN ({', '.join('?' * len(self.FINISHED))}) LIMIT 1",
+                (fingerprint, engine, None if mode is None else str(mode), wordlist_fp, *self.FINISHED),
+            ).fetchone()
+        return row is not None
+
+    def start_attempt(self, fingerprint: str, engine: str, mode, wordlist_fp: str | None) -> int:
+        with self._lock, self._db:
+            return self._db.execute(
+                "INSERT INTO attempts (evidence, engine, mode, wordlist_fp, status, started) VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, engine, None if mode is None else str(mode), wordlist_fp, self.RUNNING, time.time()),
+            ).lastrowid
+
+    def finish_attempt(self, attempt_id: int, status: str, duration: float):
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE attempts SET status = ?, duration = ? WHERE id = ?", (status, duration, attempt_id)
+            )
+
+    def record_results(self, fingerprint: str, found: dict[str, str], engine: str, mode=None):
+        if not found:
+            return
+        now = time.time()
+        mode = None if mode is None else str(mode)
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                [(fingerprint, h, plain, engine, mode, now) for h, plain in found.items()],
+            )
+
+    def results(self, fingerprint: str) -> dict[str, str]:
+        with self._lock:
+            rows = self._db.execute("SELECT hash, plaintext FROM results WHERE evidence = ?", (fingerprint,)).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,4 +1,5 @@
 import os
+from collections import Counter
 from dataclasses import dataclass, field
 
 
@@ -21,4 +22,78 @@ class EvidenceFile:
 
     @property
     def ext(self):
-        return os.path.splitext(self.path)[1].lower()
\ No newline at end of file
+        # file_type holds the content-detected type once the file was identified
+        return self.file_type or os.path.splitext(self.path)[1].lower()
+
+@dataclass
+class ArchiveMember:
+    """One ZIP entry, as read from the central directory."""
+    name: str
+    offset: int
+    compressed_size: int
+    size: int
+    crc: int
+    method: int                     # real compression method (also for AES entries)
+    flags: int
+    dos_time: int
+    encryption: str = "none"        # "none", "zipcrypto", "aes" or "strong"
+    aes_strength: int | None = None  # 1/2/3 = AES-128/192/256
+    verifiable: bool = True         # a cracker can confirm a candidate against it
+    cost: float = 0.0               # relative work to test one candidate password
+
+    @property
+    def cipher(self) -> str:
+        if self.encryption == "aes":
+            return f"AES-{self.aes_strength * 64 + 64}" if self.aes_strength else "AES"
+        return {"zipcrypto": "ZipCrypto", "strong": "strong encryption"}.get(self.encryption, "unencrypted")
+
+
+@dataclass
+class ZipProfile:
+    """Every entry of one ZIP with its encryption, compression, sizes and CRC."""
+    path: str
+    members: list[ArchiveMember] = field(default_factory=list)
+
+    @property
+    def encrypted(self) -> list[ArchiveMember]:
+        """Encrypted entries, cheapest verifiable attack target first."""
+        return sorted(
+            (m for m in self.members if m.encryption != "none"),
+            key=lambda m: (not m.verifiable, m.cost, m.compressed_size),
+        )
+
+    @property
+    def encryption(self) -> str | None:
+        """None, the one scheme every encrypted entry uses, or "mixed"."""
+        kinds = {m.encryption for m in self.members if m.encryption != "none"}
+        if not kinds:
+            return None
+        return kinds.pop() if len(kinds) == 1 else "mixed"
+
+    def summary(self) -> str:
+        counts = Counter(m.cipher for m in self.members)
+        return ", ".join(f"{n} {cipher}" for cipher, n in counts.most_common())
+
+
+@dataclass
+class CrackResult:
+    """One recovered secret: the hash as attacked, its plaintext and the mode that cracked it."""
+    hash: str
+    plaintext: str
+    mode: int | None = None
+    wordlist: str | None = None
+    engine: str = "hashcat"
+
+
+@dataclass
+class HashJob:
+    """Extracted hashes of one evidence file, waiting to be batched by mode."""
+    evidence: EvidenceFile
+    mode: int | list[int]
+    hash_path: str
+    hashes: list[str]
+    output_path: str
+
+    @property
+    def mode_key(self):
+        return tuple(self.mode) if isinstance(self.mode, list) else self.mode
@@ -0,0 +1,101 @@
+import os
+import json
+import zlib
+import logging
+import threading
+
+_READ_BLOCK = 1024 * 1024
+
+
+class PlaintextIndex:
+    """
+    CRC32 + size index of the known-plaintext library (PLAINTEXTS_DIR),
+    the two values a ZIP central directory exposes for every entry, so an
+    encrypted entry finds its plaintext by lookup whatever the file is
+    called.
+
+    The index is kept in a JSON file (only in memory without a path). A
+    refresh only stats the tree and reads files that are new or whose size
+    or mtime changed; removed files are dropped.
+    """
+
+    def __init__(self, directory: str, path: str | None = None, logger: logging.Logger | None = None):
+        self.directory = directory
+        self.path = path
+        self.logger = logger or logging.getLogger("ForensiCrack.Plaintexts")
+        # relative path -> {"size", "mtime_ns", "crc"}
+        self._files: dict[str, dict] = self._load()
+        self._by_key: dict[tuple[int, int], list[str]] = {}
+        self._lock = threading.Lock()
+        self._rebuild()
+
+    def _load(self) -> dict[str, dict]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._files, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write plaintext index {self.path}: {e}")
+
+    def _rebuild(self):
+        self._by_key = {}
+        for rel, entry in self._files.items():
+            self._by_key.setdefault((entry["crc"], entry["size"]), []).append(rel)
+
+    @staticmethod
+    def _crc(path: str) -> int:
+        crc = 0
+        with open(path, "rb") as f:
+            while block := f.read(_READ_BLOCK):
+                crc = zlib.crc32(block, crc)
+        return crc
+
+    def refresh(self):
+        """Bring the index up to date with the directory (reads new and changed files only)."""
+        with self._lock:
+            seen = set()
+            scanned = 0
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    full = os.path.join(root, name)
+                    rel = os.path.relpath(full, self.directory)
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    seen.add(rel)
+                    entry = self._files.get(rel)
+                    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                        continue
+                    try:
+                        crc = self._crc(full)
+                    except OSError:
+                        continue
+                    self._files[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "crc": crc}
+                    scanned += 1
+            removed = [rel for rel in self._files if rel not in seen]
+            for rel in removed:
+                del self._files[rel]
+            if scanned or removed:
+                self.logger.info(f"Plaintext index: {scanned} file(s) indexed, {len(removed)} removed")
+                self._rebuild()
+                self._save()
+
+    def lookup(self, crc: int, size: int) -> str | None:
+        """Path of a known plaintext with this CRC32 and size, if the library has one."""
+        with self._lock:
+            matches = self._by_key.get((crc, size))
+        return os.path.join(self.directory, matches[0]) if matches else None
@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import logging
+import threading
+
+from .hashes import normalize_hash_line
+
+
+class ResultStore:
+    """
+    Case-wide store of recovered secrets, indexed by normalized hash string.
+
+    Backed by an append-only JSON-lines file so results survive between runs
+    and are shared by every engine: a hash cracked once (or present in two
+    evidence files) is never attacked again.
+    """
+
+    def __init__(self, path: str, logger: logging.Logger | None = None):
+        self.path = path
+        self.logger = logger or logging.getLogger("ForensiCrack.Results")
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        # (key, plain) pairs that failed verification; never returned or recorded again
+        self._rejected: set[tuple[str, str]] = set()
+        self._load()
+
+    @staticmethod
+    def key(hash_str: str) -> str:
+        # hashcat re-encodes hex digests in lowercase; match regardless of case
+        return normalize_hash_line(hash_str).lower()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not entry.get("hash") or "plain" not in entry:
+                    continue
+                k = self.key(entry["hash"])
+                if entry.get("rejected"):
+                    self._forget(k, entry["plain"])
+                else:
+                    self._entries[k] = entry
+        self.logger.info(f"Loaded {len(self._entries)} cached result(s) from {self.path}")
+
+    def lookup(self, hash_str: str) -> str | None:
+        entry = self._entries.get(self.key(hash_str))
+        return entry["plain"] if entry else None
+
+    def lookup_many(self, hashes: list[str]) -> dict[str, str]:
+        found = {}
+        for h in hashes:
+            plain = self.lookup(h)
+            if plain is not None:
+                found[h] = plain
+        return found
+
+    def record(self, hash_str: str, plain: str, engine: str, mode=None, source: str = "", wordlist: str | None = None):
+        k = self.key(hash_str)
+        if not k:
+            return
+        entry = {
+            "hash": normalize_hash_line(hash_str),
+            "plain": plain,
+            "engine": engine,
+            "mode": mode,
+            "source": source,
+            "wordlist": wordlist,
+            "time": int(time.time()),
+        }
+        with self._lock:
+            if k in self._entries and self._entries[k]["plain"] == plain or (k, plain) in self._rejected:
+                return
+            self._entries[k] = entry
+            self._append(entry)
+
+    def reject(self, hash_str: str, plain: str):
+        """
+        Drop a recovered plaintext that failed verification (e.g. a ZIP
+        password no member accepts), so it is never served from the cache.
+        """
+        k = self.key(hash_str)
+        if not k:
+            return
+        with self._lock:
+            if (k, plain) in self._rejected:
+                return
+            self._forget(k, plain)
+            self._append({"hash": normalize_hash_line(hash_str), "plain": plain, "rejected": True,
+                          "time": int(time.time())})
+
+    def _forget(self, k: str, plain: str):
+        self._rejected.add((k, plain))
+        if k in self._entries and self._entries[k]["plain"] == plain:
+            del self._entries[k]
+
+    def _append(self, entry: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
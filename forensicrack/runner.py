@@ -0,0 +1,257 @@
+import re
+import json
+import signal
+import time
+import logging
+import threading
+import subprocess
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+def format_eta(seconds: float) -> str:
+    h, rem = divmod(int(seconds), 3600)
+    return f"{h}h{rem // 60:02d}m"
+
+
+@dataclass
+class ProgressEvent:
+    """Machine-readable progress snapshot of one running cracking job."""
+    job: str
+    engine: str
+    status: str = "running"
+    progress: float | None = None      # percent of keyspace done
+    speed: float | None = None         # candidates per second
+    eta: float | None = None           # seconds remaining
+    recovered: int | None = None
+    total: int | None = None
+    raw: dict = field(default_factory=dict)
+
+    def summary(self) -> str:
+        parts = [f"[{self.engine}] {self.job}: {self.status}"]
+        if self.progress is not None:
+            parts.append(f"{self.progress:.2f}%")
+        if self.speed:
+            parts.append(f"{self.speed / 1e6:.2f} MH/s" if self.speed >= 1e6 else f"{self.speed:.0f} H/s")
+        if self.eta is not None:
+            parts.append(f"ETA {format_eta(self.eta)}")
+        if self.recovered is not None:
+            parts.append(f"recovered {self.recovered}" + (f"/{self.total}" if self.total else ""))
+        return " | ".join(parts)
+
+
+@dataclass
+class RunResult:
+    returncode: int
+    tail: list[str]
+    paused: bool = False   # stopped by the time budget; the tool's session can be restored
+    last: ProgressEvent | None = None
+
+
+class ProgressBus:
+    """Fan-out of ProgressEvents to every subscriber (app, logger, GUI...)."""
+
+    def __init__(self, logger: logging.Logger | None = None):
+        self.logger = logger or logging.getLogger("ForensiCrack.Progress")
+        self._subscribers: list[Callable[[ProgressEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ProgressEvent], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: ProgressEvent):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.debug(f"Progress subscriber failed: {e}")
+
+
+# hashcat --status-json "status" codes
+_HASHCAT_STATUS = {
+    0: "init", 1: "autotune", 2: "selftest", 3: "running", 4: "paused",
+    5: "exhausted", 6: "cracked", 7: "aborted", 8: "quit", 9: "bypass",
+    11: "aborted", 12: "aborted", 13: "aborted", 14: "error",
+}
+
+# John status line, e.g.
+# "0g 0:00:01:23 12.34% (ETA: 12:40:01) 0g/s 1234p/s 1234c/s 1234C/s abc..xyz"
+_JOHN_STATUS = re.compile(
+    r"^(?P<guesses>\d+)g\s+(?P<elapsed>\d+:\d{2}:\d{2}:\d{2})\s+"
+    r"(?:(?P<percent>[\d.]+)%\s+)?(?:\(ETA:[^)]*\)\s+)?"
+    r"[\d.]+g/s\s+(?:(?P<pps>[\d.]+[KMG]?)p/s\s+)?(?P<cps>[\d.]+[KMG]?)c/s"
+)
+_SUFFIX = {"K": 1e3, "M": 1e6, "G": 1e9}
+
+
+def _rate(value: str | None) -> float | None:
+    if not value:
+        return None
+    if value[-1] in _SUFFIX:
+        return float(value[:-1]) * _SUFFIX[value[-1]]
+    return float(value)
+
+
+def parse_hashcat_status(line: str, job: str) -> ProgressEvent | None:
+    """Parse one --status-json line."""
+    if not line.startswith("{"):
+        return None
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if "progress" not in data:
+        return None
+
+    done, total = (data.get("progress") or [0, 0])[:2]
+    recovered = data.get("recovered_hashes") or [None, None]
+    speed = sum(d.get("speed", 0) for d in data.get("devices", [])) or None
+    eta = None
+    if data.get("estimated_stop"):
+        eta = max(0.0, data["estimated_stop"] - time.time())
+    return ProgressEvent(
+        job=job,
+        engine="hashcat",
+        status=_HASHCAT_STATUS.get(data.get("status"), "running"),
+        progress=(100.0 * done / total) if total else None,
+        speed=speed,
+        eta=eta,
+        recovered=recovered[0],
+        total=recovered[1],
+        raw=data,
+    )
+
+
+def parse_john_status(line: str, job: str) -> ProgressEvent | None:
+    """Parse one John status line (printed every --progress-every seconds)."""
+    m = _JOHN_STATUS.match(line.strip())
+    if not m:
+        return None
+    d, h, mi, s = (int(x) for x in m.group("elapsed").split(":"))
+    elapsed = ((d * 24 + h) * 60 + mi) * 60 + s
+    percent = float(m.group("percent")) if m.group("percent") else None
+    eta = None
+    if percent:
+        eta = elapsed * (100.0 - percent) / percent
+    return ProgressEvent(
+        job=job,
+        engine="john",
+        progress=percent,
+        speed=_rate(m.group("cps")),
+        eta=eta,
+        recovered=int(m.group("guesses")),
+        raw={"line": line.strip()},
+    )
+
+
+_PARSERS = {
+    "hashcat": parse_hashcat_status,
+    "john": parse_john_status,
+}
+
+
+class StreamingRunner:
+    """
+    Runs a cracking tool and consumes its output incrementally instead of
+    buffering everything with capture_output=True. Status lines become
+    ProgressEvents on the bus; only a short tail of other output is kept.
+    """
+
+    TAIL_LINES = 50
+
+    def __init__(
+        self,
+        bus: ProgressBus | None = None,
+        logger: logging.Logger | None = None,
+        status_timer: int = 30,
+    ):
+        self.bus = bus or ProgressBus(logger)
+        self.logger = logger or logging.getLogger("ForensiCrack.Runner")
+        # Seconds between status lines requested from the tools
+        self.status_timer = status_timer
+        # Global wall-clock deadline (epoch seconds) shared by every job
+        self.deadline: float | None = None
+
+    def set_time_budget(self, seconds: float | None):
+        self.deadline = time.time() + seconds if seconds else None
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def run(
+        self,
+        cmd: list[str],
+        job: str,
+        engine: str,
+        on_line: Callable[[str], None] | None = None,
+        feed: Callable | None = None,
+    ) -> RunResult:
+        """
+        Run `cmd`, publishing its status lines as ProgressEvents. Other output
+        lines go to `on_line`. If `feed` is given it is called in a thread
+        with the tool's binary stdin (e.g. to stream candidates into it).
+        """
+        tail: deque[str] = deque(maxlen=self.TAIL_LINES)
+        parser = _PARSERS.get(engine, lambda line, job: None)
+        if self.expired():
+            self.logger.info(f"Time budget exhausted - not starting {job}")
+            return RunResult(-2, [], paused=True)
+
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if feed else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            bufsize=1,
+        )
+        feeder = None
+        if feed:
+            feeder = threading.Thread(target=feed, args=(proc.stdin.buffer,), daemon=True)
+            feeder.start()
+        # SIGINT makes hashcat and John write their restore point before exiting
+        interrupted = threading.Event()
+        watchdog = None
+        if self.deadline is not None:
+            def _pause():
+                if proc.poll() is None:
+                    interrupted.set()
+                    self.logger.info(f"Time budget reached - pausing {job}")
+                    proc.send_signal(signal.SIGINT)
+            watchdog = threading.Timer(max(0.0, self.deadline - time.time()), _pause)
+            watchdog.daemon = True
+            watchdog.start()
+
+        last = None
+        for line in proc.stdout:
+            line = line.rstrip("\n")
+            event = parser(line, job)
+            if event:
+                last = event
+                self.bus.publish(event)
+                continue
+            if on_line:
+                on_line(line)
+            if line.strip():
+                tail.append(line)
+        returncode = proc.wait()
+        if watchdog:
+            watchdog.cancel()
+        if feeder:
+            feeder.join()
+
+        final = ProgressEvent(job=job, engine=engine, status="paused" if interrupted.is_set() else "finished")
+        if last:
+            final.progress, final.recovered, final.total = last.progress, last.recovered, last.total
+        self.bus.publish(final)
+        return RunResult(returncode, list(tail), paused=interrupted.is_set(), last=last)
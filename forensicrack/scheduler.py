@@ -0,0 +1,117 @@
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+
+class _FairSemaphore:
+    """
+    Counting semaphore that grants slots in request order. A job that
+    releases a slot and asks again right away (e.g. between keyspace
+    chunks) queues behind jobs that were already waiting.
+    """
+
+    def __init__(self, value: int):
+        self._free = value
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            while self._queue[0] is not ticket or not self._free:
+                self._cond.wait()
+            self._queue.popleft()
+            self._free -= 1
+            self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self._free += 1
+            self._cond.notify_all()
+
+
+class EvidenceScheduler:
+    """
+    Bounded worker pool for evidence processing.
+
+    Every engine class (CPU-bound John/zsteg/stegseek, the hashcat device,
+    bkcrack) has its own concurrency limit. Workers only hold an engine slot
+    while that engine is running, so evidence needing different resources
+    runs side by side instead of queueing behind one slow job.
+    """
+
+    def __init__(self, limits: dict[str, int], max_workers: int, logger: logging.Logger | None = None):
+        self.logger = logger or logging.getLogger("ForensiCrack.Scheduler")
+        self.limits = {name: max(1, int(n)) for name, n in limits.items()}
+        self.max_workers = max(1, int(max_workers))
+        self._slots = {name: _FairSemaphore(n) for name, n in self.limits.items()}
+        # Long-lived pool for watch mode (run() uses its own per call)
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, resource: str):
+        """Hold one slot of the given engine class for the duration of the block."""
+        sem = self._slots.get(resource)
+        if sem is None:
+            yield
+            return
+        sem.acquire()
+        try:
+            yield
+        finally:
+            sem.release()
+
+    @staticmethod
+    def _interleave(items: list, resource_of: Callable) -> list:
+        # Round-robin across engine classes so a long run of hashcat-bound
+        # evidence does not occupy every worker ahead of cheap stego jobs.
+        buckets = defaultdict(list)
+        for item in items:
+            buckets[resource_of(item)].append(item)
+        ordered = []
+        queues = list(buckets.values())
+        while any(queues):
+            for queue in queues:
+                if queue:
+                    ordered.append(queue.pop(0))
+        return ordered
+
+    def run(self, items: Iterable, job: Callable, resource_of: Callable) -> list[tuple[object, object]]:
+        """
+        Run job(item) for every item on the worker pool.
+        Returns (item, result) pairs in completion order; a job that raises
+        is logged and reported as False.
+        """
+        ordered = self._interleave(list(items), resource_of)
+        results: list[tuple[object, object]] = []
+        if not ordered:
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="forensicrack") as pool:
+            futures = {pool.submit(job, item): item for item in ordered}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    results.append((item, future.result()))
+                except Exception as e:
+                    self.logger.error(f"Worker failed on {item}: {e}")
+                    results.append((item, False))
+        return results
+
+    def submit(self, job: Callable, item) -> Future:
+        """Run job(item) on a pool that outlives single calls, for work that keeps arriving."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="forensicrack")
+            return self._pool.submit(job, item)
+
+    def shutdown(self, wait: bool = True):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=wait)
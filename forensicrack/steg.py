@@ -1,25 +1,79 @@
 import os
+import re
+import tempfile
 import subprocess
 import logging
 
+from .exhausted import ExhaustedIndex
+from .intake import content_digest
+from .results import ResultStore
+from .streaming import is_stream_source
+
+_PASSPHRASE = re.compile(r'Found passphrase:\s*"(?P<plain>.*)"')
+# stegseek's message after trying every candidate without success
+_NOT_FOUND = re.compile(r"could not find a valid passphrase", re.IGNORECASE)
+
 
 class StegEngine:
-    def __init__(self, logger: logging.Logger | None = None):
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        result_store: ResultStore | None = None,
+        exhausted: ExhaustedIndex | None = None,
+    ):
         self.logger = logger or logging.getLogger("ForensiCrack.Steg")
+        self.result_store = result_store
+        # (carrier, wordlist) sweeps that already ran to the end without a passphrase
+        self.exhausted = exhausted
 
-    def run(self, filepath: str, wordlists: list[str], output_dir: str) -> bool:
-        os.makedirs(output_dir, exist_ok=True)
+    @staticmethod
+    def cache_key(filepath: str, digest: str | None = None) -> str:
+        """
+        Result-store key for a stego carrier: stegseek has no hash, so use
+        the content digest (the evidence fingerprint when the caller has it).
+        """
+        return f"stegseek:{digest or content_digest(filepath)}"
 
-        for wordlist in wordlists:
-            base_name = os.path.splitext(os.path.basename(filepath))[0]
-            output_file = os.path.join(output_dir, f"{base_name}_extracted.out")
+    def run(self, filepath: str, wordlists: list[str], output_dir: str, digest: str | None = None) -> bool:
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(filepath))[0]
+        output_file = os.path.join(output_dir, f"{base_name}_extracted.out")
 
-            cmd = ["stegseek", filepath, wordlist, output_file]
-            self.logger.info(f"Running stegseek: {' '.join(cmd)}")
-            result = subprocess.run(cmd)
-            if result.returncode == 0:
-                self.logger.info(f"Steg success on {filepath} with {wordlist} → {output_file}")
+        key = self.cache_key(filepath, digest) if self.result_store or self.exhausted else None
+        known = self.result_store.lookup(key) if key and self.result_store else None
+        known_list = None
+        if known is not None:
+            if os.path.exists(output_file):
+                self.logger.info(f"Steg passphrase for {filepath} already recovered (case cache) → {output_file}")
                 return True
+            # Re-extract with the cached passphrase instead of sweeping the wordlists
+            fd, known_list = tempfile.mkstemp(suffix=".txt", dir=output_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(known + "\n")
+            wordlists = [known_list] + list(wordlists)
+        elif self.exhausted:
+            wordlists = self.exhausted.untried(wordlists, [key], "stegseek", None, "")
+
+        try:
+            for wordlist in wordlists:
+                if is_stream_source(wordlist):
+                    # stegseek mmaps its wordlist and cannot read a pipe
+                    self.logger.info(f"Skipping streamed wordlist {wordlist} for stegseek")
+                    continue
+                cmd = ["stegseek", filepath, wordlist, output_file]
+                self.logger.info(f"Running stegseek: {' '.join(cmd)}")
+                result = subprocess.run(cmd, capture_output=True, text=True, errors="replace")
+                if result.returncode == 0:
+                    self.logger.info(f"Steg success on {filepath} with {wordlist} → {output_file}")
+                    m = _PASSPHRASE.search((result.stdout or "") + (result.stderr or ""))
+                    if self.result_store and m:
+                        self.result_store.record(key, m.group("plain"), "stegseek", source=filepath)
+                    return True
+                if self.exhausted and _NOT_FOUND.search((result.stdout or "") + (result.stderr or "")):
+                    self.exhausted.mark([key], "stegseek", None, "", [wordlist])
+        finally:
+            if known_list:
+                os.remove(known_list)
 
         self.logger.warning(f"Steg failed for {filepath}")
         return False
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import logging
+import subprocess
+from contextlib import contextmanager
+
+from .hashes import hash_digests
+
+# First volume of a multi-part 7z archive ("RockYou2021.7z.001") or a plain .7z
+_STREAM_SUFFIXES = (".7z", ".7z.001")
+_BLOCK = 1024 * 1024
+
+
+def is_stream_source(path: str) -> bool:
+    """True for wordlists that are decompressed on the fly rather than read from disk."""
+    return path.lower().endswith(_STREAM_SUFFIXES)
+
+
+def _decompress_cmd(path: str) -> list[str]:
+    # 7za picks up .002, .003 ... automatically when given the first volume
+    return ["7za", "e", "-so", path]
+
+
+@contextmanager
+def open_wordlist(path: str):
+    """Open a wordlist for binary line iteration, streaming it out of 7z parts if needed."""
+    if not is_stream_source(path):
+        with open(path, "rb") as f:
+            yield f
+        return
+
+    proc = subprocess.Popen(_decompress_cmd(path), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        yield proc.stdout
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+class CandidateStream:
+    """
+    Pipes candidates from a compressed wordlist into a cracking tool's stdin
+    without the full text ever landing on disk.
+
+    Progress is persisted as a line offset per attack so an interrupted
+    stream continues where it stopped. The offset is only trusted for the
+    same set of target hashes (or a subset of it); new targets start over.
+    """
+
+    # Candidates the consumer may have read but not yet hashed when stopped
+    REWIND_MARGIN = 1_000_000
+    CHECKPOINT_EVERY = 60
+
+    def __init__(self, source: str, state_path: str | None, targets: list[str], logger: logging.Logger | None = None):
+        self.source = source
+        self.state_path = state_path
+        self.logger = logger or logging.getLogger("ForensiCrack.Stream")
+        self.targets = hash_digests(targets)
+        self.written = 0
+        self.exhausted = False
+        self._last_checkpoint = time.time()
+        self.start_offset, self.done = self._load()
+
+    def _load(self) -> tuple[int, bool]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return 0, False
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0, False
+        if state.get("source") != os.path.abspath(self.source) or not set(self.targets) <= set(state.get("targets", [])):
+            return 0, False
+        offset = int(state.get("offset", 0))
+        if offset:
+            self.logger.info(f"Resuming stream of {os.path.basename(self.source)} at line {offset}")
+        return offset, bool(state.get("done"))
+
+    def _save(self, offset: int, done: bool = False):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "source": os.path.abspath(self.source),
+                "offset": offset,
+                "done": done,
+                "targets": self.targets,
+            }, f)
+        os.replace(tmp, self.state_path)
+
+    def feed(self, sink):
+        """Decompress the source and write candidates into `sink` (a binary pipe), skipping the resumed prefix."""
+        proc = subprocess.Popen(_decompress_cmd(self.source), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        to_skip = self.start_offset
+        try:
+            while True:
+                block = proc.stdout.read(_BLOCK)
+                if not block:
+                    self.exhausted = proc.wait() == 0
+                    break
+                if to_skip:
+                    count = block.count(b"\n")
+                    if count < to_skip:
+                        to_skip -= count
+                        continue
+                    pos = -1
+                    for _ in range(to_skip):
+                        pos = block.index(b"\n", pos + 1)
+                    block = block[pos + 1:]
+                    to_skip = 0
+                sink.write(block)
+                self.written += block.count(b"\n")
+                if time.time() - self._last_checkpoint >= self.CHECKPOINT_EVERY:
+                    self._save(self.start_offset + max(0, self.written - self.REWIND_MARGIN))
+                    self._last_checkpoint = time.time()
+        except (BrokenPipeError, ValueError):
+            # Consumer exited (cracked everything, paused or failed)
+            pass
+        finally:
+            try:
+                sink.close()
+            except (BrokenPipeError, OSError):
+                pass
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
+    def finish(self, completed: bool, processed: int | None = None):
+        """
+        Persist the resume point after the consumer exited. `processed` is
+        the consumer's own count of attacked candidates when it reports one
+        (hashcat's status progress in stdin mode).
+        """
+        if completed and self.exhausted:
+            self._save(self.start_offset + self.written, done=True)
+            return
+        if processed is not None:
+            offset = self.start_offset + min(processed, self.written)
+        else:
+            offset = self.start_offset + max(0, self.written - self.REWIND_MARGIN)
+        self._save(offset)
+        self.logger.info(f"Stream of {os.path.basename(self.source)} checkpointed at line {offset}")
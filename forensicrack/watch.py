@@ -0,0 +1,111 @@
+import os
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Callable
+
+# inotify(7) event masks
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_EVENT = struct.Struct("iIII")
+
+
+class InputWatcher:
+    """
+    Reports files that appear or change in a directory.
+
+    Uses inotify on Linux (a file is reported once it is closed after
+    writing or moved in, so half-copied evidence is never picked up; if
+    the kernel queue overflows and events are lost, the directory is
+    rescanned) and falls back to polling with os.scandir elsewhere. When polling, a file
+    is only reported once its size and mtime were stable for one interval.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 5.0, logger: logging.Logger | None = None):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger("ForensiCrack.Watch")
+
+    def run(self, on_file: Callable[[str], None], stop: threading.Event):
+        """Call on_file(path) for every new or changed file until `stop` is set."""
+        fd = self._inotify()
+        if fd is None:
+            self.logger.info(f"Watching {self.directory} by polling every {self.poll_interval:g}s")
+            self._poll(on_file, stop)
+            return
+        self.logger.info(f"Watching {self.directory} with inotify")
+        try:
+            self._read_events(fd, on_file, stop)
+        finally:
+            os.close(fd)
+
+    def _inotify(self) -> int | None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            init = libc.inotify_init1
+        except (OSError, AttributeError):
+            return None
+        fd = init(_IN_NONBLOCK)
+        if fd < 0:
+            return None
+        wd = libc.inotify_add_watch(fd, os.fsencode(self.directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            self.logger.warning(f"inotify_add_watch failed: {os.strerror(ctypes.get_errno())}")
+            os.close(fd)
+            return None
+        return fd
+
+    def _read_events(self, fd: int, on_file: Callable[[str], None], stop: threading.Event):
+        while not stop.is_set():
+            ready, _, _ = select.select([fd], [], [], 1.0)
+            if not ready:
+                continue
+            try:
+                data = os.read(fd, 64 * 1024)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    continue
+                raise
+            pos = 0
+            while pos + _EVENT.size <= len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, pos)
+                name = data[pos + _EVENT.size: pos + _EVENT.size + length].rstrip(b"\0")
+                pos += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    self.logger.warning(f"inotify queue overflowed - rescanning {self.directory}")
+                    self._rescan(on_file)
+                    continue
+                path = os.path.join(self.directory, os.fsdecode(name))
+                if name and os.path.isfile(path):
+                    on_file(path)
+
+    def _rescan(self, on_file: Callable[[str], None]):
+        """Report every file in the directory; the job queue drops versions it already has."""
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            if entry.is_file():
+                on_file(entry.path)
+
+    def _poll(self, on_file: Callable[[str], None], stop: threading.Event):
+        seen: dict[str, tuple[int, int]] = {}
+        settling: dict[str, tuple[int, int]] = {}
+        while not stop.is_set():
+            for entry in os.scandir(self.directory):
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+                state = (st.st_size, st.st_mtime_ns)
+                if seen.get(entry.path) == state:
+                    continue
+                if settling.get(entry.path) == state:
+                    del settling[entry.path]
+                    seen[entry.path] = state
+                    on_file(entry.path)
+                else:
+                    settling[entry.path] = state
+            stop.wait(self.poll_interval)
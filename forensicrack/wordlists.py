@@ -6,11 +6,65 @@ import subprocess
 import sys
 import glob
 
+from .catalog import WordlistCatalog
+from .dedup import TierDeduplicator
+from .streaming import open_wordlist
+
+
+def candidate_bytes(plain: str) -> bytes:
+    """The raw bytes of a cracked plaintext; hashcat writes non-printable ones as $HEX[...]."""
+    if plain.startswith("$HEX[") and plain.endswith("]"):
+        try:
+            return bytes.fromhex(plain[5:-1])
+        except ValueError:
+            pass
+    return plain.encode("utf-8", errors="surrogateescape")
+
+
+def attribute_tiers(plains: list[str], wordlists: list[str]) -> dict[str, str]:
+    """
+    Work out which escalation tier produced each cracked plaintext when
+    several wordlists were attacked in a single hashcat run.
+
+    Tiers are scanned in order and scanning stops as soon as every plaintext
+    is placed, so the largest (last) tier is never read: anything not found
+    in an earlier tier is attributed to it by elimination.
+    """
+    pending: dict[bytes, list[str]] = {}
+    for p in plains:
+        pending.setdefault(candidate_bytes(p), []).append(p)
+    tiers: dict[str, str] = {}
+    for wordlist in wordlists[:-1]:
+        if not pending:
+            break
+        try:
+            with open_wordlist(wordlist) as f:
+                for line in f:
+                    hits = pending.pop(line.rstrip(b"\r\n"), None)
+                    if hits:
+                        tiers.update((plain, wordlist) for plain in hits)
+                        if not pending:
+                            break
+        except OSError:
+            continue
+    if wordlists:
+        for hits in pending.values():
+            tiers.update((plain, wordlists[-1]) for plain in hits)
+    return tiers
+
 
 class WordlistManager:
-    def __init__(self, wordlist_dir: str):
+    def __init__(self, wordlist_dir: str, dedup_ram_limit: int = 512 * 1024 ** 2, stream_rockyou: bool = False):
         self.wordlist_dir = wordlist_dir
         self.logger = logging.getLogger("ForensiCrack.Wordlists")
+        # Feed RockYou2021 straight out of the 7z parts instead of extracting ~100 GB
+        self.stream_rockyou = stream_rockyou
+
+        # Size, line count and fingerprint of each list (sidecar files)
+        self.catalog = WordlistCatalog(self.logger)
+
+        # Cross-tier deduplicated copies (built with --dedup-wordlists)
+        self.dedup = TierDeduplicator(os.path.join(wordlist_dir, "dedup"), dedup_ram_limit, self.logger, self.catalog)
 
         # Standard wordlists
         self.brockyou = os.path.join(wordlist_dir, "brockyou.txt")
@@ -53,6 +107,9 @@ class WordlistManager:
 
         first_part = parts[0]
         part_count = len(parts)
+        if self.stream_rockyou:
+            self.logger.info(f"Streaming RockYou2021 from {part_count} 7z part(s), starting at {first_part}")
+            return first_part
         print(f"\nFound {part_count} RockYou2021 parts. First: {os.path.basename(first_part)}")
 
         # Interactive warning
@@ -125,7 +182,15 @@ Found {part_count} parts. Do you want to extract RockYou2021 now? (Y/N): """
             print("Check files in wordlists/ manually.")
             return None
 
-    def escalating_lists(self):
+    def build_deduplicated_tiers(self) -> list[str]:
+        """Build (or reuse) tier files where each tier only holds candidates unseen in earlier tiers."""
+        lists = self.escalating_lists(use_dedup=False)
+        if not lists:
+            self.logger.error("No wordlists found to deduplicate.")
+            return []
+        return self.dedup.build(lists)
+
+    def escalating_lists(self, use_dedup: bool = True):
         lists = []
 
         if os.path.exists(self.brockyou):
@@ -138,4 +203,20 @@ Found {part_count} parts. Do you want to extract RockYou2021 now? (Y/N): """
         if rockyou_path:
             lists.append(rockyou_path)
 
+        if use_dedup and lists:
+            deduped = self.dedup.cached(lists)
+            if deduped:
+                self.logger.info("Using cross-tier deduplicated wordlists")
+                lists = deduped
+
+        self._log_catalog(lists)
         return lists
+
+    def _log_catalog(self, lists: list[str]):
+        # Only lists that are already cataloged; big ones are scanned when chunking needs them
+        for path in lists:
+            info = self.catalog.get(path, scan=False)
+            if info:
+                self.logger.info(
+                    f"Wordlist {os.path.basename(path)}: {info.lines:,} line(s), {info.size / 1024 ** 2:,.0f} MB"
+                )
@@ -0,0 +1,147 @@
+import os
+import zlib
+import struct
+
+import pytest
+
+
+def build_pdf(objects: dict[int, bytes], trailer: bytes, xref_stream: bool = False, free_entries: int = 0,
+              compress: bool = True) -> bytes:
+    """
+    Minimal PDF: the numbered objects, then a cross-reference table (or an
+    xref stream, Flate-compressed with the PNG Up predictor unless
+    `compress` is False) padded with `free_entries` free entries, and the
+    trailer entries in `trailer`.
+    """
+    out = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+    for number, body in sorted(objects.items()):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    size = max(offsets) + 2 + free_entries
+    xref_offset = len(out)
+    if not xref_stream:
+        out += b"xref\n0 %d\n" % size
+        for number in range(size):
+            if number in offsets:
+                out += b"%010d 00000 n\r\n" % offsets[number]
+            else:
+                out += b"0000000000 65535 f\r\n"
+        out += b"trailer\n<< /Size %d /Root 1 0 R %s >>\n" % (size, trailer)
+    else:
+        number = size - 1
+        offsets[number] = xref_offset
+        rows, previous = bytearray(), bytes(7)
+        for n in range(size):
+            row = bytes([1]) + offsets[n].to_bytes(4, "big") + bytes(2) if n in offsets else bytes(7)
+            if compress:
+                rows += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous))
+            else:
+                rows += row
+            previous = row
+        data = bytes(rows)
+        filters = b""
+        if compress:
+            data = zlib.compress(data)
+            filters = b"/Filter /FlateDecode /DecodeParms << /Columns 7 /Predictor 12 >>"
+        out += b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 4 2] /Root 1 0 R %s %s /Length %d >>\nstream\n" % (
+            number, size, trailer, filters, len(data)
+        )
+        out += data + b"\nendstream\nendobj\n"
+    out += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return bytes(out)
+
+
+def zipcrypto_keys(password: bytes) -> tuple[int, int, int]:
+    """The ZipCrypto internal keys `password` produces (what bkcrack recovers)."""
+    keys = [0x12345678, 0x23456789, 0x34567890]
+    for byte in password:
+        _update_keys(keys, byte)
+    return keys[0], keys[1], keys[2]
+
+
+def _update_keys(keys: list[int], byte: int):
+    keys[0] = zlib.crc32(bytes([byte]), keys[0] ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+    keys[1] = ((keys[1] + (keys[0] & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+    keys[2] = zlib.crc32(bytes([keys[1] >> 24]), keys[2] ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+
+def _zipcrypto_encrypt(password: bytes, data: bytes) -> bytes:
+    keys = list(zipcrypto_keys(password))
+    out = bytearray()
+    for byte in data:
+        temp = (keys[2] | 2) & 0xFFFF
+        out.append(byte ^ ((temp * (temp ^ 1)) >> 8) & 0xFF)
+        _update_keys(keys, byte)
+    return bytes(out)
+
+
+def build_zip(members: list[tuple], password: bytes | None = None) -> bytes:
+    """
+    ZIP of (name, data, deflate[, cipher]) members. The cipher defaults to
+    ZipCrypto with `password` when one is given (check byte from the CRC,
+    no data descriptors), else none; "aes" writes a WinZip AES-256 entry
+    whose header is real but whose data is not (enough for profiling).
+    """
+    out, central = bytearray(), bytearray()
+    for name, data, deflate, *cipher in members:
+        cipher = cipher[0] if cipher else ("zipcrypto" if password is not None else "none")
+        crc = zlib.crc32(data)
+        body = data
+        if deflate:
+            packer = zlib.compressobj(9, zlib.DEFLATED, -15)
+            body = packer.compress(data) + packer.flush()
+        flags, method, extra = 0, 8 if deflate else 0, b""
+        if cipher == "zipcrypto":
+            flags = 1
+            body = _zipcrypto_encrypt(password, bytes(11) + bytes([crc >> 24]) + body)
+        elif cipher == "aes":
+            flags = 1
+            extra = struct.pack("<HHH2sBH", 0x9901, 7, 2, b"AE", 3, method)
+            method = 99
+            body = bytes(16) + bytes(2) + body + bytes(10)
+        fields = struct.pack("<HHHHHIII", 20, flags, method, 0, 0x21, crc, len(body), len(data))
+        encoded = name.encode()
+        central += b"PK\x01\x02" + struct.pack("<H", 20) + fields + struct.pack(
+            "<HHHHHII", len(encoded), len(extra), 0, 0, 0, 0, len(out)
+        ) + encoded + extra
+        out += b"PK\x03\x04" + fields + struct.pack("<HH", len(encoded), len(extra)) + encoded + extra + body
+    end = struct.pack("<4sHHHHIIH", b"PK\x05\x06", 0, 0, len(members), len(members), len(central), len(out), 0)
+    return bytes(out + central + end)
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    def write(name: str, *args, **kwargs) -> str:
+        path = tmp_path / name
+        path.write_bytes(build_pdf(*args, **kwargs))
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def zip_file(tmp_path):
+    def write(name: str, *args, **kwargs) -> str:
+        path = tmp_path / name
+        path.write_bytes(build_zip(*args, **kwargs))
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def app(tmp_path):
+    """ForensiCrackApp whose runtime directories all live under tmp_path."""
+    import logging
+    from forensicrack.app import ForensiCrackApp
+    from forensicrack.config import Config
+
+    config = Config()
+    for name in dir(Config):
+        value = getattr(Config, name)
+        if name.isupper() and isinstance(value, str) and value.startswith(Config.RUNTIME_DIR):
+            setattr(config, name, str(tmp_path / "runtime" / os.path.relpath(value, Config.RUNTIME_DIR)))
+    config.__post_init__()
+    instance = ForensiCrackApp(config, logging.getLogger("ForensiCrack.Test"))
+    yield instance
+    instance._drain_children()
+    instance.ledger.close()
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+
+from forensicrack.hashes import read_hash_lines
+from forensicrack.ledger import JobLedger
+
+PASSWORD = b"hunter2"
+
+
+def _archive(app, zip_file, name="a.zip", members=None):
+    path = zip_file(name, members or [("notes.txt", b"secret notes " * 20, True)], password=PASSWORD)
+    evidence = app._identify(path)
+    assert app._triage(evidence) == app.INDIVIDUAL
+    return evidence
+
+
+def _hashcat_reports(app, plain):
+    """Stand-in for a hashcat run that 'cracks' every hash as `plain`."""
+    def crack_hashfile(hashfile, mode, wordlists, output_path):
+        for h in read_hash_lines(hashfile):
+            app.result_store.record(h, plain, "hashcat", mode)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("".join(f"{h}:{plain}\n" for h in read_hash_lines(hashfile)))
+        return True
+    app.hashcat_engine.crack_hashfile = crack_hashfile
+
+
+def _attempts(app, evidence):
+    with app.ledger._lock:
+        return app.ledger._db.execute(
+            "SELECT engine, status FROM attempts WHERE evidence = ? AND engine != 'bkcrack'",
+            (evidence.metadata["fingerprint"],),
+        ).fetchall()
+
+
+def test_rejected_password_is_never_recorded(app, zip_file):
+    evidence = _archive(app, zip_file)
+    _hashcat_reports(app, "collision")
+    app.john_engine.crack = lambda *args: pytest.fail("John ran on a rejected password")
+
+    assert not app._handle_archive(evidence, [])
+    hashes = read_hash_lines(os.path.join(app.config.CRACKED_OUTPUT_DIR, "a.zip.hash"))
+    assert app.result_store.lookup_many(hashes) == {}
+    assert app.ledger.results(evidence.metadata["fingerprint"]) == {}
+    assert not os.path.exists(os.path.join(app.config.CRACKED_OUTPUT_DIR, "a.zip.pot"))
+    assert _attempts(app, evidence) == [("hashcat", JobLedger.FAILED)]
+
+
+def test_rejection_survives_a_restart(app, zip_file):
+    from forensicrack.results import ResultStore
+
+    app.result_store.record("aa" * 16, "wrong", "hashcat")
+    app.result_store.reject("aa" * 16, "wrong")
+    app.result_store.record("aa" * 16, "wrong", "john")
+    reloaded = ResultStore(app.config.RESULT_STORE)
+    assert reloaded.lookup("aa" * 16) is None
+    reloaded.record("aa" * 16, "right", "john")
+    assert ResultStore(app.config.RESULT_STORE).lookup("AA" * 16) == "right"
+
+
+def test_verified_password_is_recorded(app, zip_file):
+    evidence = _archive(app, zip_file)
+    _hashcat_reports(app, PASSWORD.decode())
+
+    assert app._handle_archive(evidence, [])
+    assert set(app.ledger.results(evidence.metadata["fingerprint"]).values()) == {PASSWORD.decode()}
+    assert os.path.exists(os.path.join(app.config.CRACKED_OUTPUT_DIR, "a.zip.pot"))
+    assert _attempts(app, evidence) == [("hashcat", JobLedger.CRACKED)]
+    # Unpacked and queued as child evidence
+    with open(os.path.join(app._extraction_dir(evidence), "notes.txt"), "rb") as f:
+        assert f.read() == b"secret notes " * 20
+    assert len(app._children) == 1
+
+
+def test_batch_verifies_before_recording(app, zip_file):
+    evidence = _archive(app, zip_file)
+    job = app._prepare_hash_job(evidence, app._resolve_mode(evidence))
+    app.hashcat_engine.crack_batch = lambda owners, mode, wordlists, work_dir: {
+        evidence.path: [type("Cracked", (), {"hash": job.hashes[0], "plaintext": "collision"})()]
+    }
+
+    assert app._run_hash_batch([job], []) == {evidence.path: False}
+    assert app.ledger.results(evidence.metadata["fingerprint"]) == {}
+    assert not os.path.exists(job.output_path)
+    assert _attempts(app, evidence) == [("hashcat", JobLedger.FAILED)]
+
+
+def test_mixed_zip_fallback_attacks_the_mode_its_hash_names(app, zip_file):
+    evidence = _archive(app, zip_file, "mixed.zip", [
+        ("aes.txt", b"x" * 20, False, "aes"),
+        ("secret.txt", b"zipcrypto " * 10, True),
+    ])
+    # A hash of the AES entry, as an older run (or zip2john) left it
+    aes = next(m for m in app.archive_engine.zip_members(evidence.path) if m.encryption == "aes")
+    assert app.hash_extractor.extract(evidence.path, ".zip", aes)[0].startswith("$zip2$")
+    modes = []
+    app.hashcat_engine.crack_hashfile = lambda hashfile, mode, wordlists, output_path: modes.append(mode)
+    app.john_engine.crack = lambda *args: False
+
+    assert not app._handle_archive(evidence, [])
+    assert modes == [13600]
+
+
+def test_batch_unpacks_an_archive_john_cracked(app, zip_file):
+    evidence = _archive(app, zip_file)
+    job = app._prepare_hash_job(evidence, app._resolve_mode(evidence))
+    app.hashcat_engine.crack_batch = lambda owners, mode, wordlists, work_dir: {}
+
+    def john(hashfile, wordlists, output_path):
+        for h in read_hash_lines(hashfile):
+            app.result_store.record(h, PASSWORD.decode(), "john")
+        return True
+    app.john_engine.crack = john
+
+    assert app._run_hash_batch([job], []) == {evidence.path: True}
+    assert os.listdir(app._extraction_dir(evidence)) == ["notes.txt"]
+    assert len(app._children) == 1
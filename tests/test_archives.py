@@ -0,0 +1,213 @@
+import os
+import zlib
+import random
+
+from conftest import build_zip, zipcrypto_keys
+
+from forensicrack import archives
+from forensicrack.archives import ArchiveEngine, _zipcrypto_decrypt, profile_zip
+from forensicrack.wordlists import candidate_bytes
+
+# Latin-1 "päss": not valid UTF-8, so hashcat writes it as $HEX[...]
+PASSWORD = b"p\xe4ss"
+
+
+def _engine(tmp_path):
+    return ArchiveEngine(str(tmp_path / "archives"), str(tmp_path / "plaintexts"))
+
+
+def test_hex_encoded_password_opens_the_archive(tmp_path, zip_file):
+    path = zip_file("a.zip", [("notes.txt", b"secret notes " * 20, True), ("raw.bin", bytes(range(256)), False)],
+                    password=PASSWORD)
+    password = candidate_bytes("$HEX[" + PASSWORD.hex() + "]")
+    assert _engine(tmp_path).verify_password(path, password) == {"notes.txt": True, "raw.bin": True}
+
+
+def test_wrong_password_opens_nothing(tmp_path, zip_file):
+    path = zip_file("a.zip", [("notes.txt", b"secret notes " * 20, True)], password=PASSWORD)
+    # The literal $HEX[...] text is not the password
+    literal = ("$HEX[" + PASSWORD.hex() + "]").encode()
+    assert _engine(tmp_path).verify_password(path, literal) == {"notes.txt": False}
+
+
+def _wrong_keys_passing_check_byte(path, member_offset, check):
+    """Keys of some other password whose decrypted check byte still matches."""
+    with open(path, "rb") as f:
+        f.seek(member_offset)
+        local = f.read(30)
+        name_len = int.from_bytes(local[26:28], "little")
+        f.seek(member_offset + 30 + name_len)
+        header = f.read(12)
+    for n in range(100_000):
+        keys = zipcrypto_keys(b"wrong%d" % n)
+        if _zipcrypto_decrypt(keys, header)[11] == check:
+            return keys
+    raise AssertionError("no colliding password found")
+
+
+def test_cached_keys_open_a_small_member(tmp_path, zip_file):
+    path = zip_file("a.zip", [("notes.txt", b"secret notes " * 20, True)], password=PASSWORD)
+    engine = _engine(tmp_path)
+    assert engine.keys_open(path, zipcrypto_keys(PASSWORD))
+    assert not engine.keys_open(path, zipcrypto_keys(b"other"))
+
+
+def test_large_member_needs_more_than_its_check_byte(tmp_path, zip_file):
+    data = random.Random(0).randbytes(200_000)
+    path = zip_file("big.zip", [("big.bin", data, True)], password=PASSWORD)
+    engine = _engine(tmp_path)
+    assert engine.keys_open(path, zipcrypto_keys(PASSWORD))
+    impostor = _wrong_keys_passing_check_byte(path, 0, zlib.crc32(data) >> 24)
+    assert not engine.keys_open(path, impostor)
+
+
+def test_large_stored_members_need_several_check_bytes(tmp_path, zip_file):
+    members = [(f"part{n}.bin", random.Random(n).randbytes(100_000), False) for n in range(3)]
+    keys = zipcrypto_keys(PASSWORD)
+    engine = _engine(tmp_path)
+    assert engine.keys_open(zip_file("three.zip", members, password=PASSWORD), keys)
+    # One check byte alone proves nothing; bkcrack runs instead
+    assert not engine.keys_open(zip_file("one.zip", members[:1], password=PASSWORD), keys)
+
+
+def test_known_plaintext_only_for_stored_entries(tmp_path, zip_file):
+    engine = _engine(tmp_path)
+    text = b"a known plaintext file, long enough for bkcrack"
+    (tmp_path / "plaintexts" / "library.txt").write_bytes(text)
+    deflated = zip_file("deflated.zip", [("doc.txt", text, True)], password=PASSWORD)
+    assert engine.find_matching_plaintext(deflated) == (None, None)
+    stored = zip_file("stored.zip", [("doc.txt", text, False)], password=PASSWORD)
+    assert engine.find_matching_plaintext(stored) == (str(tmp_path / "plaintexts" / "library.txt"), "doc.txt")
+
+
+def test_profile_reads_every_entry_from_the_central_directory(tmp_path, zip_file):
+    path = zip_file("mixed.zip", [
+        ("readme.txt", b"plain text " * 10, True, "none"),
+        ("secret.txt", b"zipcrypto " * 10, True),
+        ("vault.bin", b"aes data " * 10, False, "aes"),
+    ], password=PASSWORD)
+    profile = profile_zip(path)
+    assert [(m.name, m.encryption) for m in profile.members] == [
+        ("readme.txt", "none"), ("secret.txt", "zipcrypto"), ("vault.bin", "aes"),
+    ]
+    vault = profile.members[2]
+    assert (vault.cipher, vault.method, vault.size, vault.crc) == ("AES-256", 0, 90, zlib.crc32(b"aes data " * 10))
+    assert profile.encryption == "mixed"
+    assert profile_zip(zip_file("plain.zip", [("a.txt", b"a", False)])).encryption is None
+
+
+def test_profile_offsets_account_for_a_prefixed_stub(tmp_path):
+    path = tmp_path / "sfx.exe"
+    path.write_bytes(b"MZ" + bytes(1000) + build_zip([("a.txt", b"data " * 10, False)], password=PASSWORD))
+    member = profile_zip(str(path)).members[0]
+    assert member.offset == 1002
+    assert _engine(tmp_path).verify_password(str(path), PASSWORD) == {"a.txt": True}
+
+
+def test_cheapest_member_prefers_small_stored_zipcrypto(tmp_path, zip_file):
+    path = zip_file("many.zip", [
+        ("big.txt", b"large member " * 5000, True),
+        ("aes.txt", b"x" * 20, False, "aes"),
+        ("small.bin", b"y" * 40, False),
+        ("small.txt", b"z" * 40, True),
+    ], password=PASSWORD)
+    engine = _engine(tmp_path)
+    assert engine.cheapest_member(path).name == "small.bin"
+    assert [m.name for m in engine.zip_members(path)][-1] == "aes.txt"
+
+
+def test_cheapest_member_of_an_unencrypted_zip(tmp_path, zip_file):
+    assert _engine(tmp_path).cheapest_member(zip_file("plain.zip", [("a.txt", b"a", False)])) is None
+
+
+def test_cheapest_member_of_one_cipher(tmp_path, zip_file):
+    path = zip_file("mixed.zip", [
+        ("aes.txt", b"x" * 20, False, "aes"),
+        ("secret.txt", b"zipcrypto " * 10, True),
+    ], password=PASSWORD)
+    engine = _engine(tmp_path)
+    assert engine.cheapest_member(path, "zipcrypto").name == "secret.txt"
+    assert engine.cheapest_member(path, "aes").name == "aes.txt"
+    assert engine.cheapest_member(path, "strong") is None
+
+
+def _extractor(tmp_path, **ceilings):
+    return ArchiveEngine(str(tmp_path / "archives"), str(tmp_path / "plaintexts"), **ceilings)
+
+
+def test_extraction_refuses_likely_bombs(tmp_path, zip_file):
+    path = zip_file("bomb.zip", [
+        ("zeros.bin", bytes(100_000), True),       # ~1000:1
+        ("text.txt", b"varied text " * 20, True),
+        ("raw.bin", random.Random(1).randbytes(3000), False),
+        ("../escape.txt", b"outside", False),
+    ])
+    out_dir = _extractor(tmp_path, max_extract_ratio=50).extract_to_archive_dir(path)
+    assert sorted(os.listdir(out_dir)) == ["raw.bin", "text.txt"]
+    assert not (tmp_path / "archives" / "escape.txt").exists()
+
+
+def test_extraction_stops_at_the_size_and_member_ceilings(tmp_path, zip_file):
+    members = [(f"part{n}.bin", random.Random(n).randbytes(1000), False) for n in range(4)]
+    path = zip_file("parts.zip", members)
+    assert sorted(os.listdir(_extractor(tmp_path, max_extract_bytes=2500).extract_to_archive_dir(path))) == [
+        "part0.bin", "part1.bin",
+    ]
+    other = tmp_path / "other"
+    other.mkdir()
+    assert sorted(os.listdir(_extractor(other, max_extract_members=3).extract_to_archive_dir(path))) == [
+        "part0.bin", "part1.bin", "part2.bin",
+    ]
+
+
+def test_re_extraction_leaves_unchanged_members_alone(tmp_path, zip_file):
+    path = zip_file("a.zip", [("a.txt", b"alpha " * 10, True), ("b.txt", b"beta " * 10, True)])
+    engine = _extractor(tmp_path)
+    out_dir = engine.extract_to_archive_dir(path)
+    before = os.stat(os.path.join(out_dir, "a.txt")).st_mtime_ns
+    os.remove(os.path.join(out_dir, "b.txt"))
+    engine.extract_to_archive_dir(path)
+    assert os.stat(os.path.join(out_dir, "a.txt")).st_mtime_ns == before
+    with open(os.path.join(out_dir, "b.txt"), "rb") as f:
+        assert f.read() == b"beta " * 10
+
+
+def test_partial_plaintext_offsets_from_file_headers(tmp_path, zip_file):
+    png = b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR" + bytes(100)
+    pdf = b"%PDF-1.7\n" + bytes(200) + b"%%EOF\n"
+    path = zip_file("loot.zip", [
+        ("image.png", png, False),
+        ("doc.pdf", pdf, False),
+        ("deflated.png", png, True),    # compressed bytes are not the header
+        ("tiny.pdf", b"%PDF-1", False),     # too short for the header
+    ], password=PASSWORD)
+    attacks = ArchiveEngine(str(tmp_path / "archives"), str(tmp_path / "plaintexts"),
+                            bkcrack_max_attacks=3).format_plaintexts(path)
+    assert attacks == [
+        ["-c", "image.png", "-x", "0", png[:16].hex()],
+        ["-c", "doc.pdf", "-x", "0", b"%PDF-1.7".hex(), "-x", str(len(pdf) - 6), b"%%EOF\n".hex()],
+        ["-c", "doc.pdf", "-x", "0", b"%PDF-1.4".hex(), "-x", str(len(pdf) - 6), b"%%EOF\n".hex()],
+    ]
+
+
+def test_parallel_bkcrack_attacks_split_the_threads(tmp_path, monkeypatch):
+    commands = []
+
+    class _Bkcrack:
+        def __init__(self, cmd, **kwargs):
+            commands.append(cmd)
+            self.returncode = 0 if "win.png" in cmd else 1
+
+        def communicate(self):
+            keys = "Keys: 12345678 9abcdef0 0fedcba9\n" if self.returncode == 0 else ""
+            return keys, "" if keys else "no solution"
+
+        def kill(self):
+            pass
+
+    monkeypatch.setattr(archives.subprocess, "Popen", _Bkcrack)
+    engine = ArchiveEngine(str(tmp_path / "archives"), str(tmp_path / "plaintexts"),
+                           bkcrack_threads=8, bkcrack_parallel=2)
+    keys = engine._bkcrack_attacks("a.zip", [["-c", "miss.png"], ["-c", "win.png"]])
+    assert keys == (0x12345678, 0x9abcdef0, 0x0fedcba9)
+    assert sorted(cmd[cmd.index("-j") + 1] for cmd in commands) == ["4", "4"]
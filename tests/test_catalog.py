@@ -0,0 +1,105 @@
+import os
+import json
+import threading
+
+import pytest
+
+from forensicrack.catalog import WordlistCatalog
+
+
+def _scans(catalog):
+    """Count _scan calls on `catalog`."""
+    calls = []
+    scan = catalog._scan
+
+    def counted(key, st, resume=None):
+        calls.append(resume is not None)
+        return scan(key, st, resume)
+
+    catalog._scan = counted
+    return calls
+
+
+def test_scan_counts_lines_and_lengths(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"a\nbb\nccc\n" + b"x" * 100 + b"\nlast")
+    info = WordlistCatalog().get(str(path))
+    assert info.lines == 5
+    assert info.lengths == {1: 1, 2: 1, 3: 1, 4: 1, 64: 1}
+
+
+def test_sidecar_is_reused_until_the_list_changes(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"alpha\nbeta\n")
+    first = WordlistCatalog().get(str(path))
+    sidecar = WordlistCatalog.sidecar_path(str(path))
+    assert json.load(open(sidecar))["fingerprint"] == first.fingerprint
+
+    # A new catalog (next run) only stats the file
+    catalog = WordlistCatalog()
+    calls = _scans(catalog)
+    assert catalog.get(str(path)).fingerprint == first.fingerprint
+    assert calls == []
+
+    path.write_bytes(b"gamma\ndelta\n")
+    os.utime(path, ns=(1, 1))
+    assert catalog.get(str(path), scan=False) is None
+    changed = catalog.get(str(path))
+    assert calls == [False]
+    assert changed.fingerprint != first.fingerprint
+
+
+def test_appended_list_scans_only_the_tail(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"alpha\nbeta\n")
+    catalog = WordlistCatalog()
+    before = catalog.get(str(path))
+    with open(path, "ab") as f:
+        f.write(b"gamma\n")
+    calls = _scans(catalog)
+    info = catalog.get(str(path))
+    assert calls == [True]
+    assert (info.lines, info.lengths) == (3, {4: 1, 5: 2})
+    assert info.fingerprint != before.fingerprint
+
+
+def test_concurrent_lookups_scan_once(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"alpha\nbeta\n")
+    other = tmp_path / "other.txt"
+    other.write_bytes(b"one\n")
+    catalog = WordlistCatalog()
+    catalog.get(str(other))
+    started, release = threading.Event(), threading.Event()
+    scan = catalog._scan
+
+    def slow(key, st, resume=None):
+        started.set()
+        release.wait(5)
+        return scan(key, st, resume)
+
+    catalog._scan = slow
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(catalog.get(str(path)))) for _ in range(2)]
+    for t in threads:
+        t.start()
+    assert started.wait(5)
+    # Other lists are served while the scan runs
+    assert catalog.get(str(other)).lines == 1
+    catalog._scan = lambda *args: pytest.fail("second scan of the same list")
+    release.set()
+    for t in threads:
+        t.join()
+    assert [info.lines for info in results] == [2, 2]
+
+
+def test_set_fingerprint_does_not_scan(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"alpha\n")
+    catalog = WordlistCatalog()
+    calls = _scans(catalog)
+    before = catalog.set_fingerprint([str(path)])
+    assert calls == []
+    assert catalog.set_fingerprint([str(path)]) == before
+    path.write_bytes(b"alpha\nbeta\n")
+    assert catalog.set_fingerprint([str(path)]) != before
@@ -0,0 +1,52 @@
+from forensicrack.chunks import ChunkLedger, plan_chunks
+
+CHUNKS = [(0, 100), (100, 100), (200, None)]
+
+
+def test_plan_chunks_leaves_the_last_one_open():
+    assert plan_chunks(250, 100, 8) == CHUNKS
+    assert plan_chunks(1000, 10, 4) == [(0, 250), (250, 250), (500, 250), (750, None)]
+    assert plan_chunks(0, 100, 4) == [(0, None)]
+
+
+def test_rerun_attacks_only_unfinished_chunks(tmp_path):
+    path = str(tmp_path / "attack.chunks.json")
+    ledger = ChunkLedger(path, "wordlist-v1", CHUNKS, ["h1", "h2"])
+    ledger.mark(0, ChunkLedger.DONE)
+    ledger.mark(1, ChunkLedger.FAILED)
+    rerun = ChunkLedger(path, "wordlist-v1", CHUNKS, ["h1", "h2"])
+    assert rerun.pending() == [(1, 100, 100), (2, 200, None)]
+    assert rerun.summary() == "1/3 chunk(s) done, 1 failed"
+    # A subset of the targets still trusts the saved progress
+    assert ChunkLedger(path, "wordlist-v1", CHUNKS, ["h2"]).pending() == rerun.pending()
+
+
+def test_saved_progress_is_dropped_when_the_attack_changes(tmp_path):
+    path = str(tmp_path / "attack.chunks.json")
+    ChunkLedger(path, "wordlist-v1", CHUNKS, ["h1"]).mark(0, ChunkLedger.DONE)
+    assert len(ChunkLedger(path, "wordlist-v2", CHUNKS, ["h1"]).pending()) == 3
+    assert len(ChunkLedger(path, "wordlist-v1", plan_chunks(250, 50, 8), ["h1"]).pending()) == 5
+    assert len(ChunkLedger(path, "wordlist-v1", CHUNKS, ["h1", "h3"]).pending()) == 3
+
+
+def _engine(counts):
+    from forensicrack.cracking_hashcat import HashcatEngine
+
+    engine = HashcatEngine(chunk_min_lines=2, chunk_count=2)
+    engine._count_keyspace = lambda wordlist: counts.pop(0)
+    return engine
+
+
+def test_chunks_follow_the_keyspace_hashcat_reports(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("".join(f"word{n}\n" for n in range(10)))
+    counts = [8]
+    assert _engine(counts)._chunk_plan([str(wordlist)]) == [(0, 4), (4, None)]
+    # Asked once per version of the list; later runs read it from the sidecar
+    assert _engine([])._chunk_plan([str(wordlist)]) == [(0, 4), (4, None)]
+
+
+def test_chunks_fall_back_to_the_line_count(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("".join(f"word{n}\n" for n in range(10)))
+    assert _engine([None])._chunk_plan([str(wordlist)]) == [(0, 5), (5, None)]
@@ -0,0 +1,34 @@
+from forensicrack.dedup import TierDeduplicator
+
+
+def _write(path, lines):
+    path.write_bytes(b"".join(line + b"\n" for line in lines))
+    return str(path)
+
+
+def test_later_tiers_keep_only_new_candidates(tmp_path):
+    first = _write(tmp_path / "brockyou.txt", [b"alpha", b"beta", b"alpha"])
+    second = _write(tmp_path / "passphrases.txt", [b"beta", b"gamma", b"delta", b"gamma"])
+    # A tiny RAM ceiling forces several sorted runs
+    dedup = TierDeduplicator(str(tmp_path / "dedup"), ram_limit=256)
+    outputs = dedup.build([first, second])
+    assert [open(p, "rb").read().split() for p in outputs] == [[b"alpha", b"beta"], [b"gamma", b"delta"]]
+    assert dedup.cached([first, second]) == outputs
+
+
+def test_streamed_tier_is_passed_through_unread(tmp_path):
+    first = _write(tmp_path / "brockyou.txt", [b"alpha", b"alpha"])
+    # Not a real archive: it would fail if the deduplicator tried to stream it
+    streamed = tmp_path / "RockYou2021.7z.001"
+    streamed.write_bytes(b"not a 7z archive")
+    outputs = TierDeduplicator(str(tmp_path / "dedup"), ram_limit=1024).build([first, str(streamed)])
+    assert outputs[1] == str(streamed)
+    assert open(outputs[0], "rb").read() == b"alpha\n"
+
+
+def test_cache_is_invalidated_when_a_source_changes(tmp_path):
+    first = _write(tmp_path / "brockyou.txt", [b"alpha"])
+    dedup = TierDeduplicator(str(tmp_path / "dedup"), ram_limit=1024)
+    dedup.build([first])
+    _write(tmp_path / "brockyou.txt", [b"alpha", b"omega"])
+    assert dedup.cached([first]) is None
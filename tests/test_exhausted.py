@@ -0,0 +1,49 @@
+import os
+
+from forensicrack.exhausted import ExhaustedIndex
+
+STRAIGHT = "-a 0"
+
+
+def _lists(tmp_path):
+    paths = []
+    for name in ("tier1.txt", "tier2.txt"):
+        path = tmp_path / name
+        path.write_text(f"{name}-word\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_exhausted_wordlists_are_skipped_for_the_same_targets(tmp_path):
+    tier1, tier2 = _lists(tmp_path)
+    index = ExhaustedIndex(str(tmp_path / "case_exhausted.jsonl"))
+    index.mark(["AA" * 16, "bb" * 16], "hashcat", 1000, STRAIGHT, [tier1])
+
+    assert index.untried([tier1, tier2], ["aa" * 16, "bb" * 16], "hashcat", 1000, STRAIGHT) == [tier2]
+    # One target that has not seen tier1 keeps it in the run
+    assert index.untried([tier1, tier2], ["aa" * 16, "cc" * 16], "hashcat", 1000, STRAIGHT) == [tier1, tier2]
+    # Another engine, mode or attack is another key
+    assert index.untried([tier1], ["aa" * 16], "john", 1000, STRAIGHT) == [tier1]
+    assert index.untried([tier1], ["aa" * 16], "hashcat", 0, STRAIGHT) == [tier1]
+    assert index.untried([tier1], ["aa" * 16], "hashcat", 1000, "-a 0 -r best64.rule") == [tier1]
+    assert index.untried([tier1], [], "hashcat", 1000, STRAIGHT) == [tier1]
+
+
+def test_marks_persist_and_are_written_once(tmp_path):
+    tier1, _ = _lists(tmp_path)
+    path = tmp_path / "case_exhausted.jsonl"
+    ExhaustedIndex(str(path)).mark(["aa" * 16], "hashcat", 1000, STRAIGHT, [tier1])
+    reloaded = ExhaustedIndex(str(path))
+    reloaded.mark(["aa" * 16], "hashcat", 1000, STRAIGHT, [tier1])
+    assert len(path.read_text().splitlines()) == 1
+    assert reloaded.untried([tier1], ["aa" * 16], "hashcat", 1000, STRAIGHT) == []
+
+
+def test_editing_a_wordlist_makes_it_eligible_again(tmp_path):
+    tier1, _ = _lists(tmp_path)
+    index = ExhaustedIndex(str(tmp_path / "case_exhausted.jsonl"))
+    index.mark(["aa" * 16], "hashcat", 1000, STRAIGHT, [tier1])
+    with open(tier1, "a") as f:
+        f.write("new-word\n")
+    os.utime(tier1, ns=(1, 1))
+    assert index.untried([tier1], ["aa" * 16], "hashcat", 1000, STRAIGHT) == [tier1]
@@ -0,0 +1,31 @@
+from forensicrack.expansion import ExpansionBudget
+
+
+def _file(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(bytes(size))
+    return str(path)
+
+
+def test_files_past_the_count_or_byte_limit_are_refused(tmp_path):
+    budget = ExpansionBudget(max_depth=3, max_files=2, max_bytes=100)
+    assert budget.admit(_file(tmp_path, "a", 60))
+    # Would take the total past max_bytes
+    assert not budget.admit(_file(tmp_path, "b", 50))
+    assert budget.admit(_file(tmp_path, "c", 40))
+    # Would take the count past max_files
+    assert not budget.admit(_file(tmp_path, "d", 0))
+    assert (budget.files, budget.bytes) == (2, 100)
+
+
+def test_missing_file_is_not_admitted(tmp_path):
+    budget = ExpansionBudget(max_depth=3, max_files=10, max_bytes=100)
+    assert not budget.admit(str(tmp_path / "gone"))
+    assert budget.files == 0
+
+
+def test_content_is_visited_once_per_run():
+    budget = ExpansionBudget(max_depth=3, max_files=10, max_bytes=100)
+    assert budget.first_visit("digest")
+    assert not budget.first_visit("digest")
+    assert budget.first_visit("other")
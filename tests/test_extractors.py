@@ -0,0 +1,146 @@
+import zlib
+import base64
+import struct
+
+from conftest import build_pdf, build_zip
+
+from forensicrack.extractors import HashExtractor
+
+FILE_ID = "c5174fa9725b1d46577e489d0eac6751"
+ID = b"/ID [<%s><%s>]" % (FILE_ID.encode(), FILE_ID.encode())
+OWNER, USER = "11" * 32, "22" * 32
+ENCRYPT = b"<< /Filter /Standard /V 2 /R 3 /Length 128 /P -1028 /O <%s> /U <%s> >>" % (OWNER.encode(), USER.encode())
+PDF_HASH = f"$pdf$2*3*128*-1028*1*16*{FILE_ID}*32*{USER}*32*{OWNER}"
+OBJECTS = {1: b"<< /Type /Catalog >>", 5: ENCRYPT}
+
+
+def _extract(path, ext):
+    return HashExtractor().extract(str(path), ext)
+
+
+def test_pdf_with_an_xref_table(pdf_file):
+    assert _extract(pdf_file("a.pdf", OBJECTS, b"/Encrypt 5 0 R " + ID), ".pdf") == [PDF_HASH]
+
+
+def test_pdf_with_a_compressed_xref_stream(pdf_file):
+    path = pdf_file("a.pdf", OBJECTS, b"/Encrypt 5 0 R " + ID, xref_stream=True, free_entries=40)
+    assert _extract(path, ".pdf") == [PDF_HASH]
+
+
+def test_pdf_with_an_inline_encryption_dictionary(pdf_file):
+    assert _extract(pdf_file("a.pdf", {1: OBJECTS[1]}, b"/Encrypt " + ENCRYPT + b" " + ID), ".pdf") == [PDF_HASH]
+
+
+def test_pdf_incremental_update_uses_the_newest_section(tmp_path):
+    original = build_pdf(OBJECTS, b"/Encrypt 5 0 R " + ID)
+    previous = int(original.rsplit(b"startxref", 1)[1].split()[0])
+    update = bytearray(original)
+    # The update replaces object 5; the trailer still carries /Encrypt, as PDF requires
+    replaced = ENCRYPT.replace(b"/P -1028", b"/P -4")
+    object_offset = len(update)
+    update += b"5 0 obj\n" + replaced + b"\nendobj\n"
+    xref_offset = len(update)
+    update += b"xref\n5 1\n%010d 00000 n\r\n" % object_offset
+    update += b"trailer\n<< /Size 7 /Root 1 0 R /Encrypt 5 0 R %s /Prev %d >>\n" % (ID, previous)
+    update += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    path = tmp_path / "updated.pdf"
+    path.write_bytes(bytes(update))
+    assert _extract(path, ".pdf") == [PDF_HASH.replace("*-1028*", "*-4*")]
+
+
+def test_pdf_without_encrypt_or_with_a_bad_offset_falls_back(pdf_file, tmp_path):
+    assert _extract(pdf_file("plain.pdf", {1: OBJECTS[1]}, ID), ".pdf") is None
+    # The xref entry of object 5 now points at another object
+    broken = build_pdf(OBJECTS, b"/Encrypt 5 0 R " + ID).replace(b"5 0 obj", b"6 0 obj")
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(broken)
+    assert _extract(path, ".pdf") is None
+
+
+def test_zipcrypto_member_as_pkzip2(tmp_path, zip_file):
+    data = b"secret notes " * 20
+    path = zip_file("a.zip", [("notes.txt", data, False)], password=b"pw")
+    raw = open(path, "rb").read()
+    encrypted = raw[30 + len("notes.txt"): 30 + len("notes.txt") + 12 + len(data)]
+    crc = zlib.crc32(data)
+    assert _extract(path, ".zip") == [
+        f"$pkzip2$1*2*2*0*{12 + len(data):x}*{len(data):x}*{crc:x}*0*27*0*{12 + len(data):x}"
+        f"*{crc >> 16:04x}*0000*{encrypted.hex()}*$/pkzip2$"
+    ]
+
+
+def test_aes_member_as_zip2(tmp_path, zip_file):
+    path = zip_file("a.zip", [("vault.bin", b"payload", False, "aes")])
+    assert _extract(path, ".zip") == [f"$zip2$*0*3*0*{bytes(16).hex()}*0000*7*{b'payload'.hex()}*{bytes(10).hex()}*$/zip2$"]
+
+
+def _sevenzip(packed: bytes, unpacked_size: int, crc: int, iv: bytes) -> bytes:
+    """7z whose one folder is LZMA2 behind 7zAES (2^19 rounds, no salt), with a plain header."""
+    header = bytes([0x01, 0x04, 0x06, 0, 1, 0x09, len(packed), 0, 0x07, 0x0B, 1, 0, 2])
+    header += bytes([0x21, 0x21, 1, 0x18])
+    header += bytes([0x24]) + b"\x06\xf1\x07\x01" + bytes([2 + len(iv), 0x40 | 19, len(iv) - 1]) + iv
+    header += bytes([0, 1, 0x0C, unpacked_size, len(packed), 0x0A, 1]) + struct.pack("<I", crc)
+    header += bytes([0, 0, 0])
+    start = struct.pack("<QQI", len(packed), len(header), zlib.crc32(header))
+    return b"7z\xbc\xaf\x27\x1c\x00\x04" + struct.pack("<I", zlib.crc32(start)) + start + packed + header
+
+
+def test_sevenzip_folder_as_7z(tmp_path):
+    packed, iv = bytes(range(48)), bytes(range(16))
+    path = tmp_path / "a.7z"
+    path.write_bytes(_sevenzip(packed, 100, 0x1234, iv))
+    assert _extract(path, ".7z") == [f"$7z$2$19$0$$16${iv.hex()}$4660$48$48${packed.hex()}$100$18"]
+
+
+def _ole(name: str, stream: bytes) -> bytes:
+    """Compound File holding one stream, padded to the 4096-byte cutoff so it lives in regular sectors."""
+    stream = stream.ljust(4096, b"\0")
+    sectors = len(stream) // 512
+    header = bytearray(512)
+    header[:8] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+    struct.pack_into("<HHH", header, 0x1A, 3, 0xFFFE, 9)
+    struct.pack_into("<H", header, 0x20, 6)
+    struct.pack_into("<IIIIIIII", header, 0x2C, 1, 1, 0, 4096, 0xFFFFFFFE, 0, 0xFFFFFFFE, 0)
+    struct.pack_into("<109I", header, 0x4C, 0, *[0xFFFFFFFF] * 108)
+    fat = [0xFFFFFFFD, 0xFFFFFFFE] + list(range(3, 2 + sectors)) + [0xFFFFFFFE]
+    fat = struct.pack("<128I", *fat, *[0xFFFFFFFF] * (128 - len(fat)))
+
+    def entry(entry_name: str, kind: int, start: int, size: int) -> bytes:
+        encoded = (entry_name + "\0").encode("utf-16-le")
+        raw = bytearray(128)
+        raw[:len(encoded)] = encoded
+        struct.pack_into("<HB", raw, 0x40, len(encoded), kind)
+        struct.pack_into("<III", raw, 0x44, 0xFFFFFFFF, 0xFFFFFFFF, 1 if kind == 5 else 0xFFFFFFFF)
+        struct.pack_into("<IQ", raw, 0x74, start, size)
+        return bytes(raw)
+
+    directory = entry("Root Entry", 5, 0xFFFFFFFE, 0) + entry(name, 2, 2, len(stream)) + bytes(256)
+    return bytes(header) + fat + directory + stream
+
+
+def test_office_agile_as_office2013(tmp_path):
+    salt, hash_input, hash_value = bytes(range(16)), bytes(range(16, 32)), bytes(range(64))
+    xml = (
+        '<encryption xmlns="http://schemas.microsoft.com/office/2006/encryption" '
+        'xmlns:p="http://schemas.microsoft.com/office/2006/keyEncryptor/password"><keyEncryptors><keyEncryptor>'
+        f'<p:encryptedKey spinCount="100000" keyBits="256" hashAlgorithm="SHA512" '
+        f'saltValue="{base64.b64encode(salt).decode()}" '
+        f'encryptedVerifierHashInput="{base64.b64encode(hash_input).decode()}" '
+        f'encryptedVerifierHashValue="{base64.b64encode(hash_value).decode()}"/>'
+        "</keyEncryptor></keyEncryptors></encryption>"
+    ).encode()
+    path = tmp_path / "a.docx"
+    path.write_bytes(_ole("EncryptionInfo", struct.pack("<HHI", 4, 4, 0x40) + xml))
+    assert _extract(path, ".docx") == [
+        f"$office$*2013*100000*256*16*{salt.hex()}*{hash_input.hex()}*{hash_value[:32].hex()}"
+    ]
+
+
+def test_office_standard_as_office2007(tmp_path):
+    salt, verifier, verifier_hash = bytes(range(16)), bytes(range(16, 32)), bytes(range(32, 64))
+    header = struct.pack("<IIIIIIII", 0x24, 0, 0x660E, 0x8004, 128, 0x18, 0, 0)
+    stream = struct.pack("<HHII", 3, 2, 0x24, len(header)) + header
+    stream += struct.pack("<I", 16) + salt + verifier + struct.pack("<I", 20) + verifier_hash
+    path = tmp_path / "a.xlsx"
+    path.write_bytes(_ole("EncryptionInfo", stream))
+    assert _extract(path, ".xlsx") == [f"$office$*2007*20*128*16*{salt.hex()}*{verifier.hex()}*{verifier_hash[:20].hex()}"]
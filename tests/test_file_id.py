@@ -0,0 +1,78 @@
+import io
+import zipfile
+
+from forensicrack.file_id import FileIdentifier, FileSignature
+
+ENCRYPT = {
+    1: b"<< /Type /Catalog >>",
+    5: b"<< /Filter /Standard /V 2 /R 3 /Length 128 /P -1028 /O <00> /U <00> >>",
+}
+ID = b"/ID [<c5174fa9725b1d46577e489d0eac6751><c5174fa9725b1d46577e489d0eac6751>]"
+
+
+def _sniff(path):
+    return FileIdentifier().sniff(str(path))
+
+
+def test_sniffs_by_content_not_extension(tmp_path):
+    png = tmp_path / "holiday.txt"
+    png.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(64))
+    assert _sniff(png) == FileSignature(".png", False)
+    assert FileIdentifier().identify(str(png))[0] == ".png"
+
+
+def test_archive_and_container_signatures(tmp_path):
+    ole = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + bytes(504)
+    samples = {
+        "a": (b"7z\xbc\xaf\x27\x1c\x00\x04" + bytes(24), FileSignature(".7z", None)),
+        # RAR5 encryption header: CRC32, size 0x21, type 4
+        "b": (b"Rar!\x1a\x07\x01\x00" + bytes(4) + b"\x21\x04" + bytes(32), FileSignature(".rar", True, "rar5-headers")),
+        "c": (b"Rar!\x1a\x07\x01\x00" + bytes(4) + b"\x0a\x01" + bytes(32), FileSignature(".rar", None)),
+        # RAR 4 main header with the block-headers-encrypted flag
+        "d": (b"Rar!\x1a\x07\x00" + bytes(3) + b"\x80\x00" + bytes(16), FileSignature(".rar", True, "rar4-headers")),
+        "e": (ole + "EncryptedPackage".encode("utf-16-le"), FileSignature(".docx", True, "ooxml")),
+        "f": (ole + "Workbook".encode("utf-16-le"), FileSignature(".xls", None)),
+        "g": (b"\xff\xd8\xff\xe0" + bytes(16), FileSignature(".jpg", False)),
+        "h": (b"BM" + bytes(8) + b"\x36\x00\x00\x00" + bytes(16), FileSignature(".bmp", False)),
+    }
+    for name, (data, expected) in samples.items():
+        (tmp_path / name).write_bytes(data)
+        assert _sniff(tmp_path / name) == expected, name
+    (tmp_path / "unknown").write_bytes(b"BM" + bytes(8) + b"\xff\xff\xff\x00" + bytes(16))
+    assert _sniff(tmp_path / "unknown") is None
+    assert _sniff(tmp_path / "missing") is None
+
+
+def test_zip_encryption_of_the_first_member(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        z.writestr("a.txt", "plain")
+    path = tmp_path / "a.bin"
+    path.write_bytes(buffer.getvalue())
+    assert _sniff(path) == FileSignature(".zip", None)
+    data = bytearray(buffer.getvalue())
+    data[6] |= 0x1
+    path.write_bytes(bytes(data))
+    assert _sniff(path) == FileSignature(".zip", True, "zipcrypto")
+
+
+def test_pdf_encrypt_marker(pdf_file):
+    assert _sniff(pdf_file("enc.pdf", ENCRYPT, b"/Encrypt 5 0 R " + ID)) == FileSignature(".pdf", True, "pdf")
+
+
+def test_pdf_without_encrypt_in_a_visible_trailer_is_plain(pdf_file):
+    assert _sniff(pdf_file("plain.pdf", {1: ENCRYPT[1]}, ID)).encrypted is False
+    assert _sniff(pdf_file("plain_xrefstm.pdf", {1: ENCRYPT[1]}, ID, xref_stream=True)).encrypted is False
+
+
+def test_pdf_trailer_outside_the_windows_is_unknown(pdf_file):
+    # 70 KB of content, then a 140 KB uncompressed xref stream: its dictionary is in neither window
+    objects = {**ENCRYPT, 2: b"<< /Length 70000 >>\nstream\n" + bytes(70000) + b"\nendstream"}
+    path = pdf_file("big.pdf", objects, b"/Encrypt 5 0 R " + ID, xref_stream=True, free_entries=20000, compress=False)
+    assert _sniff(path) == FileSignature(".pdf", None)
+
+
+def test_cached_signatures_of_an_older_version_are_dropped(tmp_path):
+    cache = tmp_path / "signatures.json"
+    cache.write_text('{"1:2:3:4": {"kind": ".pdf", "encrypted": false, "scheme": null}}')
+    assert FileIdentifier(str(cache))._cache == {}
@@ -0,0 +1,69 @@
+import threading
+
+from forensicrack.cracking_hashcat import HashcatEngine
+from forensicrack.runner import RunResult, StreamingRunner
+
+
+class _FakeHashcat(StreamingRunner):
+    """Stands in for hashcat: cracks every hash it reads, once all runs have started."""
+
+    def __init__(self, runs: int):
+        super().__init__()
+        self.barrier = threading.Barrier(runs, timeout=5)
+        self.seen: list[set[str]] = []
+
+    def run(self, cmd, job, engine, on_line=None, feed=None):
+        hashfile = cmd[cmd.index("-a") + 2]
+        outfile = cmd[cmd.index("--outfile") + 1]
+        self.barrier.wait()
+        with open(hashfile, "r", encoding="utf-8") as f:
+            hashes = {line.strip() for line in f if line.strip()}
+        self.seen.append(hashes)
+        with open(outfile, "w", encoding="utf-8") as f:
+            f.write("".join(f"{h}:plain-{h[:4]}\n" for h in hashes))
+        return RunResult(0, [])
+
+
+def test_concurrent_batches_of_one_mode_keep_their_own_files(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("candidate\n")
+    runner = _FakeHashcat(2)
+    engine = HashcatEngine(runner=runner, session_dir=str(tmp_path / "sessions"))
+    batches = {"a.hash": {"a.hash": ["aa" * 16]}, "b.hash": {"b.hash": ["bb" * 16, "cc" * 16]}}
+    results = {}
+
+    def attack(name):
+        results[name] = engine.crack_batch(batches[name], 1000, [str(wordlist)], str(tmp_path / "batch"))
+
+    threads = [threading.Thread(target=attack, args=(name,)) for name in batches]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(map(sorted, runner.seen)) == [["aa" * 16], ["bb" * 16, "cc" * 16]]
+    assert [r.hash for r in results["a.hash"]["a.hash"]] == ["aa" * 16]
+    assert sorted(r.hash for r in results["b.hash"]["b.hash"]) == ["bb" * 16, "cc" * 16]
+
+
+NETNTLM = "admin::CORP:1122334455667788:" + "ab" * 16 + ":0101" + "00" * 8
+
+
+def test_result_lines_split_at_a_wanted_hash():
+    from forensicrack.hashes import match_result_line
+
+    wanted = {NETNTLM.lower(): NETNTLM, "ab" * 16: "AB" * 16}
+    # Hashes and plaintexts may both contain colons
+    assert match_result_line(f"{NETNTLM}:pass:word\n", wanted) == (NETNTLM, "pass:word")
+    assert match_result_line("abababababababababababababababab:\n", wanted) == ("AB" * 16, "")
+    assert match_result_line("cdcd:plain\n", wanted) is None
+
+
+def test_results_come_from_the_outfile_and_the_potfile(tmp_path):
+    outfile, potfile = tmp_path / "batch.out", tmp_path / "case.pot"
+    outfile.write_text(f"{'ab' * 16}:first\n")
+    # Hashes hashcat skipped as already cracked are only in the potfile
+    potfile.write_text(f"{'cd' * 16}:second\n{'ef' * 16}:unrelated\n")
+    found = HashcatEngine._read_results([str(outfile), str(potfile), str(tmp_path / "missing")],
+                                        ["AB" * 16, "cd" * 16])
+    assert found == {"AB" * 16: "first", "cd" * 16: "second"}
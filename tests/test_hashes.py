@@ -0,0 +1,54 @@
+from forensicrack.cracking_hashcat import HashcatEngine
+from forensicrack.hashes import candidate_modes, classify_hash, detect_mode
+
+PDF_R4 = "$pdf$4*4*128*-1060*1*16*" + "ab" * 16 + "*32*" + "cd" * 32 + "*32*" + "ef" * 32
+PDF_MODES = [10400, 10500, 10600, 10700]
+
+
+def test_signatures_name_one_mode():
+    assert classify_hash(PDF_R4) == 10500
+    assert classify_hash("$pdf$5*6*256*-1028*1*16*" + "ab" * 16) == 10700
+    assert classify_hash("$office$*2013*100000*256*16*" + "ab" * 16) == 9600
+    assert classify_hash("$oldoffice$3*" + "ab" * 16) == 9800
+    assert classify_hash("$RAR3$*1*" + "ab" * 8 + "*30") == 23700
+    assert classify_hash("$zip2$*0*3*0*" + "ab" * 16) == 13600
+    assert classify_hash("$krb5tgs$23$*user$realm$spn*$" + "ab" * 16) == 13100
+    # One stored entry, then two deflated entries
+    assert classify_hash("$pkzip2$1*1*2*0*10*10*12345678*0*26*0*10*1234*5678*" + "ab" * 16 + "*$/pkzip2$") == 17210
+    two = "*".join(["$pkzip2$2*1", *["2*0*10*10*12345678*0*26*8*10*1234*5678*" + "ab" * 16] * 2, "$/pkzip2$"])
+    assert classify_hash(two) == 17220
+
+
+def test_bare_hex_digests_are_never_one_mode():
+    for length in (32, 40, 64, 128):
+        assert classify_hash("a" * length) is None
+    assert detect_mode(["a" * 40]) is None
+
+
+def test_detect_mode_needs_every_hash_to_agree():
+    assert detect_mode([PDF_R4, PDF_R4]) == 10500
+    assert detect_mode([PDF_R4, "$rar5$16$" + "ab" * 16]) is None
+    assert detect_mode([PDF_R4, "garbage"]) is None
+
+
+def test_candidate_modes_for_hex_digests():
+    assert candidate_modes(["a" * 40, "B" * 40]) == [100, 300, 6000]
+    assert candidate_modes(["a" * 32])[:2] == [0, 1000]
+    assert candidate_modes(["a" * 40, "a" * 64]) is None
+    assert candidate_modes(["a" * 40, PDF_R4]) is None
+    assert candidate_modes(["a" * 20]) is None
+    assert candidate_modes([]) is None
+
+
+def test_exact_mode_narrows_only_a_candidate_list():
+    engine = HashcatEngine()
+    assert engine.exact_mode(PDF_MODES, [PDF_R4], "doc.pdf") == 10500
+    # A detected mode outside the list does not replace it
+    assert engine.exact_mode(PDF_MODES, ["$rar5$16$" + "ab" * 16], "doc.pdf") == PDF_MODES
+    assert engine.exact_mode(PDF_MODES, ["a" * 40], "doc.pdf") == PDF_MODES
+
+
+def test_exact_mode_keeps_an_explicit_mode():
+    engine = HashcatEngine()
+    assert engine.exact_mode(300, ["a" * 40], "dump_m300.hash") == 300
+    assert engine.exact_mode(11600, [PDF_R4], "archive.7z") == 11600
@@ -0,0 +1,81 @@
+import hashlib
+
+from forensicrack import intake
+from forensicrack.intake import EvidenceIntake, content_digest
+from forensicrack.ledger import JobLedger
+from forensicrack.models import EvidenceFile
+from forensicrack.scheduler import EvidenceScheduler
+
+
+def _intake():
+    return EvidenceIntake(EvidenceScheduler({"cpu": 2}, max_workers=2))
+
+
+def _evidence(tmp_path, contents):
+    files = []
+    for name, data in contents.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        files.append(EvidenceFile(path=str(path)))
+    return files
+
+
+def test_single_piece_files_keep_their_plain_sha256(tmp_path):
+    files = _evidence(tmp_path, {"a.zip": b"archive"})
+    _intake().fingerprint(files)
+    assert files[0].metadata["fingerprint"] == hashlib.sha256(b"archive").hexdigest()
+
+
+def test_pooled_pieces_match_the_single_threaded_digest(tmp_path, monkeypatch):
+    monkeypatch.setattr(intake, "_PIECE", 4)
+    files = _evidence(tmp_path, {"big.img": b"0123456789abcdef!"})
+    _intake().fingerprint(files)
+    assert files[0].metadata["fingerprint"] == content_digest(files[0].path)
+    assert files[0].metadata["fingerprint"] != hashlib.sha256(b"0123456789abcdef!").hexdigest()
+
+
+def test_groups_identical_files_in_input_order(tmp_path):
+    files = _evidence(tmp_path, {"b.zip": b"same", "a.pdf": b"other", "copy.zip": b"same", "c.7z": b"sam3"})
+    engine = _intake()
+    engine.fingerprint(files)
+    groups = engine.group(files)
+    assert [(rep.name, [d.name for d in dups]) for rep, dups in groups] == [
+        ("b.zip", ["copy.zip"]), ("a.pdf", []), ("c.7z", []),
+    ]
+
+
+def test_ledger_cache_means_files_are_read_once(tmp_path, monkeypatch):
+    ledger = JobLedger(str(tmp_path / "ledger.sqlite3"))
+    files = _evidence(tmp_path, {"a.zip": b"archive"})
+    _intake().fingerprint(files, ledger.cached_fingerprint, ledger.remember_fingerprint)
+
+    def unexpected(*args):
+        raise AssertionError("file hashed again")
+
+    monkeypatch.setattr(intake, "_hash_piece", unexpected)
+    again = [EvidenceFile(path=files[0].path)]
+    _intake().fingerprint(again, ledger.cached_fingerprint, ledger.remember_fingerprint)
+    assert again[0].metadata["fingerprint"] == files[0].metadata["fingerprint"]
+    assert ledger.fingerprint(files[0].path) == files[0].metadata["fingerprint"]
+    ledger.close()
+
+
+def test_fan_out_links_file_and_directory_outputs(tmp_path):
+    rep, dup = EvidenceFile(path=str(tmp_path / "a.zip")), EvidenceFile(path=str(tmp_path / "copy.zip"))
+    (tmp_path / "a.zip.pot").write_text("hash:plain\n")
+    (tmp_path / "copy.zip.pot").write_text("stale\n")
+    extracted = tmp_path / "decrypted_a.zip" / "sub"
+    extracted.mkdir(parents=True)
+    (extracted / "notes.txt").write_text("notes")
+    outputs = [
+        (str(tmp_path / "a.zip.pot"), str(tmp_path / "copy.zip.pot")),
+        (str(tmp_path / "decrypted_a.zip"), str(tmp_path / "decrypted_copy.zip")),
+        # Outputs the representative never produced are skipped
+        (str(tmp_path / "a_zsteg.txt"), str(tmp_path / "copy_zsteg.txt")),
+    ]
+    _intake().fan_out(rep, dup, outputs)
+    assert (tmp_path / "copy.zip.pot").read_text() == "hash:plain\n"
+    assert (tmp_path / "decrypted_copy.zip" / "sub" / "notes.txt").read_text() == "notes"
+    assert not (tmp_path / "copy_zsteg.txt").exists()
+    # Hard links where the filesystem allows them, so duplicates cost no space
+    assert (tmp_path / "copy.zip.pot").stat().st_ino == (tmp_path / "a.zip.pot").stat().st_ino
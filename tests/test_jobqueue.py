@@ -0,0 +1,60 @@
+from forensicrack.jobqueue import JobQueue
+
+
+def _evidence(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"evidence{i}.bin"
+        path.write_text(str(i))
+        paths.append(str(path))
+    return paths
+
+
+def test_put_appends_one_record_per_job(tmp_path):
+    queue_file = tmp_path / "queue.jsonl"
+    queue = JobQueue(str(queue_file))
+    paths = _evidence(tmp_path, 50)
+    assert all(queue.put(path) for path in paths)
+    assert not queue.put(paths[0])
+    assert len(queue_file.read_text().splitlines()) == 50
+
+
+def test_claims_in_fifo_order_and_survives_restart(tmp_path):
+    queue_file = tmp_path / "queue.jsonl"
+    queue = JobQueue(str(queue_file))
+    paths = _evidence(tmp_path, 3)
+    for path in paths:
+        queue.put(path)
+    first = queue.claim(timeout=0)
+    queue.complete(first["id"], True)
+    second = queue.claim(timeout=0)
+    assert (first["path"], second["path"]) == (paths[0], paths[1])
+
+    # The running job goes back to pending ahead of the never-claimed one
+    reopened = JobQueue(str(queue_file))
+    assert reopened.counts() == {"done": 1, "pending": 2}
+    assert reopened.claim(timeout=0)["path"] == paths[1]
+    assert reopened.claim(timeout=0)["path"] == paths[2]
+    assert reopened.claim(timeout=0) is None
+
+
+def test_compacts_to_one_record_per_job(tmp_path):
+    queue_file = tmp_path / "queue.jsonl"
+    queue = JobQueue(str(queue_file))
+    queue.COMPACT_MIN_RECORDS = queue.COMPACT_FACTOR = 1
+    for path in _evidence(tmp_path, 2):
+        queue.put(path)
+    for _ in range(2):
+        job = queue.claim(timeout=0)
+        queue.complete(job["id"], False)
+    assert len(queue_file.read_text().splitlines()) <= 2
+    assert JobQueue(str(queue_file)).counts() == {"failed": 2}
+
+
+def test_skips_a_truncated_record(tmp_path):
+    queue_file = tmp_path / "queue.jsonl"
+    queue = JobQueue(str(queue_file))
+    queue.put(_evidence(tmp_path, 1)[0])
+    with open(queue_file, "a", encoding="utf-8") as f:
+        f.write('{"id": "cut')
+    assert JobQueue(str(queue_file)).counts() == {"pending": 1}
@@ -0,0 +1,32 @@
+from forensicrack.keystore import ZipKeyStore
+
+KEYS = (0x12345678, 0x9ABCDEF0, 0x0F0F0F0F)
+OTHER = (1, 2, 3)
+
+
+def test_families_rank_by_archives_opened(tmp_path):
+    store = ZipKeyStore(str(tmp_path / "keys.jsonl"))
+    store.remember(OTHER, str(tmp_path / "a.zip"))
+    store.remember(KEYS, str(tmp_path / "b.zip"))
+    store.remember(KEYS, str(tmp_path / "c.zip"))
+    assert store.families() == [KEYS, OTHER]
+    assert store.keys_for(str(tmp_path / "c.zip")) == KEYS
+    assert store.keys_for(str(tmp_path / "d.zip")) is None
+
+
+def test_families_survive_a_restart(tmp_path):
+    path = str(tmp_path / "keys.jsonl")
+    store = ZipKeyStore(path)
+    store.remember(KEYS, str(tmp_path / "a.zip"))
+    store.remember(KEYS, str(tmp_path / "a.zip"))
+    with open(path, "a") as f:
+        f.write('{"keys": "truncated\n')
+    reloaded = ZipKeyStore(path)
+    assert reloaded.families() == [KEYS]
+    assert reloaded.keys_for(str(tmp_path / "a.zip")) == KEYS
+    assert sum(1 for _ in open(path)) == 2
+
+
+def test_format_round_trips():
+    assert ZipKeyStore.format(KEYS) == "12345678 9abcdef0 0f0f0f0f"
+    assert ZipKeyStore.parse(ZipKeyStore.format(KEYS)) == KEYS
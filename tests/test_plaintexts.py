@@ -0,0 +1,48 @@
+import os
+import zlib
+
+from forensicrack.plaintexts import PlaintextIndex
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_lookup_by_crc_and_size_whatever_the_name(tmp_path):
+    library = tmp_path / "plaintexts"
+    _write(library / "deep" / "renamed.bin", b"known plaintext")
+    index = PlaintextIndex(str(library))
+    index.refresh()
+    data = b"known plaintext"
+    assert index.lookup(zlib.crc32(data), len(data)) == str(library / "deep" / "renamed.bin")
+    assert index.lookup(zlib.crc32(data), len(data) + 1) is None
+
+
+def test_refresh_follows_changes_and_removals(tmp_path):
+    library = tmp_path / "plaintexts"
+    _write(library / "a.txt", b"first version")
+    _write(library / "b.txt", b"to be removed")
+    index = PlaintextIndex(str(library))
+    index.refresh()
+    _write(library / "a.txt", b"second version!")
+    os.remove(library / "b.txt")
+    index.refresh()
+    assert index.lookup(zlib.crc32(b"first version"), 13) is None
+    assert index.lookup(zlib.crc32(b"second version!"), 15) == str(library / "a.txt")
+    assert index.lookup(zlib.crc32(b"to be removed"), 13) is None
+
+
+def test_index_is_reloaded_without_rereading(tmp_path, monkeypatch):
+    library = tmp_path / "plaintexts"
+    _write(library / "a.txt", b"cached entry")
+    path = str(tmp_path / "index.json")
+    PlaintextIndex(str(library), path).refresh()
+
+    def fail(_):
+        raise AssertionError("unchanged file was read again")
+
+    monkeypatch.setattr(PlaintextIndex, "_crc", staticmethod(fail))
+    index = PlaintextIndex(str(library), path)
+    index.refresh()
+    assert index.lookup(zlib.crc32(b"cached entry"), 12) == str(library / "a.txt")
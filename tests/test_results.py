@@ -0,0 +1,35 @@
+import json
+
+from forensicrack.results import ResultStore
+
+PDF = "$pdf$4*4*128*-1060*1*16*" + "ab" * 16
+
+
+def test_results_survive_a_restart(tmp_path):
+    path = str(tmp_path / "case_results.jsonl")
+    store = ResultStore(path)
+    store.record("AB" * 16, "hunter2", "hashcat", 0, "dump.hash")
+    # *2john label and John's trailing fields do not change the key
+    store.record(f"doc.pdf:{PDF}:::::doc.pdf", "secret", "john")
+
+    reloaded = ResultStore(path)
+    assert reloaded.lookup("ab" * 16) == "hunter2"
+    assert reloaded.lookup(PDF) == "secret"
+    assert reloaded.lookup_many(["AB" * 16, "cd" * 16]) == {"AB" * 16: "hunter2"}
+
+
+def test_the_same_result_is_written_once(tmp_path):
+    path = tmp_path / "case_results.jsonl"
+    store = ResultStore(str(path))
+    store.record("ab" * 16, "hunter2", "hashcat")
+    store.record("AB" * 16, "hunter2", "john")
+    store.record("ab" * 16, "other", "john")
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["engine"], e["plain"]) for e in entries] == [("hashcat", "hunter2"), ("john", "other")]
+    assert ResultStore(str(path)).lookup("ab" * 16) == "other"
+
+
+def test_unreadable_lines_are_skipped(tmp_path):
+    path = tmp_path / "case_results.jsonl"
+    path.write_text('{"hash": "' + "ab" * 16 + '", "plain": "x"}\nnot json\n{"plain": "no hash"}\n')
+    assert ResultStore(str(path)).lookup_many(["ab" * 16, "no hash"]) == {"ab" * 16: "x"}
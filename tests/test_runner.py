@@ -0,0 +1,44 @@
+import sys
+import json
+
+import pytest
+
+from forensicrack.runner import ProgressBus, StreamingRunner, parse_hashcat_status, parse_john_status
+
+HASHCAT_STATUS = json.dumps({
+    "session": "job", "status": 3, "progress": [250, 1000], "recovered_hashes": [1, 4],
+    "devices": [{"device_id": 1, "speed": 1500000}, {"device_id": 2, "speed": 500000}],
+})
+
+
+def test_hashcat_status_json():
+    event = parse_hashcat_status(HASHCAT_STATUS, "job")
+    assert (event.engine, event.status, event.progress) == ("hashcat", "running", 25.0)
+    assert (event.speed, event.recovered, event.total) == (2000000, 1, 4)
+    assert parse_hashcat_status('{"status": 3}', "job") is None
+    assert parse_hashcat_status("{not json", "job") is None
+    assert parse_hashcat_status("Session..........: job", "job") is None
+
+
+def test_john_status_line():
+    event = parse_john_status("2g 0:00:01:40 25.00% (ETA: 12:40:01) 0.02g/s 1.5Mp/s 3.5Mc/s 3.5MC/s abc..xyz", "job")
+    assert (event.engine, event.progress, event.recovered) == ("john", 25.0, 2)
+    assert event.speed == pytest.approx(3.5e6)
+    # 100 s for a quarter of the keyspace
+    assert event.eta == pytest.approx(300)
+    # Without a percentage (e.g. incremental mode) there is no ETA
+    event = parse_john_status("0g 0:00:00:05 0g/s 120c/s 120C/s aaa..zzz", "job")
+    assert (event.progress, event.eta, event.speed) == (None, None, 120)
+    assert parse_john_status("Loaded 1 password hash (PKZIP [32/64])", "job") is None
+
+
+def test_status_lines_become_events_and_the_rest_the_tail():
+    events = []
+    bus = ProgressBus()
+    bus.subscribe(events.append)
+    script = f"print('Starting'); print({HASHCAT_STATUS!r}); print(''); print('Done')"
+    result = StreamingRunner(bus).run([sys.executable, "-c", script], "job", "hashcat")
+    assert result.returncode == 0
+    assert result.tail == ["Starting", "Done"]
+    assert [e.status for e in events] == ["running", "finished"]
+    assert (events[-1].progress, events[-1].recovered, events[-1].total) == (25.0, 1, 4)
@@ -0,0 +1,49 @@
+import threading
+import time
+
+from forensicrack.scheduler import EvidenceScheduler
+
+
+def test_slots_bound_each_engine_class():
+    scheduler = EvidenceScheduler({"hashcat": 1, "cpu": 2}, max_workers=6)
+    lock = threading.Lock()
+    running = {"hashcat": 0, "cpu": 0}
+    peak = {"hashcat": 0, "cpu": 0}
+
+    def job(resource):
+        with scheduler.slot(resource):
+            with lock:
+                running[resource] += 1
+                peak[resource] = max(peak[resource], running[resource])
+            time.sleep(0.02)
+            with lock:
+                running[resource] -= 1
+        return True
+
+    items = ["hashcat"] * 3 + ["cpu"] * 3
+    results = scheduler.run(items, job, lambda item: item)
+    assert sorted(results) == sorted((item, True) for item in items)
+    assert peak == {"hashcat": 1, "cpu": 2}
+
+
+def test_unknown_resource_is_not_limited():
+    scheduler = EvidenceScheduler({"cpu": 1}, max_workers=2)
+    with scheduler.slot("cpu"), scheduler.slot("other"):
+        pass
+
+
+def test_engine_classes_are_interleaved():
+    items = ["h1", "h2", "h3", "c1", "b1"]
+    order = EvidenceScheduler._interleave(items, lambda item: item[0])
+    assert order == ["h1", "c1", "b1", "h2", "h3"]
+
+
+def test_a_failing_job_is_reported_as_false():
+    scheduler = EvidenceScheduler({"cpu": 1}, max_workers=2)
+
+    def job(item):
+        if item == "bad":
+            raise RuntimeError("engine crashed")
+        return True
+
+    assert sorted(scheduler.run(["good", "bad"], job, lambda item: "cpu")) == [("bad", False), ("good", True)]
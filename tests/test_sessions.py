@@ -0,0 +1,54 @@
+import sys
+import time
+
+from forensicrack.cracking_hashcat import HashcatEngine
+from forensicrack.runner import StreamingRunner
+
+CMD = ["hashcat", "-m", "1000", "-a", "0", "batch.hash", "words.txt"]
+
+
+def test_hashcat_resumes_an_interrupted_session(tmp_path):
+    engine = HashcatEngine(session_dir=str(tmp_path))
+    cmd = engine._with_session(list(CMD), "batch", 1000, ["words.txt"], ["h1", "h2"])
+    name = cmd[cmd.index("--session") + 1]
+    restore_file = cmd[cmd.index("--restore-file-path") + 1]
+    assert cmd[:len(CMD)] == CMD and restore_file == str(tmp_path / f"{name}.restore")
+
+    # hashcat left a restore point: the next run restores instead of starting over
+    (tmp_path / f"{name}.restore").write_bytes(b"restore")
+    resumed = engine._with_session(list(CMD), "batch", 1000, ["words.txt"], ["h1", "h2"])
+    assert resumed == ["hashcat", "--session", name, "--restore-file-path", restore_file, "--restore"]
+    # Another wordlist set is another session
+    assert "--restore" not in engine._with_session(list(CMD), "batch", 1000, ["other.txt"], ["h1", "h2"])
+
+
+def test_a_checkpoint_is_dropped_for_new_targets(tmp_path):
+    engine = HashcatEngine(session_dir=str(tmp_path))
+    cmd = engine._with_session(list(CMD), "batch", 1000, ["words.txt"], ["h1", "h2"])
+    restore_file = tmp_path / (cmd[cmd.index("--session") + 1] + ".restore")
+    restore_file.write_bytes(b"restore")
+    # A subset of the checkpointed targets (the rest were cracked) resumes
+    assert "--restore" in engine._with_session(list(CMD), "batch", 1000, ["words.txt"], ["h2"])
+    # A new hash never saw the keyspace the checkpoint skips
+    assert "--restore" not in engine._with_session(list(CMD), "batch", 1000, ["words.txt"], ["h2", "h3"])
+    assert not restore_file.exists()
+
+
+def test_time_budget_pauses_a_running_job():
+    runner = StreamingRunner()
+    runner.set_time_budget(0.5)
+    started = time.monotonic()
+    result = runner.run([sys.executable, "-c", "import time; print('running', flush=True); time.sleep(30)"],
+                        "job", "hashcat")
+    assert result.paused
+    assert time.monotonic() - started < 10
+    assert runner.expired()
+    # Nothing new starts once the budget is spent
+    assert runner.run([sys.executable, "-c", "print('late')"], "job", "hashcat").paused
+
+
+def test_no_budget_never_expires():
+    runner = StreamingRunner()
+    runner.set_time_budget(None)
+    assert not runner.expired()
+    assert not runner.run([sys.executable, "-c", "print('done')"], "job", "hashcat").paused
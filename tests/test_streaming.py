@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+
+from forensicrack import streaming
+from forensicrack.streaming import CandidateStream, is_stream_source
+
+WORDS = b"".join(b"word%d\n" % n for n in range(10))
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """A 'RockYou2021.7z.001' whose decompressor just prints the word list."""
+    path = tmp_path / "RockYou2021.7z.001"
+    path.write_bytes(WORDS)
+    monkeypatch.setattr(streaming, "_decompress_cmd", lambda p: ["cat", p])
+    return str(path)
+
+
+class _Sink(io.BytesIO):
+    def close(self):
+        self.data = self.getvalue()
+        super().close()
+
+
+def test_stream_sources():
+    assert is_stream_source("RockYou2021.7z.001") and is_stream_source("list.7Z")
+    assert not is_stream_source("rockyou.txt")
+
+
+def test_interrupted_stream_resumes_at_its_offset(tmp_path, source):
+    state = str(tmp_path / "attack.stream.json")
+    first = CandidateStream(source, state, ["h1", "h2"])
+    first.feed(_Sink())
+    # The consumer reported 4 attacked candidates before it stopped
+    first.finish(completed=False, processed=4)
+    assert json.load(open(state))["offset"] == 4
+
+    resumed = CandidateStream(source, state, ["h2"])
+    assert (resumed.start_offset, resumed.done) == (4, False)
+    sink = _Sink()
+    resumed.feed(sink)
+    assert sink.data == WORDS.split(b"\n", 4)[4]
+    resumed.finish(completed=True)
+    assert json.load(open(state)) | {"targets": None} == {
+        "source": source, "offset": 10, "done": True, "targets": None,
+    }
+    assert CandidateStream(source, state, ["h2"]).done
+    # h1 (cracked by then, say) was left out of the resumed run
+    assert not CandidateStream(source, state, ["h1"]).done
+
+
+def test_offset_rewinds_when_the_consumer_reports_no_progress(tmp_path, source):
+    state = str(tmp_path / "attack.stream.json")
+    stream = CandidateStream(source, state, ["h1"])
+    stream.REWIND_MARGIN = 3
+    stream.feed(_Sink())
+    stream.finish(completed=False)
+    assert CandidateStream(source, state, ["h1"]).start_offset == 7
+    # Processed counts beyond what was written are capped
+    stream.finish(completed=False, processed=50)
+    assert CandidateStream(source, state, ["h1"]).start_offset == 10
+
+
+def test_new_targets_start_over(tmp_path, source):
+    state = str(tmp_path / "attack.stream.json")
+    stream = CandidateStream(source, state, ["h1"])
+    stream.feed(_Sink())
+    stream.finish(completed=False, processed=6)
+    assert CandidateStream(source, state, ["h1", "h3"]).start_offset == 0
+    assert CandidateStream(source, state, ["h1"]).start_offset == 6
@@ -0,0 +1,40 @@
+import os
+import threading
+
+from forensicrack.watch import InputWatcher, _EVENT, _IN_CLOSE_WRITE, _IN_Q_OVERFLOW
+
+
+def _event(mask, name=b""):
+    if name:
+        name = name + b"\0" * (16 - len(name))
+    return _EVENT.pack(1, mask, 0, len(name)) + name
+
+
+def _read(watcher, events):
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, events)
+    os.close(write_fd)
+    reported = []
+    stop = threading.Event()
+
+    def on_file(path):
+        reported.append(os.path.basename(path))
+        stop.set()
+
+    try:
+        watcher._read_events(read_fd, on_file, stop)
+    finally:
+        os.close(read_fd)
+    return reported
+
+
+def test_reports_closed_files(tmp_path):
+    (tmp_path / "a.zip").write_bytes(b"PK")
+    assert _read(InputWatcher(str(tmp_path)), _event(_IN_CLOSE_WRITE, b"a.zip")) == ["a.zip"]
+
+
+def test_rescans_the_directory_on_queue_overflow(tmp_path):
+    for name in ("b.pdf", "a.zip"):
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / "sub").mkdir()
+    assert _read(InputWatcher(str(tmp_path)), _event(_IN_Q_OVERFLOW)) == ["a.zip", "b.pdf"]